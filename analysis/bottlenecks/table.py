@@ -15,7 +15,11 @@ from analysis.dfkeys import (
     LABEL,
     LOG_PATH,
     LINENO,
-    DETAIL,
+    DETAIL_LEN,
+    DETAIL_TEXT,
+    LINE_OFFSET,
+    MSG_LEN,
+    MSG_HASH,
 )
 
 _BOTTLENECK_COLS: tuple[str, ...] = (
@@ -33,7 +37,11 @@ _BOTTLENECK_COLS: tuple[str, ...] = (
     LABEL,
     LOG_PATH,
     LINENO,
-    DETAIL,
+    DETAIL_LEN,
+    DETAIL_TEXT,
+    LINE_OFFSET,
+    MSG_LEN,
+    MSG_HASH,
 )
 
 
@@ -50,7 +58,8 @@ def top_bottlenecks(
 ) -> pd.DataFrame:
     """
     Top slowest individual gaps for a given query variant.
-    Includes (log_path, lineno) to jump to the exact log line.
+    Includes (log_path, lineno) to jump to the exact log line, and the
+    references parsers.gpe.with_gpe_text turns into the line's detail.
     """
     if gaps_with_qname.empty or QUERY_NAME not in gaps_with_qname.columns:
         return _empty_bottlenecks_df()
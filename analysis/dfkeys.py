@@ -48,6 +48,12 @@ DETAIL = "detail"
 LOG_PATH = "log_path"
 LINENO = "lineno"
 RAW_MSG = "raw_msg"
+# Where detail/raw_msg live in the log file, until they are materialized
+LINE_OFFSET = "line_offset"
+MSG_LEN = "msg_len"
+DETAIL_LEN = "detail_len"
+DETAIL_TEXT = "detail_text"  # detail itself, for rows where detail_len is -1
+MSG_HASH = "msg_hash"
 
 
 # ---- Step stats outputs ----
@@ -58,6 +64,10 @@ MEAN_MS = "mean_ms"
 MAX_MS = "max_ms"
 SUM_MS = "sum_ms"
 
+# ---- Sampled step stats (see make_step_stats) ----
+N_REQUESTS = "n_requests"
+SAMPLE_RATE = "sample_rate"
+
 # ---- Compare outputs ----
 PRESENT_IN = "present_in"
 
@@ -75,6 +85,9 @@ OPT_MEAN_MS = "opt_mean_ms"
 OPT_MAX_MS = "opt_max_ms"
 OPT_SUM_MS = "opt_sum_ms"
 
+BASE_N_REQUESTS = "base_n_requests"
+OPT_N_REQUESTS = "opt_n_requests"
+
 OPT_OVER_BASE_MEAN = "opt_over_base_mean"
 DIFF_MEAN_MS = "diff_mean_ms"
 OPT_OVER_BASE_MEDIAN = "opt_over_base_median"
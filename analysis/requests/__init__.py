@@ -1,3 +1,9 @@
+from .gpe_rollup import request_rollup
 from .tables import summarize_requests, build_exec_request_table, extract_ids
 
-__all__ = ["summarize_requests", "build_exec_request_table", "extract_ids"]
+__all__ = [
+    "request_rollup",
+    "summarize_requests",
+    "build_exec_request_table",
+    "extract_ids",
+]
@@ -37,3 +37,17 @@ EXEC_REQUEST_TABLE_COLS = pd.Index(
         "endpoint",
     ]
 )
+
+# One row per (run, request_id) seen in GPE logs; see request_rollup.
+GPE_REQUEST_ROLLUP_COLS = pd.Index(
+    [
+        "run",
+        "request_id",
+        "gpe_node",
+        "first_seen_gpe_ts",
+        "last_seen_gpe_ts",
+        "start_udf_ts",
+        "stop_udf_ts",
+        "reported_stop_udf_ms",
+    ]
+)
@@ -20,6 +20,7 @@ from analysis.dfkeys import (
     ACTUAL_DIFF_FIRST_LAST_SEEN_MS,
     DIFF_GPE_DURATION_UDF_MS,
 )
+from .columns import GPE_REQUEST_ROLLUP_COLS
 from .util import first_str, elapsed_ms
 
 
@@ -36,19 +37,19 @@ def udf_boundaries(g: pd.DataFrame) -> pd.DataFrame:
 
     starts = (
         g.loc[g[EVENT] == GPE_UDF_START]
-        .groupby(_GROUP_KEYS)[TS]
+        .groupby(_GROUP_KEYS, observed=True)[TS]
         .min()
         .rename(START_UDF_TS)
     )
     stops = (
         g.loc[g[EVENT] == GPE_UDF_STOP]
-        .groupby(_GROUP_KEYS)[TS]
+        .groupby(_GROUP_KEYS, observed=True)[TS]
         .max()
         .rename(STOP_UDF_TS)
     )
     reported = (
         g.loc[g[EVENT] == GPE_UDF_STOP]
-        .groupby(_GROUP_KEYS)[UDF_MS]
+        .groupby(_GROUP_KEYS, observed=True)[UDF_MS]
         .max()
         .rename(REPORTED_STOP_UDF_MS)
     )
@@ -56,29 +57,17 @@ def udf_boundaries(g: pd.DataFrame) -> pd.DataFrame:
     return as_df(pd.concat([starts, stops, reported], axis=1).reset_index())
 
 
-def summarize_gpe_per_request(gpe_attached: pd.DataFrame) -> pd.DataFrame:
+def request_rollup(gpe_attached: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per (run, request_id) of the linked GPE events: the first node seen, the
+    first/last event timestamps and the UDF start/stop boundaries.
+    """
     g = filter_notna(gpe_attached, REQUEST_ID)
     if g.empty:
-        return pd.DataFrame(
-            columns=pd.Index(
-                [
-                    RUN,
-                    REQUEST_ID,
-                    GPE_NODE,
-                    FIRST_SEEN_GPE_TS,
-                    LAST_SEEN_GPE_TS,
-                    START_UDF_TS,
-                    STOP_UDF_TS,
-                    REPORTED_STOP_UDF_MS,
-                    ACTUAL_STOP_UDF_MS,
-                    ACTUAL_DIFF_FIRST_LAST_SEEN_MS,
-                    DIFF_GPE_DURATION_UDF_MS,
-                ]
-            )
-        )
+        return pd.DataFrame(columns=GPE_REQUEST_ROLLUP_COLS)
 
     base = as_df(
-        g.groupby(_GROUP_KEYS, as_index=False).agg(
+        g.groupby(_GROUP_KEYS, as_index=False, observed=True).agg(
             **{
                 GPE_NODE: (NODE, first_str),
                 FIRST_SEEN_GPE_TS: (TS, "min"),
@@ -88,10 +77,27 @@ def summarize_gpe_per_request(gpe_attached: pd.DataFrame) -> pd.DataFrame:
     )
 
     bounds = udf_boundaries(g)
-    out = as_df(base.merge(bounds, on=_GROUP_KEYS, how="left"))
+    return as_df(base.merge(bounds, on=_GROUP_KEYS, how="left"))
+
+
+def summarize_gpe_per_request(rollup: pd.DataFrame) -> pd.DataFrame:
+    """
+    request_rollup plus the UDF and first/last-seen durations.
+    """
+    if rollup.empty:
+        return pd.DataFrame(
+            columns=pd.Index(
+                [
+                    *GPE_REQUEST_ROLLUP_COLS,
+                    ACTUAL_STOP_UDF_MS,
+                    ACTUAL_DIFF_FIRST_LAST_SEEN_MS,
+                    DIFF_GPE_DURATION_UDF_MS,
+                ]
+            )
+        )
 
     out = elapsed_ms(
-        out, start_col=START_UDF_TS, stop_col=STOP_UDF_TS, out_col=ACTUAL_STOP_UDF_MS
+        rollup, start_col=START_UDF_TS, stop_col=STOP_UDF_TS, out_col=ACTUAL_STOP_UDF_MS
     )
     out = elapsed_ms(
         out,
@@ -1,15 +1,18 @@
 import pandas as pd
 
-from analysis.dfutils import as_df, filter_notna
+from analysis.dfutils import as_df
+from common.support.categorical import align_categories
+from common.support.ordering import sort_rows
 from analysis.dfkeys import (
     RUN,
     REQUEST_ID,
     START_UDF_TS,
     STOP_UDF_TS,
+    REPORTED_STOP_UDF_MS,
     FIRST_SEEN_GPE_TS,
     ACTUAL_STOP_UDF_MS,
 )
-from .gpe_rollup import summarize_gpe_per_request, udf_boundaries
+from .gpe_rollup import summarize_gpe_per_request
 from .restpp_rollup import (
     summarize_restpp_per_request,
     restpp_request_map,
@@ -20,28 +23,33 @@ from .columns import EXEC_REQUEST_TABLE_COLS
 
 
 def summarize_requests(
-    restpp_req: pd.DataFrame, gpe_attached: pd.DataFrame
+    restpp_req: pd.DataFrame, gpe_rollup: pd.DataFrame
 ) -> pd.DataFrame:
-    gpe_sum = summarize_gpe_per_request(gpe_attached)
+    """
+    One row per GPE request (gpe_rollup: see request_rollup) with its RESTPP side.
+    """
+    gpe_sum = summarize_gpe_per_request(gpe_rollup)
     rsum = summarize_restpp_per_request(restpp_req)
 
+    gpe_sum, rsum = align_categories([gpe_sum, rsum])
     out = as_df(gpe_sum.merge(rsum, on=[RUN, REQUEST_ID], how="left"))
     out = add_endpoint_name(out)
 
     if FIRST_SEEN_GPE_TS in out.columns:
-        out = out.set_index([RUN, FIRST_SEEN_GPE_TS]).sort_index().reset_index()
+        out = sort_rows(out, (RUN, FIRST_SEEN_GPE_TS))
 
     return out.reset_index(drop=True)
 
 
 def build_exec_request_table(
-    restpp_req: pd.DataFrame, gpe_attached: pd.DataFrame
+    restpp_req: pd.DataFrame, gpe_rollup: pd.DataFrame
 ) -> pd.DataFrame:
-    g = filter_notna(gpe_attached, REQUEST_ID)
-    if g.empty:
+    if gpe_rollup.empty:
         return pd.DataFrame(columns=EXEC_REQUEST_TABLE_COLS)
 
-    bounds = udf_boundaries(g)
+    bounds = gpe_rollup.loc[
+        :, [RUN, REQUEST_ID, START_UDF_TS, STOP_UDF_TS, REPORTED_STOP_UDF_MS]
+    ]
 
     exec_tbl = bounds.dropna(subset=[START_UDF_TS, STOP_UDF_TS]).copy()
     exec_tbl = elapsed_ms(
@@ -58,12 +66,10 @@ def build_exec_request_table(
             for c in [RUN, REQUEST_ID, "query_name", "graph_name", "endpoint"]
             if c in rmap.columns
         ]
-        exec_tbl = as_df(
-            exec_tbl.merge(rmap.loc[:, keep], on=[RUN, REQUEST_ID], how="left")
-        )
+        exec_tbl, rsel = align_categories([exec_tbl, rmap.loc[:, keep]])
+        exec_tbl = as_df(exec_tbl.merge(rsel, on=[RUN, REQUEST_ID], how="left"))
 
-    exec_tbl = exec_tbl.set_index([RUN, START_UDF_TS]).sort_index().reset_index()
-    return exec_tbl.reset_index(drop=True)
+    return sort_rows(exec_tbl, (RUN, START_UDF_TS))
 
 
 def extract_ids(
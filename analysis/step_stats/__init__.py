@@ -1,8 +1,20 @@
 from analysis.step_stats.aggregate import build_ordered_step_side_table, make_step_stats
 from analysis.step_stats.compare import compare_two_queries
+from analysis.step_stats.partial import (
+    StepPartial,
+    merge_partials,
+    partials_frame,
+    step_partials,
+)
+from analysis.step_stats.rolling import RollingStepStats
 
 __all__ = [
     "make_step_stats",
     "compare_two_queries",
     "build_ordered_step_side_table",
+    "RollingStepStats",
+    "StepPartial",
+    "step_partials",
+    "merge_partials",
+    "partials_frame",
 ]
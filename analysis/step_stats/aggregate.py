@@ -1,53 +1,121 @@
+from collections.abc import Hashable
+from typing import Literal
+
 import numpy as np
 import pandas as pd
+from pandas.api.typing import DataFrameGroupBy
 
 from analysis import dfkeys as K
 from analysis.dfutils import as_df, safe_div  # Imported safe_div
-from analysis.step_stats.schema import STEP_STATS_COLS
+from analysis.step_stats.partial import merge_partials, partials_frame, step_partials
+from analysis.step_stats.schema import SAMPLED_COLS, STEP_STATS_COLS
 from common.model.constants import GPE_STEP
-from common.support.stats import pct
+from common.support.categorical import align_categories, categorize
+from common.support.ordering import sort_rows
+from common.support.stats import group_percentiles
+
+
+def _gap_percentiles(
+    df: pd.DataFrame, grp: "DataFrameGroupBy[tuple[Hashable, ...], Literal[True]]"
+) -> dict[str, np.ndarray]:
+    """
+    median_ms/p95_ms of gap_ms per group of grp, aligned with grp.agg rows.
+    """
+    p50, p95 = group_percentiles(
+        df[K.GAP_MS].to_numpy(dtype=np.float64),
+        grp.ngroup().to_numpy(dtype=np.float64),
+        grp.ngroups,
+        (50, 95),
+    )
+    return {K.MEDIAN_MS: p50, K.P95_MS: p95}
 
 
-def _p50(s: pd.Series) -> float:
-    return pct(s, 50)
+def _approx_stats(
+    df: pd.DataFrame, keys: list[str], relative_accuracy: float
+) -> pd.DataFrame:
+    """
+    Per-group stats from StepPartials: median_ms/p95_ms within relative_accuracy.
+    Partials are built per (run, node) chunk and merged, as they would be
+    when each chunk is summarized on its own.
+    """
+    chunks = df.groupby([K.RUN, K.NODE], dropna=False, observed=True, sort=False)
+    parts = merge_partials(
+        step_partials(chunk, keys, relative_accuracy=relative_accuracy)
+        for _, chunk in chunks
+    )
+    out = partials_frame(parts, keys)
+    return categorize(out, [K.QUERY_NAME, K.STEP_KEY])
 
 
-def _p95(s: pd.Series) -> float:
-    return pct(s, 95)
+def _sample_counts(
+    out: pd.DataFrame, df: pd.DataFrame, keys: list[str], sample_rate: float
+) -> pd.DataFrame:
+    """
+    Label per-group stats of sampled requests: n_requests, the number of
+    sampled requests behind each row, and the sample_rate they were drawn at.
+    """
+    reqs = (
+        df.drop_duplicates([*keys, K.RUN, K.REQUEST_ID])
+        .groupby(keys, dropna=False, observed=True)
+        .size()
+        .rename(K.N_REQUESTS)
+        .reset_index()
+    )
+    out, reqs = align_categories([out, reqs])
+    out = out.merge(reqs, on=keys, how="left")
+    out[K.SAMPLE_RATE] = sample_rate
+    return out
 
 
-def make_step_stats(gaps_with_qname: pd.DataFrame) -> pd.DataFrame:
+def make_step_stats(
+    gaps_with_qname: pd.DataFrame,
+    *,
+    quantile_accuracy: float | None = None,
+    sample_rate: float | None = None,
+) -> pd.DataFrame:
     """
     Aggregate gap_ms per (query_name, step_key, iteration).
+    With quantile_accuracy, median_ms/p95_ms come from mergeable sketches
+    (see StepPartial) and are within that relative error of the exact values.
+    With sample_rate (gaps of hash-sampled requests), n_requests and
+    sample_rate columns give the sample behind each row.
     """
+    cols = (
+        STEP_STATS_COLS if sample_rate is None else STEP_STATS_COLS.append(SAMPLED_COLS)
+    )
     if gaps_with_qname.empty:
-        return pd.DataFrame(columns=STEP_STATS_COLS)
+        return pd.DataFrame(columns=cols)
 
     qn = gaps_with_qname.get(K.QUERY_NAME)
     if not isinstance(qn, pd.Series):
-        return pd.DataFrame(columns=STEP_STATS_COLS)
+        return pd.DataFrame(columns=cols)
 
     g = as_df(gaps_with_qname.loc[pd.notna(qn)].copy())
     if g.empty:
-        return pd.DataFrame(columns=STEP_STATS_COLS)
-
-    grp = g.groupby([K.QUERY_NAME, K.STEP_KEY, K.ITERATION], dropna=False)
-
-    out = as_df(
-        grp.agg(
-            n=(K.GAP_MS, "count"),
-            median_ms=(K.GAP_MS, _p50),
-            p95_ms=(K.GAP_MS, _p95),
-            mean_ms=(K.GAP_MS, "mean"),
-            max_ms=(K.GAP_MS, "max"),
-            sum_ms=(K.GAP_MS, "sum"),
-        ).reset_index()
-    )
+        return pd.DataFrame(columns=cols)
+
+    keys = [K.QUERY_NAME, K.STEP_KEY, K.ITERATION]
+    if quantile_accuracy is not None:
+        out = _approx_stats(g, keys, quantile_accuracy)
+    else:
+        grp = g.groupby(keys, dropna=False, observed=True)
+        out = as_df(
+            grp.agg(
+                n=(K.GAP_MS, "count"),
+                mean_ms=(K.GAP_MS, "mean"),
+                max_ms=(K.GAP_MS, "max"),
+                sum_ms=(K.GAP_MS, "sum"),
+            )
+            .assign(**_gap_percentiles(g, grp))
+            .reset_index()
+        )
+    if sample_rate is not None:
+        out = _sample_counts(out, g, keys, sample_rate)
 
     # stable two-pass sort
     out = out.sort_values(by=K.SUM_MS, ascending=False, kind="mergesort")
     out = out.sort_values(by=K.QUERY_NAME, ascending=True, kind="mergesort")
-    return out.reindex(columns=STEP_STATS_COLS).reset_index(drop=True)
+    return out.reindex(columns=cols).reset_index(drop=True)
 
 
 def build_ordered_step_side_table(
@@ -56,10 +124,12 @@ def build_ordered_step_side_table(
     base_query: str,
     opt_query: str,
     step_prefix: str = "Step ",
+    quantile_accuracy: float | None = None,
+    sample_rate: float | None = None,
 ) -> pd.DataFrame:
     """
     Side-by-side stats for steps, ordered by median position within each request.
-    Uses only STEP events.
+    Uses only STEP events. quantile_accuracy, sample_rate: as in make_step_stats.
     """
     if gapsq.empty:
         return pd.DataFrame()
@@ -84,37 +154,42 @@ def build_ordered_step_side_table(
         return pd.DataFrame()
 
     # Deterministic ordering for cumcount
-    twoq = (
-        twoq.set_index([K.QUERY_NAME, K.RUN, K.REQUEST_ID, K.TS])
-        .sort_index()
-        .reset_index()
-    )
+    twoq = sort_rows(twoq, (K.QUERY_NAME, K.RUN, K.REQUEST_ID, K.TS))
     twoq[K.POS_IN_REQUEST] = (
-        twoq.groupby([K.QUERY_NAME, K.RUN, K.REQUEST_ID]).cumcount() + 1
+        twoq.groupby([K.QUERY_NAME, K.RUN, K.REQUEST_ID], observed=True).cumcount() + 1
     )
 
     # Median position per step_key within each query
     pos_tbl = (
-        twoq.groupby([K.QUERY_NAME, K.STEP_KEY])[K.POS_IN_REQUEST]
+        twoq.groupby([K.QUERY_NAME, K.STEP_KEY], observed=True)[K.POS_IN_REQUEST]
         .median()
         .rename(K.MEDIAN_POS)
         .reset_index()
     )
 
     # Per (query_name, step_key) stats
-    stats = (
-        twoq.groupby([K.QUERY_NAME, K.STEP_KEY])
-        .agg(
-            n=(K.GAP_MS, "size"),
-            mean_ms=(K.GAP_MS, "mean"),
-            median_ms=(K.GAP_MS, _p50),
-            p95_ms=(K.GAP_MS, _p95),
-            max_ms=(K.GAP_MS, "max"),
-            sum_ms=(K.GAP_MS, "sum"),
+    keys = [K.QUERY_NAME, K.STEP_KEY]
+    metric_cols = [K.N, K.MEAN_MS, K.MEDIAN_MS, K.P95_MS, K.MAX_MS, K.SUM_MS]
+    if quantile_accuracy is not None:
+        stats = _approx_stats(twoq, keys, quantile_accuracy)
+        stats = stats.reindex(columns=[*keys, *metric_cols])
+        stats, pos_tbl = align_categories([stats, pos_tbl])
+    else:
+        grp = twoq.groupby(keys, observed=True)
+        stats = (
+            grp.agg(
+                n=(K.GAP_MS, "size"),
+                mean_ms=(K.GAP_MS, "mean"),
+                max_ms=(K.GAP_MS, "max"),
+                sum_ms=(K.GAP_MS, "sum"),
+            )
+            .assign(**_gap_percentiles(twoq, grp))
+            .reindex(columns=metric_cols)
+            .reset_index()
         )
-        .reset_index()
-        .merge(pos_tbl, on=[K.QUERY_NAME, K.STEP_KEY], how="left")
-    )
+    if sample_rate is not None:
+        stats = _sample_counts(stats, twoq, keys, sample_rate)
+    stats = stats.merge(pos_tbl, on=keys, how="left")
 
     # Split + prefix
     base = stats.loc[stats[K.QUERY_NAME] == base_query].copy()
@@ -131,6 +206,7 @@ def build_ordered_step_side_table(
             K.MAX_MS: K.BASE_MAX_MS,
             K.SUM_MS: K.BASE_SUM_MS,
             K.MEDIAN_POS: K.BASE_POS,
+            K.N_REQUESTS: K.BASE_N_REQUESTS,
         }
     ).drop(columns=[K.QUERY_NAME])
 
@@ -143,10 +219,13 @@ def build_ordered_step_side_table(
             K.MAX_MS: K.OPT_MAX_MS,
             K.SUM_MS: K.OPT_SUM_MS,
             K.MEDIAN_POS: K.OPT_POS,
+            K.N_REQUESTS: K.OPT_N_REQUESTS,
         }
     ).drop(columns=[K.QUERY_NAME])
 
-    side = base.merge(opt, on=K.STEP_KEY, how="outer", indicator=True)
+    # sample_rate is the same on every row: a join key, so it is not doubled
+    on = [K.STEP_KEY] if sample_rate is None else [K.STEP_KEY, K.SAMPLE_RATE]
+    side = base.merge(opt, on=on, how="outer", indicator=True)
 
     merge_s = side["_merge"].astype("string")
     side[K.PRESENT_IN] = merge_s.replace(
@@ -32,6 +32,11 @@ def compare_two_queries(
 
     # Columns to prefix
     metric_cols = [K.N, K.MEDIAN_MS, K.P95_MS, K.MEAN_MS, K.MAX_MS, K.SUM_MS]
+    keys = [K.STEP_KEY, K.ITERATION]
+    if K.SAMPLE_RATE in stats.columns:
+        # sampled stats: per-side request counts, one shared sample_rate
+        metric_cols.append(K.N_REQUESTS)
+        keys.append(K.SAMPLE_RATE)
 
     base = base.rename(columns=_prefixed_map("base_", metric_cols)).drop(
         columns=[K.QUERY_NAME]
@@ -40,7 +45,7 @@ def compare_two_queries(
         columns=[K.QUERY_NAME]
     )
 
-    joined = base.merge(opt, on=[K.STEP_KEY, K.ITERATION], how="outer", indicator=True)
+    joined = base.merge(opt, on=keys, how="outer", indicator=True)
     joined = _add_present_in(joined)
 
     # Calculation 1: Mean
@@ -0,0 +1,138 @@
+import struct
+from collections.abc import Hashable, Iterable, Sequence
+from dataclasses import dataclass, field
+from math import nan
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+from analysis import dfkeys as K
+from common.support.sketch import DDSketch
+
+_HEADER = struct.Struct("<Qdd")
+
+
+@dataclass(slots=True)
+class StepPartial:
+    """
+    Mergeable summary of one step's gap_ms values: count, sum, max and a
+    DDSketch for median/p95. Its size depends on the value range, not on
+    the number of gaps, so partials built per node, file or run can be
+    merged (map-reduce) instead of concatenating every gap row first.
+    """
+
+    n: int = 0
+    sum_ms: float = 0.0
+    max_ms: float = nan
+    sketch: DDSketch = field(default_factory=DDSketch)
+
+    def merge(self, other: Self) -> None:
+        self.sketch.merge(other.sketch)
+        self.n += other.n
+        self.sum_ms += other.sum_ms
+        if np.isnan(self.max_ms) or other.max_ms > self.max_ms:
+            self.max_ms = other.max_ms
+
+    def stats(self) -> dict[str, float]:
+        """
+        The make_step_stats metrics, median_ms/p95_ms approximate.
+        """
+        median, p95 = self.sketch.quantiles((50, 95))
+        return {
+            K.N: self.n,
+            K.MEDIAN_MS: median,
+            K.P95_MS: p95,
+            K.MEAN_MS: self.sum_ms / self.n if self.n else nan,
+            K.MAX_MS: self.max_ms,
+            K.SUM_MS: self.sum_ms,
+        }
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(self.n, self.sum_ms, self.max_ms) + self.sketch.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        n, sum_ms, max_ms = _HEADER.unpack_from(data)
+        return cls(n, sum_ms, max_ms, DDSketch.from_bytes(data[_HEADER.size :]))
+
+
+type StepPartials = dict[tuple[Hashable, ...], StepPartial]
+
+
+def step_partials(
+    gaps: pd.DataFrame, keys: Sequence[str], *, relative_accuracy: float = 0.01
+) -> StepPartials:
+    """
+    One StepPartial of gap_ms per group of keys (NaN keys kept, as None).
+    Bucketing is vectorized over all rows; only the distinct (group, bucket)
+    pairs are visited in Python.
+    """
+    if gaps.empty:
+        return {}
+
+    grp = gaps.groupby(list(keys), dropna=False, observed=True)
+    agg = grp[K.GAP_MS].agg(["count", "sum", "max"])
+    parts = [
+        StepPartial(n, s, m, DDSketch(relative_accuracy=relative_accuracy))
+        for n, s, m in zip(
+            agg["count"].tolist(), agg["sum"].tolist(), agg["max"].tolist()
+        )
+    ]
+
+    x = gaps[K.GAP_MS].to_numpy(dtype=np.float64)
+    codes = grp.ngroup().to_numpy(dtype=np.float64)
+    ok = ~np.isnan(x) & (codes >= 0)
+    x, codes = x[ok], codes[ok].astype(np.intp)
+
+    probe = parts[0].sketch if parts else DDSketch(relative_accuracy=relative_accuracy)
+    small = np.abs(x) < probe.min_value
+    for i, c in zip(*np.unique(codes[small], return_counts=True)):
+        parts[i].sketch.add_zeros(int(c))
+
+    for negative, sel in ((False, ~small & (x > 0)), (True, ~small & (x < 0))):
+        pairs = np.stack([codes[sel], probe.bucket_keys(x[sel])], axis=1)
+        if not len(pairs):
+            continue
+        uniq, counts = np.unique(pairs, axis=0, return_counts=True)
+        bounds = np.flatnonzero(np.diff(uniq[:, 0])) + 1
+        for rows in np.split(np.arange(len(uniq)), bounds):
+            i = int(uniq[rows[0], 0])
+            parts[i].sketch.add_counts(uniq[rows, 1], counts[rows], negative=negative)
+
+    # NaN keys become None so partials of different shards meet in a dict.
+    labels = (
+        tuple(
+            None if pd.isna(v) else v for v in (lb if isinstance(lb, tuple) else (lb,))
+        )
+        for lb in agg.index.tolist()
+    )
+    return dict(zip(labels, parts))
+
+
+def merge_partials(partials: Iterable[StepPartials]) -> StepPartials:
+    """
+    Merge per-shard partials (e.g. one per node) into one per step.
+    """
+    out: StepPartials = {}
+    for shard in partials:
+        for key, part in shard.items():
+            mine = out.get(key)
+            if mine is None:
+                out[key] = mine = StepPartial(
+                    sketch=DDSketch(
+                        relative_accuracy=part.sketch.relative_accuracy,
+                        min_value=part.sketch.min_value,
+                    )
+                )
+            mine.merge(part)
+    return out
+
+
+def partials_frame(partials: StepPartials, keys: Sequence[str]) -> pd.DataFrame:
+    """
+    Key columns plus StepPartial.stats() per partial, one row each.
+    """
+    rows = [{**dict(zip(keys, key)), **part.stats()} for key, part in partials.items()]
+    cols = [*keys, K.N, K.MEDIAN_MS, K.P95_MS, K.MEAN_MS, K.MAX_MS, K.SUM_MS]
+    return pd.DataFrame(rows, columns=cols)
@@ -0,0 +1,106 @@
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from math import nan
+
+import pandas as pd
+
+from analysis import dfkeys as K
+from analysis.step_stats.aggregate import make_step_stats
+from common.model.types import QueryName, RequestId, RunId
+from transforms.stream import StepGap
+
+type _StepKey = tuple[QueryName, str, int | None]
+type _ReqKey = tuple[RunId, RequestId]
+
+
+@dataclass(slots=True)
+class RollingStepStats:
+    """
+    Step statistics over the most recent `window` gaps of every
+    (query_name, step_key, iteration), in bounded memory.
+    Gaps of requests whose query name is not known yet wait in a pending
+    buffer until the RESTPP line naming the request arrives: at most
+    max_requests requests and their last `window` gaps each, dropped once
+    the request has logged nothing for pending_s seconds of its run's log
+    time.
+    """
+
+    window: int = 2000
+    max_requests: int = 100_000
+    pending_s: float = 300.0
+
+    _samples: dict[_StepKey, deque[float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _names: OrderedDict[_ReqKey, QueryName] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    # least recently extended first
+    _pending: OrderedDict[_ReqKey, deque[StepGap]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    # latest gap stamp per run: runs' logs need not share a clock
+    _newest: dict[RunId, int] = field(default_factory=dict, init=False, repr=False)
+
+    def name_request(
+        self, run: RunId, request_id: RequestId, query_name: QueryName
+    ) -> None:
+        key = (run, request_id)
+        if key in self._names:
+            return
+        self._names[key] = query_name
+        if len(self._names) > self.max_requests:
+            self._names.popitem(last=False)
+
+        for gap in self._pending.pop(key, ()):
+            self._record(query_name, gap)
+
+    def add(self, gap: StepGap) -> None:
+        self._newest[gap.run] = max(self._newest.get(gap.run, gap.ts_ns), gap.ts_ns)
+        key = (gap.run, gap.request_id)
+        query_name = self._names.get(key)
+        if query_name is not None:
+            self._record(query_name, gap)
+            return
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = deque(maxlen=self.window)
+        pending.append(gap)
+        self._pending.move_to_end(key)
+        if len(self._pending) > self.max_requests:
+            self._pending.popitem(last=False)
+        self._evict_pending()
+
+    def _evict_pending(self) -> None:
+        """
+        Drop the least recently extended pending requests while their latest
+        gap is more than pending_s older than their run's latest.
+        """
+        max_age_ns = int(self.pending_s * 1e9)
+        while self._pending:
+            (run, _), oldest = next(iter(self._pending.items()))
+            if self._newest[run] - oldest[-1].ts_ns <= max_age_ns:
+                return
+            self._pending.popitem(last=False)
+
+    def _record(self, query_name: QueryName, gap: StepGap) -> None:
+        key = (query_name, gap.step_key, gap.iteration)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(gap.gap_ms)
+
+    def snapshot(self) -> pd.DataFrame:
+        """
+        make_step_stats over the current windows.
+        """
+        rows = [
+            (query_name, step_key, nan if iteration is None else iteration, gap_ms)
+            for (query_name, step_key, iteration), samples in self._samples.items()
+            for gap_ms in samples
+        ]
+        gaps = pd.DataFrame(
+            rows, columns=[K.QUERY_NAME, K.STEP_KEY, K.ITERATION, K.GAP_MS]
+        )
+        return make_step_stats(gaps)
@@ -16,6 +16,9 @@ STEP_STATS_COLS = pd.Index(
     ]
 )
 
+# Appended to STEP_STATS_COLS for stats of sampled requests.
+SAMPLED_COLS = pd.Index([K.N_REQUESTS, K.SAMPLE_RATE])
+
 COMPARE_COLS = pd.Index(
     [
         K.STEP_KEY,
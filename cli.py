@@ -1,8 +1,17 @@
 import argparse
+from datetime import datetime
 from pathlib import Path
 
-from common.model.config import AppConfig, CompareConfig
-from common.model.types import RunInput
+from common.model.config import (
+    AppConfig,
+    CompareConfig,
+    FollowConfig,
+    check_quantile_accuracy,
+    check_sample_rate,
+    check_time_window,
+)
+from common.model.types import TABLE_FORMATS, RunInput
+from export.writers import require_table_format
 
 
 def _parse_run_arg(arg_value: str) -> RunInput:
@@ -24,6 +33,38 @@ def _parse_run_arg(arg_value: str) -> RunInput:
     return RunInput(id=id.strip(), path=path)
 
 
+def _parse_time_arg(arg_value: str) -> datetime:
+    """
+    Parses a log-time bound in ISO format, e.g. '2025-12-19 10:00:00'.
+    """
+    try:
+        return datetime.fromisoformat(arg_value.strip())
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid time: '{arg_value}'. Use YYYY-MM-DD HH:MM[:SS[.ffffff]]"
+        ) from None
+
+
+def _parse_sample_rate_arg(arg_value: str) -> float:
+    """
+    Parses a request sample rate, a fraction in (0, 1].
+    """
+    try:
+        return check_sample_rate(float(arg_value), name="RATE")
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def _parse_accuracy_arg(arg_value: str) -> float:
+    """
+    Parses a quantile sketch relative accuracy, in (0, 1).
+    """
+    try:
+        return check_quantile_accuracy(float(arg_value), name="ACCURACY")
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
 def _get_default_output_dir() -> Path:
     """
     Calculates a sensible default output directory relative to the repository.
@@ -75,6 +116,83 @@ def build_parser() -> argparse.ArgumentParser:
         help="Directory to save artifacts. Defaults to ../LogAnalyzer_outputs",
     )
 
+    parser.add_argument(
+        "--format",
+        choices=TABLE_FORMATS,
+        default="csv",
+        help="Artifact table format; parquet/feather need pyarrow (default: csv)",
+        dest="table_format",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for log ingestion; 1 parses serially (default: 1)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every log file instead of reusing the on-disk parse cache",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Parse cache directory (default: $LOGANALYZER_CACHE_DIR or ~/.cache/loganalyzer)",
+    )
+
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=2048,
+        help="Size cap of the parse cache; least recently used files are evicted (default: 2048)",
+    )
+
+    parser.add_argument(
+        "--fused-gaps",
+        action="store_true",
+        help="Compute gaps while ingesting GPE logs instead of building the events frame (skips gpe_events_attached)",
+    )
+
+    parser.add_argument(
+        "--compared-only",
+        action="store_true",
+        help="Parse RESTPP first and keep only GPE events of the base/opt query requests",
+    )
+
+    parser.add_argument(
+        "--since",
+        type=_parse_time_arg,
+        default=None,
+        help="Only read log lines stamped at or after this local time, e.g. '2025-12-19 10:00'",
+    )
+
+    parser.add_argument(
+        "--until",
+        type=_parse_time_arg,
+        default=None,
+        help="Only read log lines stamped before this local time",
+    )
+
+    parser.add_argument(
+        "--sample-rate",
+        type=_parse_sample_rate_arg,
+        default=None,
+        metavar="RATE",
+        help="Analyze a deterministic hash sample of this fraction of requests, e.g. 0.05 (default: all)",
+    )
+
+    parser.add_argument(
+        "--approx-quantiles",
+        type=_parse_accuracy_arg,
+        default=None,
+        metavar="ACCURACY",
+        help="Approximate step median/p95 with mergeable sketches at this relative error, e.g. 0.01 (default: exact)",
+        dest="quantile_accuracy",
+    )
+
     parser.add_argument(
         "--open-plot",
         action="store_true",
@@ -102,12 +220,111 @@ def parse_cli_args(argv: list[str] | None = None) -> AppConfig:
         else _get_default_output_dir()
     )
 
+    cache_dir = Path(args.cache_dir).expanduser().resolve() if args.cache_dir else None
+
+    try:
+        check_time_window(args.since, args.until)
+    except ValueError:
+        parser.error("--since must be before --until")
+
+    try:
+        require_table_format(args.table_format)
+    except ImportError as e:
+        parser.error(str(e))
+
     cfg = CompareConfig(
         runs=runs,
         nodes=nodes,
         base_query=str(args.base_query),
         opt_query=str(args.opt_query),
         out_dir=out_dir,
+        jobs=max(1, int(args.jobs)),
+        use_cache=not args.no_cache,
+        cache_dir=cache_dir,
+        cache_max_mb=max(0, int(args.cache_max_mb)),
+        table_format=args.table_format,
+        fused_gaps=bool(args.fused_gaps),
+        quantile_accuracy=args.quantile_accuracy,
+        compared_only=bool(args.compared_only),
+        since=args.since,
+        until=args.until,
+        sample_rate=args.sample_rate,
     )
 
     return AppConfig(cfg=cfg, open_plot=bool(args.open_plot))
+
+
+def build_follow_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="loganalyzer follow",
+        description="Tail RESTPP/GPE logs and report rolling per-step statistics.",
+    )
+
+    parser.add_argument(
+        "--run",
+        action="append",
+        type=_parse_run_arg,
+        required=True,
+        help="Run definition in KEY=PATH format (e.g. 'base=/tmp/logs'). Can be repeated.",
+        dest="runs",
+    )
+
+    parser.add_argument(
+        "--nodes",
+        nargs="+",
+        default=["m1", "m2", "m3", "m4"],
+        help="List of node names to follow (default: m1 m2 m3 m4)",
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Seconds between statistics reports (default: 5)",
+    )
+
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=2000,
+        help="Most recent gaps kept per step for the statistics (default: 2000)",
+    )
+
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Rows shown per report (default: 20)",
+    )
+
+    parser.add_argument(
+        "--from-end",
+        action="store_true",
+        help="Ignore what is already in the files and only follow new lines",
+    )
+
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop after this many seconds (default: follow until interrupted)",
+    )
+
+    return parser
+
+
+def parse_follow_args(argv: list[str] | None = None) -> FollowConfig:
+    """
+    Parses `loganalyzer follow` arguments into a FollowConfig.
+    """
+    args = build_follow_parser().parse_args(argv)
+
+    return FollowConfig(
+        runs=tuple(args.runs),
+        nodes=tuple(str(n) for n in args.nodes),
+        interval_s=max(0.1, float(args.interval)),
+        window=max(1, int(args.window)),
+        top=max(1, int(args.top)),
+        from_end=bool(args.from_end),
+        duration_s=args.duration,
+    )
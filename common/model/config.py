@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 
-from common.model.types import RunInput, QueryName
+from common.model.types import RunInput, QueryName, TableFormat
 
 
 @dataclass(frozen=True, slots=True)
@@ -11,9 +12,58 @@ class CompareConfig:
     base_query: QueryName
     opt_query: QueryName
     out_dir: Path = Path("out")
+    jobs: int = 1
+    use_cache: bool = True
+    cache_dir: Path | None = None  # None -> default_cache_dir() / "parsed"
+    cache_max_mb: int = 2048
+    table_format: TableFormat = "csv"
+    fused_gaps: bool = False  # link + gap GPE lines during ingest, no events frame
+    quantile_accuracy: float | None = None  # sketch median/p95 at this relative error
+    compared_only: bool = False  # collect GPE rows of base/opt query requests only
+    since: datetime | None = None  # read log lines stamped at or after this
+    until: datetime | None = None  # read log lines stamped before this
+    sample_rate: float | None = None  # keep this hash-sampled fraction of requests
+
+
+@dataclass(frozen=True, slots=True)
+class FollowConfig:
+    runs: tuple[RunInput, ...]
+    nodes: tuple[str, ...]
+    interval_s: float = 5.0  # how often rolling stats are reported
+    poll_s: float = 0.5  # how often files are checked for new lines
+    window: int = 2000  # most recent gaps kept per step
+    top: int = 20  # rows shown per report
+    from_end: bool = False  # skip what is already in the files at startup
+    duration_s: float | None = None  # None follows until interrupted
 
 
 @dataclass(frozen=True, slots=True)
 class AppConfig:
     cfg: CompareConfig
     open_plot: bool
+
+
+def check_sample_rate(value: float, *, name: str = "sample_rate") -> float:
+    """
+    value if it is a valid request sample rate, a fraction in (0, 1].
+    """
+    if not 0.0 < value <= 1.0:
+        raise ValueError(f"{name} must be in (0, 1], got {value}")
+    return value
+
+
+def check_quantile_accuracy(value: float, *, name: str = "quantile_accuracy") -> float:
+    """
+    value if it is a valid sketch relative accuracy, in (0, 1).
+    """
+    if not 0.0 < value < 1.0:
+        raise ValueError(f"{name} must be in (0, 1), got {value}")
+    return value
+
+
+def check_time_window(since: datetime | None, until: datetime | None) -> None:
+    """
+    Raise unless the [since, until) log time window can hold a line.
+    """
+    if since is not None and until is not None and since >= until:
+        raise ValueError(f"since ({since}) must be before until ({until})")
@@ -1,5 +1,18 @@
 RESTPP_RAW_TOKEN: str = "RawRequest|,"
 RESTPP_REQINFO_TOKEN: str = "RequestInfo|,"
+RESTPP_RETURN_TOKEN: str = "ReturnResult"
+
+GPE_UDF_TOKEN: str = "UDF_"
+GPE_RUNUDF_TOKEN: str = "RunUDF"
+
+# Every line a decoder can use contains at least one of these substrings;
+# lines with none of them are skipped before any regex runs.
+RESTPP_MARKER_TOKENS: tuple[str, ...] = (
+    RESTPP_RAW_TOKEN,
+    RESTPP_RETURN_TOKEN,
+    RESTPP_REQINFO_TOKEN,
+)
+GPE_MARKER_TOKENS: tuple[str, ...] = (GPE_UDF_TOKEN, GPE_RUNUDF_TOKEN)
 
 RESTPP_GLOB: str = "restpp*"
 GPE_GLOB: str = "gpe*"
@@ -7,15 +7,16 @@ class LogExtracts:
     """The raw dataframes ingested directly from the log files."""
 
     rest_requests: pd.DataFrame
-    gpe_events: pd.DataFrame
+    gpe_events: pd.DataFrame | None  # None when gaps were fused into ingest
 
 
 @dataclass(frozen=True, slots=True)
 class QueryEvents:
     """Events processed and linked to query executions."""
 
-    linked_events: pd.DataFrame
+    linked_events: pd.DataFrame | None  # None when gaps were fused into ingest
     step_timings: pd.DataFrame
+    request_rollup: pd.DataFrame  # per (run, request_id) GPE spans
 
 
 @dataclass(frozen=True, slots=True)
@@ -47,3 +48,4 @@ class PipelineOutput:
     extracts: LogExtracts
     events: QueryEvents
     comparison: PerformanceComparison
+    sample_rate: float | None = None  # set when only a hash sample of requests was read
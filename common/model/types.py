@@ -1,16 +1,18 @@
 from pathlib import Path
-from datetime import datetime
 from dataclasses import dataclass
-from typing import NamedTuple
+from typing import Literal, NamedTuple
 
 type RunId = str
 type Node = str
 type RequestId = str
 type QueryName = str
 
+type TableFormat = Literal["csv", "parquet", "feather"]
+TABLE_FORMATS: tuple[TableFormat, ...] = ("csv", "parquet", "feather")
+
 
 class GlogEntry(NamedTuple):
-    ts: datetime
+    ts_ns: int
     tid: int
     msg: str
 
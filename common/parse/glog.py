@@ -1,9 +1,31 @@
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
 
 from common.parse.regexes import GLOG
 from common.model.types import GlogEntry
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+# Only the first lines of a glog file carry the INFO.YYYYMMDD header.
+HEADER_LINES: int = 11
+
+
+def header_year(lines: Iterable[str]) -> int | None:
+    """
+    Year from a header line like INFO.20251219... within the first HEADER_LINES.
+    """
+    for i, line in enumerate(lines):
+        if i >= HEADER_LINES:
+            break
+        m = GLOG.header_date.search(line)
+        if m:
+            return int(m.group("year"))
+    return None
+
 
 def detect_year_from_header(log_path: Path, default_year: int) -> int:
     """
@@ -11,21 +33,124 @@ def detect_year_from_header(log_path: Path, default_year: int) -> int:
     """
     try:
         with log_path.open("r", errors="replace") as f:
-            for i, line in enumerate(f):
-                if i > 10:
-                    break
-                m = GLOG.header_date.search(line)
-                if m:
-                    return int(m.group("year"))
+            year = header_year(f)
     except Exception:
-        pass
-    return default_year
+        year = None
+    return default_year if year is None else year
+
+
+def _is_ascii_digits(s: str) -> bool:
+    return s.isascii() and s.isdigit()
+
+
+@lru_cache(maxsize=4096)
+def _second_epoch_ns(year: int, mmdd_hms: str) -> int | None:
+    """
+    'MMDD HH:MM:SS' -> epoch-ns of that (naive) second, or None if the slice
+    is not in the fixed glog layout or is not a valid date.
+    """
+    if (
+        mmdd_hms[4] != " "
+        or mmdd_hms[7] != ":"
+        or mmdd_hms[10] != ":"
+        or not _is_ascii_digits(mmdd_hms[0:4])
+        or not _is_ascii_digits(mmdd_hms[5:7])
+        or not _is_ascii_digits(mmdd_hms[8:10])
+        or not _is_ascii_digits(mmdd_hms[11:13])
+    ):
+        return None
+
+    try:
+        dt = datetime(
+            year,
+            int(mmdd_hms[0:2]),
+            int(mmdd_hms[2:4]),
+            int(mmdd_hms[5:7]),
+            int(mmdd_hms[8:10]),
+            int(mmdd_hms[11:13]),
+        )
+    except ValueError:
+        return None
+
+    return (dt - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+# Length of the 'LMMDD HH:MM:SS.ffffff' timestamp that opens every glog line.
+TS_PREFIX_LEN: int = 21
+
+
+def glog_ts_ns(line: str, year: int) -> int | None:
+    """
+    Epoch-ns of the timestamp opening a glog line of any severity, or None.
+    Only the first TS_PREFIX_LEN characters are read, so callers can pass
+    just that much of a line; the value equals parse_glog_line's ts_ns.
+    """
+    if len(line) < TS_PREFIX_LEN or line[0] not in "IWEF" or line[14] != ".":
+        return None
+
+    sec_ns = _second_epoch_ns(year, line[1:14])
+    frac = line[15:21]
+    if sec_ns is None or not _is_ascii_digits(frac):
+        return None
+    return sec_ns + int(frac) * 1000
+
+
+def epoch_ns(dt: datetime) -> int:
+    """
+    Naive datetime -> epoch-ns on the same (naive) clock as glog ts_ns.
+    """
+    return (dt - _EPOCH) // _ONE_MICROSECOND * 1000
+
+
+def _parse_fixed_prefix(line: str, year: int) -> GlogEntry | None:
+    """
+    Slice-based parse of the fixed-width 'IMMDD HH:MM:SS.ffffff tid file:line] '
+    header. Returns None whenever the line strays from that layout; the caller
+    then falls back to the regex.
+    """
+    if len(line) < 24 or line[0] != "I" or line[14] != "." or line[21] != " ":
+        return None
+
+    sec_ns = _second_epoch_ns(year, line[1:14])
+    if sec_ns is None:
+        return None
+
+    frac = line[15:21]
+    if not _is_ascii_digits(frac):
+        return None
+
+    # glog pads the thread id with spaces
+    start = 22
+    while line[start : start + 1] == " ":
+        start += 1
+    end = line.find(" ", start)
+    tid = line[start:end]
+    if end < 0 or not _is_ascii_digits(tid):
+        return None
+
+    # msg starts after the first ']' that is followed by whitespace
+    close = line.find("]", end)
+    while close >= 0 and not line[close + 1 : close + 2].isspace():
+        close = line.find("]", close + 1)
+    if close < 0:
+        return None
+
+    msg = line[close + 1 :].lstrip()
+    if msg.endswith("\n"):
+        msg = msg[:-1]
+
+    return GlogEntry(ts_ns=sec_ns + int(frac) * 1000, tid=int(tid), msg=msg)
 
 
 def parse_glog_line(line: str, year: int) -> GlogEntry | None:
     """
-    Parse a glog INFO line prefix and return (ts, tid, msg).
+    Parse a glog INFO line prefix and return (ts_ns, tid, msg).
+    Tries the fixed-width fast path first, then the general regex.
     """
+    fast = _parse_fixed_prefix(line, year)
+    if fast is not None:
+        return fast
+
     m = GLOG.info_line.match(line)
     if not m:
         return None
@@ -38,4 +163,5 @@ def parse_glog_line(line: str, year: int) -> GlogEntry | None:
     except ValueError:
         return None
 
-    return GlogEntry(ts=ts, tid=int(m.group("tid")), msg=m.group("msg"))
+    ts_ns = (ts - _EPOCH) // _ONE_MICROSECOND * 1000
+    return GlogEntry(ts_ns=ts_ns, tid=int(m.group("tid")), msg=m.group("msg"))
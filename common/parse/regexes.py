@@ -30,6 +30,7 @@ class _GpeRegexes:
 @dataclass(frozen=True, slots=True)
 class _RequestIdRegexes:
     epoch_ms: re.Pattern[str]
+    head: re.Pattern[str]
 
 
 GLOG = _GlogRegexes(
@@ -62,6 +63,7 @@ GPE = _GpeRegexes(
 
 REQUEST_ID = _RequestIdRegexes(
     epoch_ms=_compile(r"\.(?P<epoch_ms>\d{13})(?=\.)"),
+    head=_compile(r"^(?P<seq>\d+)\.(?P<instance>RESTPP_[^.,\s|]+)"),
 )
 
 QUERY_ENDPOINT_RE: re.Pattern[str] = RESTPP.query_endpoint
@@ -9,6 +9,22 @@ def extract_request_id(msg: str) -> str | None:
     return m.group("rid") if m else None
 
 
+def split_request_id(rid: str) -> tuple[int, str, int | None] | None:
+    """
+    (sequence number, RESTPP instance, epoch-ms) of a request id, e.g.
+      16974725.RESTPP_1_1.1766154007634.N  -> (16974725, "RESTPP_1_1", 1766154007634)
+    None when rid does not start with <seq>.RESTPP_<instance>.
+    """
+    m = REQUEST_ID.head.match(rid)
+    if not m:
+        return None
+    return (
+        int(m.group("seq")),
+        m.group("instance"),
+        extract_epoch_ms_from_request_id(rid),
+    )
+
+
 def extract_epoch_ms_from_request_id(rid: str) -> int | None:
     """
     Extract epoch-milliseconds from a RESTPP request id string, e.g.
@@ -0,0 +1,8 @@
+def has_marker(text: str, markers: tuple[str, ...]) -> bool:
+    """
+    Cheap pre-screen: True if any marker substring occurs in text.
+    """
+    for marker in markers:
+        if marker in text:
+            return True
+    return False
@@ -1,11 +1,21 @@
-from dataclasses import dataclass
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
+from typing import Self
 
-from common.parse.glog import detect_year_from_header
+from common.parse.glog import HEADER_LINES, header_year
 from common.parse.request_id import extract_epoch_ms_from_request_id, extract_request_id
 
+# How many leading lines are searched for an epoch-bearing request id.
+YEAR_SCAN_LINES: int = 2000
+
+# Upper bound on remembered files; the oldest entries are dropped first.
+_YEAR_CACHE_MAX_ENTRIES: int = 20_000
+
 
 @dataclass(frozen=True, slots=True)
 class _FileSig:
@@ -24,49 +34,146 @@ def _sig(p: Path) -> _FileSig:
     return _FileSig(path=str(p.resolve()), mtime_ns=st.st_mtime_ns, size=st.st_size)
 
 
-@lru_cache(maxsize=2048)
-def _infer_year_cached(sig: _FileSig, default_year: int, max_lines: int) -> int:
-    p = Path(sig.path)
+def file_sig(p: Path, st: os.stat_result) -> _FileSig:
+    """
+    Fingerprint from an already available stat result (e.g. os.fstat of an open file).
+    """
+    return _FileSig(path=str(p.resolve()), mtime_ns=st.st_mtime_ns, size=st.st_size)
 
-    # First: try epoch from request id in early lines
-    try:
-        with p.open("r", errors="replace") as f:
-            for i, line in enumerate(f):
-                if i >= max_lines:
-                    break
 
-                rid = extract_request_id(line)
-                if not rid:
-                    continue
+def infer_year_from_lines(
+    lines: Iterable[str],
+    default_year: int,
+    *,
+    max_lines: int = YEAR_SCAN_LINES,
+) -> int:
+    """
+    Single pass over a file's leading lines: the epoch-ms of the first request
+    id wins, then the INFO.YYYYMMDD header year, then default_year.
+    """
+    head: list[str] = []
+    for i, line in enumerate(lines):
+        if i >= max_lines:
+            break
+        if i < HEADER_LINES:
+            head.append(line)
+
+        rid = extract_request_id(line)
+        if not rid:
+            continue
+
+        epoch_ms = extract_epoch_ms_from_request_id(rid)
+        if epoch_ms is None:
+            continue
+
+        return datetime.fromtimestamp(epoch_ms / 1000.0).year
 
-                epoch_ms = extract_epoch_ms_from_request_id(rid)
-                if epoch_ms is None:
-                    continue
+    year = header_year(head)
+    return default_year if year is None else year
 
-                return datetime.fromtimestamp(epoch_ms / 1000.0).year
-    except Exception:
-        # fall back below
-        pass
 
-    # Second: try header year
-    return detect_year_from_header(p, default_year=default_year)
+@dataclass(slots=True)
+class YearCache:
+    """
+    (file signature, default year) -> year map. With a path it is stored as
+    JSON, so unchanged files are never re-scanned across invocations;
+    without one it lives for this process only.
+    """
+
+    path: Path | None = None
+    entries: dict[str, int] = field(default_factory=dict)
+    dirty: bool = False
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raw = {}
+        entries = (
+            {str(k): int(v) for k, v in raw.items()} if isinstance(raw, dict) else {}
+        )
+        return cls(path=path, entries=entries)
+
+    @staticmethod
+    def _key(sig: _FileSig, default_year: int) -> str:
+        return f"{sig.path}|{sig.mtime_ns}|{sig.size}|{default_year}"
+
+    def get(self, sig: _FileSig, default_year: int) -> int | None:
+        return self.entries.get(self._key(sig, default_year))
+
+    def put(self, sig: _FileSig, default_year: int, year: int) -> None:
+        key = self._key(sig, default_year)
+        self.entries.pop(key, None)
+        self.entries[key] = year
+        self.dirty = True
+
+    def save(self) -> None:
+        """
+        Write the cache atomically; failures only cost a re-scan next time.
+        """
+        if self.path is None or not self.dirty:
+            return
+
+        overflow = len(self.entries) - _YEAR_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            for key in list(self.entries)[:overflow]:
+                del self.entries[key]
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self.entries), encoding="utf-8")
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=1)
+def default_year_cache() -> YearCache:
+    """
+    The in-process year cache resolve_file_year falls back to.
+    """
+    return YearCache()
+
+
+def resolve_file_year(
+    sig: _FileSig,
+    head: Iterable[str],
+    *,
+    default_year: int,
+    cache: YearCache | None = None,
+) -> int:
+    """
+    Year for a file whose leading lines are `head` (lazily consumed), served
+    from cache (default: this process's) when the file signature is unchanged.
+    """
+    store = cache if cache is not None else default_year_cache()
+
+    year = store.get(sig, default_year)
+    if year is None:
+        year = infer_year_from_lines(head, default_year)
+        store.put(sig, default_year, year)
+    return year
 
 
 def infer_year_from_any_line_epoch(
     log_path: Path,
     default_year: int,
     *,
-    max_lines: int = 2000,
+    max_lines: int = YEAR_SCAN_LINES,
 ) -> int:
     """
     Infer year by scanning for epoch-ms embedded in a request id.
-    Uses caching so each log file is scanned at most once per pipeline run.
+    Standalone helper: opens the file once and consults the persistent cache.
     Falls back to header year, then default_year.
     """
     try:
         sig = _sig(log_path)
-    except Exception:
-        # If stat fails, just do the fallback behavior without cache.
-        return detect_year_from_header(log_path, default_year=default_year)
-
-    return _infer_year_cached(sig, default_year, max_lines)
+        with log_path.open("r", errors="replace") as f:
+            if max_lines != YEAR_SCAN_LINES:
+                return infer_year_from_lines(f, default_year, max_lines=max_lines)
+            return resolve_file_year(sig, f, default_year=default_year)
+    except OSError:
+        return default_year
@@ -0,0 +1,16 @@
+import os
+from pathlib import Path
+
+
+def default_cache_dir() -> Path:
+    """
+    On-disk cache location: $LOGANALYZER_CACHE_DIR, else $XDG_CACHE_HOME/loganalyzer,
+    else ~/.cache/loganalyzer.
+    """
+    raw = os.environ.get("LOGANALYZER_CACHE_DIR")
+    if raw:
+        return Path(raw).expanduser()
+
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg).expanduser() if xdg else Path.home() / ".cache"
+    return base / "loganalyzer"
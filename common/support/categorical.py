@@ -0,0 +1,96 @@
+from collections.abc import Iterable, Sequence
+from typing import cast
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .ordering import unmark_sorted
+
+
+def category_column(
+    values: Sequence[str | None], dtype: pd.CategoricalDtype | None = None
+) -> pd.Categorical:
+    """
+    Dictionary-encode a column of repeated strings (None becomes NaN).
+    Categories are sorted, so sorting/grouping by codes orders rows exactly
+    as sorting the strings would.
+    With dtype (sorted categories shared with other frames, e.g. the request
+    ids of the RESTPP parse), values are coded against it, so those frames
+    concat and merge without re-encoding; values it lacks are added, still
+    sorted, and only then does the column get categories of its own.
+    """
+    vals = np.asarray(values, dtype=object)
+    if dtype is None:
+        return pd.Categorical(vals)
+
+    codes = dtype.categories.get_indexer(pd.Index(vals, dtype=object))
+    missing = (codes < 0) & pd.notna(vals)
+    if missing.any():
+        return pd.Categorical(
+            vals, categories=dtype.categories.union(pd.Index(vals[missing]).unique())
+        )
+    return from_codes(codes, dtype)
+
+
+def from_codes(codes: np.ndarray, dtype: pd.CategoricalDtype) -> pd.Categorical:
+    """
+    pd.Categorical.from_codes for an integer code array (-1 for NaN), which
+    the pandas stubs only accept as a Sequence[int].
+    """
+    return pd.Categorical.from_codes(cast("Sequence[int]", codes), dtype=dtype)
+
+
+def categorize(df: pd.DataFrame, cols: Iterable[str]) -> pd.DataFrame:
+    """
+    Convert the given columns of df (those present) to sorted categoricals, in place.
+    """
+    for c in cols:
+        if c in df.columns and not isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = category_column(df[c].tolist())
+    return df
+
+
+def _union_categories(columns: list[pd.Series]) -> pd.Index | None:
+    if not all(isinstance(s.dtype, pd.CategoricalDtype) for s in columns):
+        return None
+    first = columns[0].cat.categories
+    if all(s.cat.categories.equals(first) for s in columns[1:]):
+        return first
+    return union_categoricals(
+        [pd.Categorical([], categories=s.cat.categories) for s in columns],
+        sort_categories=True,
+    ).categories
+
+
+def align_categories(frames: Sequence[pd.DataFrame]) -> list[pd.DataFrame]:
+    """
+    Give every column that is categorical in all frames the same (sorted,
+    unioned) categories, so concat/merge keep it categorical instead of
+    falling back to object strings.
+    """
+    if len(frames) < 2:
+        return list(frames)
+
+    out = [df.copy(deep=False) for df in frames]
+    shared = set(out[0].columns).intersection(*(df.columns for df in out[1:]))
+    for c in sorted(shared):
+        cats = _union_categories([df[c] for df in out])
+        if cats is None:
+            continue
+        for df in out:
+            if not df[c].cat.categories.equals(cats):
+                df[c] = df[c].cat.set_categories(cats)
+    return out
+
+
+def concat_frames(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """
+    pd.concat(frames, ignore_index=True) that keeps categorical columns categorical.
+    Empty frames are dropped first (their object columns would decay the rest).
+    """
+    nonempty = [df for df in frames if not df.empty]
+    if not nonempty:
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    # Each frame may be sorted; their concatenation need not be.
+    return unmark_sorted(pd.concat(align_categories(nonempty), ignore_index=True))
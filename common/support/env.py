@@ -1,9 +1,17 @@
+from collections.abc import Callable
+from datetime import datetime
 from pathlib import Path
 
 from dotenv import dotenv_values
 
-from common.model.config import CompareConfig, AppConfig
-from common.model.types import RunInput
+from common.model.config import (
+    CompareConfig,
+    AppConfig,
+    check_quantile_accuracy,
+    check_sample_rate,
+    check_time_window,
+)
+from common.model.types import TABLE_FORMATS, RunInput, TableFormat
 
 
 def _require_abs_path(var: str, raw: str | None) -> Path:
@@ -27,6 +35,51 @@ def _parse_nodes(raw: str | None) -> tuple[str, ...]:
     return tuple(x for x in raw.split() if x)
 
 
+def _parse_int(var: str, raw: str | None, default: int) -> int:
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw.strip())
+    except ValueError:
+        raise ValueError(f"{var} must be an integer. Got: {raw}") from None
+
+
+def _parse_checked_float(
+    var: str, raw: str | None, check: Callable[..., float]
+) -> float | None:
+    """
+    Optional number, validated by check(value, name=var).
+    """
+    if raw is None or not raw.strip():
+        return None
+    try:
+        value = float(raw.strip())
+    except ValueError:
+        raise ValueError(f"{var} must be a number. Got: {raw}") from None
+    return check(value, name=var)
+
+
+def _parse_time(var: str, raw: str | None) -> datetime | None:
+    if raw is None or not raw.strip():
+        return None
+    try:
+        return datetime.fromisoformat(raw.strip())
+    except ValueError:
+        raise ValueError(
+            f"{var} must be a time like 2025-12-19 10:00:00. Got: {raw}"
+        ) from None
+
+
+def _parse_table_format(raw: str | None) -> TableFormat:
+    if raw is None or not raw.strip():
+        return "csv"
+    value = raw.strip().lower()
+    for fmt in TABLE_FORMATS:
+        if fmt == value:
+            return fmt
+    raise ValueError(f"FORMAT must be one of {', '.join(TABLE_FORMATS)}. Got: {raw}")
+
+
 def load_env_config(*, env_path: Path) -> AppConfig:
     """
     Loads config from .env and enforces that all configured paths are absolute.
@@ -56,6 +109,49 @@ def load_env_config(*, env_path: Path) -> AppConfig:
     if not base_query or not opt_query:
         raise ValueError("Missing BASE_QUERY or OPT_QUERY in .env")
 
+    # Parse ingestion parallelism
+    jobs = max(1, _parse_int("JOBS", values.get("JOBS"), default=1))
+
+    # Parse parse-cache options
+    use_cache = not _parse_bool(values.get("NO_CACHE"), default=False)
+    cache_dir = (
+        _require_abs_path("CACHE_DIR", values.get("CACHE_DIR"))
+        if values.get("CACHE_DIR")
+        else None
+    )
+    cache_max_mb = max(
+        0, _parse_int("CACHE_MAX_MB", values.get("CACHE_MAX_MB"), default=2048)
+    )
+
+    # Parse artifact table format
+    table_format = _parse_table_format(values.get("FORMAT"))
+
+    # Parse fused GPE gap computation
+    fused_gaps = _parse_bool(values.get("FUSED_GAPS"), default=False)
+
+    # Parse query filter pushdown
+    compared_only = _parse_bool(values.get("COMPARED_ONLY"), default=False)
+
+    # Parse the log time window
+    since = _parse_time("SINCE", values.get("SINCE"))
+    until = _parse_time("UNTIL", values.get("UNTIL"))
+    try:
+        check_time_window(since, until)
+    except ValueError:
+        raise ValueError(
+            f"SINCE must be before UNTIL. Got: {since} / {until}"
+        ) from None
+
+    # Parse request sampling
+    sample_rate = _parse_checked_float(
+        "SAMPLE_RATE", values.get("SAMPLE_RATE"), check_sample_rate
+    )
+
+    # Parse approximate step quantiles
+    quantile_accuracy = _parse_checked_float(
+        "APPROX_QUANTILES", values.get("APPROX_QUANTILES"), check_quantile_accuracy
+    )
+
     # Parse Plotting option
     open_plot = _parse_bool(values.get("OPEN_PLOT"), default=False)
 
@@ -69,6 +165,17 @@ def load_env_config(*, env_path: Path) -> AppConfig:
         base_query=base_query,
         opt_query=opt_query,
         out_dir=out_dir,
+        jobs=jobs,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_max_mb=cache_max_mb,
+        table_format=table_format,
+        fused_gaps=fused_gaps,
+        quantile_accuracy=quantile_accuracy,
+        compared_only=compared_only,
+        since=since,
+        until=until,
+        sample_rate=sample_rate,
     )
 
     return AppConfig(cfg=cfg, open_plot=open_plot)
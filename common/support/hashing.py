@@ -0,0 +1,18 @@
+from hashlib import blake2b
+
+
+def stable_hash64(text: str) -> int:
+    """
+    Signed 64-bit blake2b digest of text; unlike hash(), identical across
+    processes and runs, so it can be computed in workers and cached on disk.
+    """
+    digest = blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+def hash_fraction(text: str) -> float:
+    """
+    stable_hash64 of text mapped onto [0, 1): keeping texts below a rate
+    samples that fraction of them, the same ones on every run.
+    """
+    return (stable_hash64(text) & 0xFFFF_FFFF_FFFF_FFFF) / 2.0**64
@@ -0,0 +1,174 @@
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_timedelta64_dtype,
+)
+
+# df.attrs key holding the columns a frame's rows are known to be sorted by.
+SORTED_BY = "sorted_by"
+
+
+def mark_sorted(df: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """
+    Record on df (in place) that its rows are sorted by keys; returns df.
+    """
+    df.attrs = {**df.attrs, SORTED_BY: tuple(keys)}
+    return df
+
+
+def unmark_sorted(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop df's recorded sort order (in place), e.g. after concatenating frames
+    that are each sorted; returns df.
+    """
+    if SORTED_BY in df.attrs:
+        df.attrs = {k: v for k, v in df.attrs.items() if k != SORTED_BY}
+    return df
+
+
+def _narrow(a: np.ndarray) -> np.ndarray:
+    # numpy's stable argsort is a radix sort for 8/16-bit integers.
+    if a.dtype.kind in "iu" and a.size and a.min() >= 0:
+        return a.astype(np.min_scalar_type(a.max()), copy=False)
+    return a
+
+
+def _components(s: pd.Series) -> list[np.ndarray]:
+    """
+    Arrays whose lexicographic order is s's sort order with nulls last: a
+    null flag (only when s has nulls), then the values. Categoricals order
+    by category, as sort_index/sort_values do.
+    """
+    null: np.ndarray | None
+    dtype = s.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        vals = s.cat.codes.to_numpy()
+        null = vals < 0
+    elif is_datetime64_any_dtype(dtype) or is_timedelta64_dtype(dtype):
+        null = s.isna().to_numpy()
+        vals = s.to_numpy().view("i8")
+    elif is_integer_dtype(dtype) or is_bool_dtype(dtype):
+        vals = s.to_numpy()
+        null = None
+    elif is_float_dtype(dtype):
+        vals = s.to_numpy()
+        null = np.isnan(vals)
+    else:
+        vals, _ = pd.factorize(s, sort=True, use_na_sentinel=True)
+        null = vals < 0
+
+    if null is None or not null.any():
+        return [_narrow(vals)]
+    return [null.view(np.uint8), _narrow(np.where(null, 0, vals))]
+
+
+def _key_components(df: pd.DataFrame, keys: Sequence[str]) -> list[np.ndarray]:
+    return [a for k in keys for a in _components(df[k])]
+
+
+def _is_sorted(comps: list[np.ndarray]) -> bool:
+    if not comps or len(comps[0]) < 2:
+        return True
+    tied = np.ones(len(comps[0]) - 1, dtype=bool)
+    for a in comps:
+        prev, cur = a[:-1], a[1:]
+        if (tied & (cur < prev)).any():
+            return False
+        tied &= cur == prev
+        if not tied.any():
+            break
+    return True
+
+
+def _recorded(df: pd.DataFrame) -> tuple[str, ...]:
+    keys = tuple(df.attrs.get(SORTED_BY, ()))
+    return keys if set(keys) <= set(df.columns) else ()
+
+
+def sorted_by(df: pd.DataFrame) -> tuple[str, ...]:
+    """
+    The sort order recorded on df (see sort_rows), or () when unknown or no
+    longer true. The record is only a hint: pandas carries attrs through
+    operations that reorder rows, and key columns can be reassigned, so it
+    is checked against the key columns (O(n)) before it is trusted.
+    """
+    keys = _recorded(df)
+    if not keys or not _is_sorted(_key_components(df, keys)):
+        return ()
+    return keys
+
+
+def is_sorted(df: pd.DataFrame, keys: Sequence[str]) -> bool:
+    """
+    Whether df's rows are already ordered by keys (nulls last), in O(n).
+    """
+    return _is_sorted(_key_components(df, tuple(keys)))
+
+
+def _group_ids(comps: list[np.ndarray]) -> np.ndarray:
+    """
+    Run ids of rows already sorted by comps (non-decreasing).
+    """
+    n = len(comps[0])
+    if not n:
+        return np.zeros(0, dtype=np.uint8)
+    change = np.zeros(n - 1, dtype=bool)
+    for a in comps:
+        change |= a[1:] != a[:-1]
+    return _narrow(np.concatenate(([0], np.cumsum(change))))
+
+
+def _stable_order(comps: list[np.ndarray]) -> np.ndarray:
+    """
+    Stable lexicographic argsort, one stable pass per component from the last
+    (LSD). The passes are timsorts (radix sorts for small codes), which only
+    merge the presorted runs they find: rows that concatenate per-file
+    streams already in time order cost a k-way merge, not a full sort.
+    """
+    order: np.ndarray | None = None
+    for a in reversed(comps):
+        if order is None:
+            order = np.argsort(a, kind="stable")
+        else:
+            order = order[np.argsort(a[order], kind="stable")]
+    assert order is not None
+    return order
+
+
+def sort_rows(df: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    """
+    Drop-in for df.set_index(keys).sort_index().reset_index(): rows stably
+    sorted by keys (nulls last), key columns first, a fresh RangeIndex.
+    The order is recorded on the result (see sorted_by), and no sort runs
+    when an O(n) check finds it already holds. When df's recorded order
+    still holds for a prefix of keys, only rows within each prefix group
+    are reordered.
+    """
+    keys = tuple(keys)
+    cols = [*keys, *(c for c in df.columns if c not in keys)]
+    known = _recorded(df)
+
+    shared = 0
+    while shared < min(len(known), len(keys)) and known[shared] == keys[shared]:
+        shared += 1
+    head = _key_components(df, keys[:shared])
+    rest = _key_components(df, keys[shared:])
+    if head and not _is_sorted(head):
+        head, rest = [], head + rest
+    comps = [_group_ids(head), *rest] if head else rest
+    order = None if _is_sorted(comps) else _stable_order(comps)
+
+    out = df if order is None else df.take(order)
+    if list(out.columns) != cols:
+        out = out.loc[:, cols]
+    if order is not None or not out.index.equals(pd.RangeIndex(len(out))):
+        out = out.reset_index(drop=True)
+    elif out is df:
+        out = df.copy(deep=False)
+    return mark_sorted(out, keys)
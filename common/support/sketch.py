@@ -0,0 +1,183 @@
+import math
+import struct
+import zlib
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Self
+
+import numpy as np
+
+_MAGIC = b"DDS1"
+_HEADER = struct.Struct("<4sddQII")
+
+
+@dataclass(slots=True)
+class DDSketch:
+    """
+    Mergeable quantile sketch with a relative-error guarantee (DDSketch,
+    Masson et al., VLDB 2019), in memory that grows with the log of the
+    value range rather than with the number of values.
+    Values are counted in logarithmic buckets ((gamma**(i-1), gamma**i] with
+    gamma = (1 + a) / (1 - a), a = relative_accuracy); a bucket stands for
+    the value 2 * gamma**i / (gamma + 1), within a of everything it holds.
+    quantile() interpolates between the two order statistics around rank
+    q * (n - 1), as np.percentile's linear method does, so for values of one
+    sign the result is within relative_accuracy of the exact percentile.
+    Values with |x| < min_value count as 0 (absolute error below min_value).
+    About 1000 buckets cover 1e-6..1e9 at the default 1%.
+    """
+
+    relative_accuracy: float = 0.01
+    min_value: float = 1e-9
+    count: int = 0
+    zero_count: int = 0
+    bins: dict[int, int] = field(default_factory=dict)
+    neg_bins: dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not 0.0 < self.relative_accuracy < 1.0:
+            raise ValueError(
+                f"relative_accuracy must be in (0, 1), got {self.relative_accuracy}"
+            )
+
+    @property
+    def gamma(self) -> float:
+        a = self.relative_accuracy
+        return (1.0 + a) / (1.0 - a)
+
+    def bucket_keys(self, values: np.ndarray) -> np.ndarray:
+        """
+        Bucket index of each |value| (values must be >= min_value in magnitude).
+        """
+        return np.ceil(np.log(np.abs(values)) / math.log(self.gamma)).astype(np.int64)
+
+    def add_counts(
+        self, keys: np.ndarray, counts: np.ndarray, *, negative: bool = False
+    ) -> None:
+        """
+        Add counts[i] values to bucket keys[i] (see bucket_keys).
+        """
+        store = self.neg_bins if negative else self.bins
+        for k, c in zip(keys.tolist(), counts.tolist()):
+            store[k] = store.get(k, 0) + c
+        self.count += int(np.sum(counts))
+
+    def add_zeros(self, n: int) -> None:
+        self.zero_count += n
+        self.count += n
+
+    def add_many(self, values: np.ndarray) -> None:
+        """
+        Add every non-NaN value.
+        """
+        x = np.asarray(values, dtype=np.float64)
+        x = x[~np.isnan(x)]
+        small = np.abs(x) < self.min_value
+        self.add_zeros(int(small.sum()))
+        for negative, part in (
+            (False, x[~small & (x > 0)]),
+            (True, x[~small & (x < 0)]),
+        ):
+            if len(part):
+                keys, counts = np.unique(self.bucket_keys(part), return_counts=True)
+                self.add_counts(keys, counts, negative=negative)
+
+    def merge(self, other: Self) -> None:
+        """
+        Add all of other's values; both sketches must share their parameters.
+        """
+        if (other.relative_accuracy, other.min_value) != (
+            self.relative_accuracy,
+            self.min_value,
+        ):
+            raise ValueError("cannot merge sketches with different accuracy")
+        for store, theirs in ((self.bins, other.bins), (self.neg_bins, other.neg_bins)):
+            for k, c in theirs.items():
+                store[k] = store.get(k, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def _sorted_buckets(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Representative values of the non-empty buckets in ascending order, and
+        the cumulative counts up to each.
+        """
+        g = self.gamma
+        neg = sorted(self.neg_bins.items(), reverse=True)
+        pos = sorted(self.bins.items())
+        values = [-2.0 * g**k / (g + 1.0) for k, _ in neg]
+        counts = [c for _, c in neg]
+        if self.zero_count:
+            values.append(0.0)
+            counts.append(self.zero_count)
+        values += [2.0 * g**k / (g + 1.0) for k, _ in pos]
+        counts += [c for _, c in pos]
+        return np.asarray(values, dtype=np.float64), np.cumsum(counts)
+
+    def quantiles(self, ps: Sequence[float]) -> list[float]:
+        """
+        Approximate np.percentile(values, p) for each p in ps (NaN when empty).
+        """
+        if not self.count:
+            return [math.nan] * len(ps)
+
+        values, cum = self._sorted_buckets()
+        n = self.count
+        out: list[float] = []
+        for p in ps:
+            virtual = (n - 1) * (p / 100)
+            lo = math.floor(virtual)
+            gamma = virtual - lo
+            a = float(values[np.searchsorted(cum, lo, side="right")])
+            b = float(values[np.searchsorted(cum, min(lo + 1, n - 1), side="right")])
+            diff = b - a
+            out.append(b - diff * (1 - gamma) if gamma >= 0.5 else a + diff * gamma)
+        return out
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact serialized form (see from_bytes).
+        """
+        pos = np.array(sorted(self.bins.items()), dtype=np.int64).reshape(-1, 2)
+        neg = np.array(sorted(self.neg_bins.items()), dtype=np.int64).reshape(-1, 2)
+        header = _HEADER.pack(
+            _MAGIC,
+            self.relative_accuracy,
+            self.min_value,
+            self.zero_count,
+            len(pos),
+            len(neg),
+        )
+        body = b"".join(
+            part.astype("<i8").tobytes()
+            for bins in (pos, neg)
+            # keys as deltas: small numbers that compress well
+            for part in (np.diff(bins[:, 0], prepend=0), bins[:, 1])
+        )
+        return zlib.compress(header + body)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Self:
+        raw = zlib.decompress(data)
+        magic, accuracy, min_value, zeros, n_pos, n_neg = _HEADER.unpack_from(raw)
+        if magic != _MAGIC:
+            raise ValueError("not a serialized DDSketch")
+
+        arr = np.frombuffer(raw, dtype="<i8", offset=_HEADER.size)
+        stores: list[dict[int, int]] = []
+        at = 0
+        for n in (n_pos, n_neg):
+            keys = np.cumsum(arr[at : at + n])
+            counts = arr[at + n : at + 2 * n]
+            stores.append(dict(zip(keys.tolist(), counts.tolist())))
+            at += 2 * n
+
+        bins, neg_bins = stores
+        return cls(
+            relative_accuracy=accuracy,
+            min_value=min_value,
+            count=zeros + sum(bins.values()) + sum(neg_bins.values()),
+            zero_count=zeros,
+            bins=bins,
+            neg_bins=neg_bins,
+        )
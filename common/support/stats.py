@@ -1,5 +1,8 @@
+from collections.abc import Sequence
+
 import numpy as np
 import pandas as pd
+from numpy.typing import ArrayLike
 
 
 def pct(s: pd.Series, p: float) -> float:
@@ -8,3 +11,59 @@ def pct(s: pd.Series, p: float) -> float:
     """
     x = s.dropna().to_numpy()
     return float(np.nanpercentile(x, p)) if len(x) else float("nan")
+
+
+def group_percentiles(
+    values: np.ndarray, groups: np.ndarray, ngroups: int, ps: Sequence[float]
+) -> list[np.ndarray]:
+    """
+    pct(values[groups == g], p) for every group g in range(ngroups), one
+    array per p in ps, from a single sort of the values within groups.
+    NaN values and rows with a negative (or NaN) group are ignored; groups
+    left empty get NaN. The interpolation is np.nanpercentile's default
+    ("linear") step for step, so results match pct bit for bit.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    groups = np.asarray(groups)
+    keep = ~np.isnan(values) & (groups >= 0)
+    g = groups[keep].astype(np.intp)
+    v = values[keep]
+    v = v[np.lexsort((v, g))]
+
+    counts = np.bincount(g, minlength=ngroups)
+    has = counts > 0
+    n = counts[has]
+    start = (np.cumsum(counts) - counts)[has]
+
+    out: list[np.ndarray] = []
+    for p in ps:
+        virtual = (n - 1) * np.true_divide(p, 100)
+        below = np.floor(virtual)
+        gamma = virtual - below
+        lo = below.astype(np.intp)
+        a = v[start + lo]
+        b = v[start + np.minimum(lo + 1, n - 1)]
+
+        diff = b - a
+        res = a + diff * gamma
+        upper = gamma >= 0.5
+        res[upper] = (b - diff * (1 - gamma))[upper]
+
+        col = np.full(ngroups, np.nan)
+        col[has] = res
+        out.append(col)
+    return out
+
+
+def span_ms(later: ArrayLike, earlier: ArrayLike) -> np.ndarray:
+    """
+    Milliseconds from earlier to later (datetime64[ns] values), NaN where
+    either is NaT. The difference is taken on the int64 epoch-ns, as the
+    streaming path does, instead of going through Timedelta objects.
+    """
+    a = np.asarray(later, dtype="datetime64[ns]").view(np.int64)
+    b = np.asarray(earlier, dtype="datetime64[ns]").view(np.int64)
+    nat = np.iinfo(np.int64).min
+    out = (a - b) / 1e6
+    out[(a == nat) | (b == nat)] = np.nan
+    return out
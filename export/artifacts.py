@@ -1,16 +1,20 @@
+from functools import partial
 from pathlib import Path
 
 from common.support.reporting import NullReporter, Reporter
 from common.model.results import PipelineOutput
+from common.model.types import TableFormat
 from export.paths import OutputPaths, build_output_paths
 from export.plot import plot_step_means
-from export.writers import write_csv, write_lines
+from export.writers import write_lines, write_table
+from parsers.gpe import with_gpe_text
 
 
 def save_all_artifacts(
     results: PipelineOutput,
     out_dir: Path,
     *,
+    fmt: TableFormat = "csv",
     reporter: Reporter | None = None,
 ) -> Path | None:
     """
@@ -24,30 +28,41 @@ def save_all_artifacts(
 
     rep.info(f"Writing outputs to: {paths.out_dir}")
 
-    _write_tables(results, paths)
+    _write_tables(results, paths, fmt=fmt)
     _write_traceability(results, paths)
     plot_path = _write_plot(results, paths)
 
     return plot_path
 
 
-def _write_tables(results: PipelineOutput, paths: OutputPaths) -> None:
+# Event-level tables that grow with the logs are split by these columns
+# when written in a columnar format.
+_PARTITION_COLS: tuple[str, ...] = ("run", "query_name")
+
+
+def _write_tables(
+    results: PipelineOutput, paths: OutputPaths, *, fmt: TableFormat
+) -> None:
     ex = results.extracts
     ev = results.events
     cmp = results.comparison
 
-    write_csv(ex.rest_requests, paths.restpp_requests_csv)
-    write_csv(ev.linked_events, paths.gpe_events_attached_csv)
-    write_csv(ev.step_timings, paths.gaps_with_query_csv)
+    big = partial(write_table, fmt=fmt, partition_cols=_PARTITION_COLS)
+    big(ex.rest_requests, paths.restpp_requests_csv)
+    # GPE rows carry file references in memory; their text is read back here.
+    if ev.linked_events is not None:
+        big(with_gpe_text(ev.linked_events), paths.gpe_events_attached_csv)
+    big(with_gpe_text(ev.step_timings), paths.gaps_with_query_csv)
 
-    write_csv(cmp.request_summary, paths.request_summary_csv)
-    write_csv(cmp.execution_table, paths.exec_request_table_csv)
-    write_csv(cmp.step_statistics, paths.step_stats_csv)
-    write_csv(cmp.query_vs_query_stats, paths.compare_two_queries_csv)
-    write_csv(cmp.step_side_by_side, paths.side_ordered_steps_csv)
+    small = partial(write_table, fmt=fmt)
+    small(cmp.request_summary, paths.request_summary_csv)
+    small(cmp.execution_table, paths.exec_request_table_csv)
+    small(cmp.step_statistics, paths.step_stats_csv)
+    small(cmp.query_vs_query_stats, paths.compare_two_queries_csv)
+    small(cmp.step_side_by_side, paths.side_ordered_steps_csv)
 
-    write_csv(cmp.bottlenecks_base, paths.bottlenecks_base_csv)
-    write_csv(cmp.bottlenecks_opt, paths.bottlenecks_opt_csv)
+    small(cmp.bottlenecks_base, paths.bottlenecks_base_csv)
+    small(cmp.bottlenecks_opt, paths.bottlenecks_opt_csv)
 
 
 def _write_traceability(results: PipelineOutput, paths: OutputPaths) -> None:
@@ -55,6 +70,20 @@ def _write_traceability(results: PipelineOutput, paths: OutputPaths) -> None:
     write_lines(cmp.base_request_ids, paths.base_request_ids_txt)
     write_lines(cmp.opt_request_ids, paths.opt_request_ids_txt)
 
+    # Sampled outputs are labeled; a stale label from an earlier run is removed.
+    if results.sample_rate is None:
+        paths.sample_txt.unlink(missing_ok=True)
+    else:
+        write_lines(
+            [
+                f"sample_rate={results.sample_rate:g}",
+                f"requests={len(results.extracts.rest_requests)}",
+                "Only requests whose id hashes below sample_rate were read;",
+                "counts and sums cover the sample, not the whole run.",
+            ],
+            paths.sample_txt,
+        )
+
 
 def _write_plot(results: PipelineOutput, paths: OutputPaths) -> Path | None:
     side = results.comparison.step_side_by_side
@@ -23,6 +23,7 @@ class OutputPaths:
     # traceability
     base_request_ids_txt: Path
     opt_request_ids_txt: Path
+    sample_txt: Path
 
     # plot
     step_means_png: Path
@@ -44,5 +45,6 @@ def build_output_paths(out_dir: Path) -> OutputPaths:
         bottlenecks_opt_csv=od / "bottlenecks_opt.csv",
         base_request_ids_txt=od / "base_request_ids.txt",
         opt_request_ids_txt=od / "opt_request_ids.txt",
+        sample_txt=od / "SAMPLED.txt",
         step_means_png=od / "step_means_base_vs_opt.png",
     )
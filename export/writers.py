@@ -1,8 +1,12 @@
+import shutil
+from importlib.util import find_spec
 from pathlib import Path
 from typing import Iterable
 
 import pandas as pd
 
+from common.model.types import TableFormat
+
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
@@ -13,6 +17,82 @@ def write_csv(df: pd.DataFrame, path: Path, *, index: bool = False) -> None:
     df.to_csv(path, index=index)
 
 
+def require_table_format(fmt: TableFormat) -> None:
+    """
+    Raise ImportError if writing fmt needs pyarrow and it is not installed;
+    called when the format is configured so a missing extra fails early.
+    """
+    if fmt != "csv" and find_spec("pyarrow") is None:
+        raise ImportError(
+            f"--format {fmt} requires pyarrow (pip install 'LogAnalyzer[columnar]')"
+        )
+
+
+def _write_partitioned(
+    df: pd.DataFrame, out_dir: Path, *, fmt: TableFormat, partition_cols: list[str]
+) -> None:
+    import pyarrow as pa  # pyright: ignore[reportMissingTypeStubs]
+    import pyarrow.dataset as ds  # pyright: ignore[reportMissingTypeStubs]
+
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    partitioning = ds.partitioning(table.select(partition_cols).schema, flavor="hive")
+    file_options = (
+        ds.ParquetFileFormat().make_write_options(compression="zstd")
+        if fmt == "parquet"
+        else ds.IpcFileFormat().make_write_options(compression="zstd")
+    )
+    ds.write_dataset(
+        table,
+        out_dir,
+        format="parquet" if fmt == "parquet" else "ipc",
+        partitioning=partitioning,
+        file_options=file_options,
+        basename_template=f"part-{{i}}.{fmt}",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: Path,
+    *,
+    fmt: TableFormat = "csv",
+    partition_cols: Iterable[str] = (),
+) -> Path:
+    """
+    Write one artifact table as csv, parquet or feather (zstd-compressed,
+    dtypes preserved); path's suffix is replaced to match the format.
+    For columnar formats, partition_cols present in df turn the table into a
+    hive-partitioned directory (e.g. gaps_with_query/run=A/query_name=q/)
+    so readers can load single partitions.
+    Returns the file or directory written.
+    """
+    if fmt == "csv":
+        out = path.with_suffix(".csv")
+        write_csv(df, out)
+        return out
+
+    require_table_format(fmt)
+    ensure_dir(path.parent)
+
+    parts = [c for c in partition_cols if c in df.columns]
+    if parts and not df.empty:
+        out = path.with_suffix("")
+        _write_partitioned(df, out, fmt=fmt, partition_cols=parts)
+        return out
+
+    out = path.with_suffix(f".{fmt}")
+    match fmt:
+        case "parquet":
+            df.to_parquet(out, index=False, compression="zstd")
+        case "feather":
+            df.reset_index(drop=True).to_feather(out, compression="zstd")
+    return out
+
+
 def write_lines(lines: Iterable[str], path: Path) -> None:
     ensure_dir(path.parent)
     text = "\n".join(lines)
@@ -0,0 +1,127 @@
+import time
+from dataclasses import dataclass, field
+
+from analysis.step_stats import RollingStepStats
+from common.model.config import FollowConfig
+from common.model.constants import (
+    GPE_GLOB,
+    GPE_MARKER_TOKENS,
+    GPE_STEP,
+    GPE_UDF_START,
+    GPE_UDF_STOP,
+    RESTPP_GLOB,
+    RESTPP_MARKER_TOKENS,
+)
+from common.support.reporting import NullReporter, Reporter
+from parsers import LineHandler, LogTailer, ParsedLine
+from parsers.gpe.decode import decode_msg
+from parsers.gpe.records import GpeStepRecord, GpeUdfStartRecord, GpeUdfStopRecord
+from parsers.restpp.decode import classify_msg
+from parsers.restpp.records import RestppRawRecord
+from transforms.stream import RepeatFilter, StreamLinker
+
+
+@dataclass(slots=True)
+class _Follower:
+    """
+    Feeds tailed RESTPP/GPE lines through the batch decoders into the
+    streaming linker and the rolling step statistics. GPE lines seen before
+    (files overlapping after rotation) are dropped first; RESTPP lines only
+    name requests, so repeats of them are harmless.
+    """
+
+    stats: RollingStepStats
+    linker: StreamLinker = field(default_factory=StreamLinker)
+    repeats: RepeatFilter = field(default_factory=RepeatFilter)
+    n_gaps: int = 0
+
+    def on_restpp(self, pl: ParsedLine) -> None:
+        match classify_msg(pl.msg):
+            case RestppRawRecord(parsed=raw) if raw.query_name:
+                self.stats.name_request(pl.run, raw.request_id, raw.query_name)
+            case _:
+                pass
+
+    def on_gpe(self, pl: ParsedLine) -> None:
+        if not self.repeats.is_new(
+            run=pl.run, node=pl.node, tid=pl.tid, ts_ns=pl.ts_ns, msg=pl.msg
+        ):
+            return
+
+        dec = decode_msg(pl.msg)
+        if dec is None:
+            return
+
+        match dec.record:
+            case GpeStepRecord(parsed=step):
+                event, label, iteration = GPE_STEP, step.label, step.iteration
+            case GpeUdfStartRecord():
+                event, label, iteration = GPE_UDF_START, GPE_UDF_START, None
+            case GpeUdfStopRecord():
+                event, label, iteration = GPE_UDF_STOP, GPE_UDF_STOP, None
+
+        gap = self.linker.push(
+            run=pl.run,
+            node=pl.node,
+            tid=pl.tid,
+            ts_ns=pl.ts_ns,
+            request_id=dec.request_id,
+            event=event,
+            label=label,
+            iteration=iteration,
+        )
+        if gap is not None:
+            self.stats.add(gap)
+            self.n_gaps += 1
+
+
+def _report(follower: _Follower, cfg: FollowConfig, reporter: Reporter) -> None:
+    table = follower.stats.snapshot()
+    stamp = time.strftime("%H:%M:%S")
+    reporter.info(f"--- {stamp} gaps seen: {follower.n_gaps} ---")
+    if table.empty:
+        reporter.info("(no named step gaps yet)")
+        return
+    reporter.info(table.head(cfg.top).to_string(index=False))
+
+
+def run_follow(cfg: FollowConfig, *, reporter: Reporter | None = None) -> None:
+    """
+    Tail restpp*/gpe* logs of every run and report rolling per-step statistics
+    every cfg.interval_s seconds, until cfg.duration_s elapses (or forever).
+    """
+    rep = reporter or NullReporter()
+    follower = _Follower(stats=RollingStepStats(window=cfg.window))
+
+    tailers: list[tuple[LogTailer, LineHandler]] = []
+    for run in cfg.runs:
+        # RESTPP first: request names usually precede their GPE lines.
+        for file_glob, markers, handler in (
+            (RESTPP_GLOB, RESTPP_MARKER_TOKENS, follower.on_restpp),
+            (GPE_GLOB, GPE_MARKER_TOKENS, follower.on_gpe),
+        ):
+            tailer = LogTailer(
+                run_id=run.id,
+                run_dir=run.path,
+                nodes=cfg.nodes,
+                file_glob=file_glob,
+                markers=markers,
+                from_end=cfg.from_end,
+            )
+            tailers.append((tailer, handler))
+
+    started = time.monotonic()
+    next_report = started + cfg.interval_s
+    while True:
+        for tailer, handler in tailers:
+            tailer.poll(handler)
+
+        now = time.monotonic()
+        done = cfg.duration_s is not None and now - started >= cfg.duration_s
+        if now >= next_report or done:
+            _report(follower, cfg, rep)
+            next_report = now + cfg.interval_s
+        if done:
+            return
+
+        time.sleep(cfg.poll_s)
@@ -1,17 +1,28 @@
 import sys
 from pathlib import Path
 
-from cli import parse_cli_args
+from cli import parse_cli_args, parse_follow_args
 from common.support.env import load_env_config
 from common.support.reporting import PrintReporter, Reporter
 from export.artifacts import save_all_artifacts
 from export.open_file import open_file
+from export.writers import require_table_format
+from follow import run_follow
 from pipeline import run_performance_analysis
 
 
 def main() -> int:
     reporter: Reporter = PrintReporter()
 
+    if len(sys.argv) > 1 and sys.argv[1] == "follow":
+        follow_cfg = parse_follow_args(sys.argv[2:])
+        reporter.info("--- Following logs (Ctrl-C to stop) ---")
+        try:
+            run_follow(follow_cfg, reporter=reporter)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
     if len(sys.argv) > 1:
         reporter.info("CLI arguments detected. Using cli.py parser...")
         app_config = parse_cli_args()
@@ -20,6 +31,7 @@ def main() -> int:
         repo_root = Path(__file__).resolve().parent
         env_file = repo_root / ".env"
         app_config = load_env_config(env_path=env_file)
+        require_table_format(app_config.cfg.table_format)
 
     cfg = app_config.cfg
     open_plot = app_config.open_plot
@@ -28,7 +40,9 @@ def main() -> int:
     results = run_performance_analysis(cfg, reporter=reporter)
 
     reporter.info("--- Saving Artifacts ---")
-    plot_path = save_all_artifacts(results, cfg.out_dir, reporter=reporter)
+    plot_path = save_all_artifacts(
+        results, cfg.out_dir, fmt=cfg.table_format, reporter=reporter
+    )
 
     reporter.info(f"Done. Output directory: {cfg.out_dir}")
 
@@ -0,0 +1,15 @@
+from ._cache import ParseCache
+from ._filter import RequestFilter
+from ._tail import LogTailer
+from ._walker import IngestOptions, LineHandler, ParsedLine
+from ._window import TimeWindow
+
+__all__ = [
+    "IngestOptions",
+    "LineHandler",
+    "LogTailer",
+    "ParseCache",
+    "ParsedLine",
+    "RequestFilter",
+    "TimeWindow",
+]
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from common.parse.time import YearCache, _FileSig
+from common.support.cache_dir import default_cache_dir
+
+from ._linescan import ByteSource
+
+# Bump whenever collector contents or parsing semantics change, so stale
+# entries written by an older parser are never reused.
+PARSER_CACHE_VERSION: int = 5
+
+DEFAULT_CACHE_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
+# Leading bytes hashed to tell an appended-to file from a replaced one.
+HEAD_HASH_BYTES: int = 64 * 1024
+
+_SUFFIX = ".pkl"
+_YEARS_FILE = "file_years.json"
+
+
+def head_hash(buf: ByteSource, offset: int) -> str:
+    """
+    Hash of the first min(offset, HEAD_HASH_BYTES) bytes of a file.
+    """
+    return hashlib.blake2b(
+        buf[: min(offset, HEAD_HASH_BYTES)], digest_size=16
+    ).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class ParseCacheKey:
+    """
+    Identity of one log file as seen by one parser (tag + version) for one
+    run/node. File contents are tracked by the FileState stored under it.
+    """
+
+    tag: str
+    run_id: str
+    node: str
+    path: str
+    version: int = PARSER_CACHE_VERSION
+
+    def digest(self) -> str:
+        raw = "|".join((str(self.version), self.tag, self.run_id, self.node, self.path))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class FileState[C]:
+    """
+    Parsed prefix of one log file: `collector` holds every complete line in
+    [0, offset), which spans n_lines lines.
+    The state can be extended in place when the file has only grown: same
+    inode, same year, and the same head_hash over its leading bytes.
+    """
+
+    sig: _FileSig
+    inode: int
+    head_hash: str
+    year: int
+    offset: int
+    n_lines: int
+    collector: C
+
+
+@dataclass(frozen=True, slots=True)
+class ParseCache:
+    """
+    On-disk cache of per-file parse states, one pickle per file, bounded by
+    max_bytes with least-recently-used eviction (file mtime marks last use).
+    A corrupt or unreadable entry is treated as a miss.
+    """
+
+    root: Path
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+
+    @classmethod
+    def default(cls, *, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> Self:
+        return cls(root=default_cache_dir() / "parsed", max_bytes=max_bytes)
+
+    def year_cache(self) -> YearCache:
+        """
+        The file years resolved by earlier runs, kept next to the entries.
+        """
+        return YearCache.load(self.root / _YEARS_FILE)
+
+    def _path(self, key: ParseCacheKey) -> Path:
+        return self.root / f"{key.digest()}{_SUFFIX}"
+
+    def load(self, key: ParseCacheKey) -> object | None:
+        path = self._path(key)
+        try:
+            with path.open("rb") as f:
+                obj = pickle.load(f)
+            os.utime(path)
+        # unreadable, truncated, or pickled by code that has since changed
+        except (
+            OSError,
+            EOFError,
+            pickle.UnpicklingError,
+            AttributeError,
+            ImportError,
+            ValueError,
+        ):
+            return None
+        return obj
+
+    def store(self, key: ParseCacheKey, value: object) -> None:
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with tmp.open("wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def prune(self) -> None:
+        """
+        Evict least-recently-used entries until the cache fits in max_bytes.
+        """
+        try:
+            entries = [
+                (st.st_mtime_ns, st.st_size, p)
+                for p in self.root.glob(f"*{_SUFFIX}")
+                for st in (p.stat(),)
+            ]
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,131 @@
+from collections.abc import Collection, Sequence
+from dataclasses import dataclass
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+from common.model.config import check_sample_rate
+from common.model.constants import GPE_UDF_START, GPE_UDF_STOP
+from common.model.types import QueryName, RequestId, RunId
+from common.support.hashing import hash_fraction, stable_hash64
+
+_BOUNDARY_EVENTS = frozenset((GPE_UDF_START, GPE_UDF_STOP))
+
+
+@dataclass(frozen=True, slots=True)
+class RequestFilter:
+    """
+    Which requests' rows are wanted: those among `requests` (the requests of
+    the compared queries, see for_queries; None for all) whose request id
+    falls in the sample_rate fraction of the stable hash space (None for all).
+    The sample check needs only the id, so RESTPP and GPE rows of a request
+    are kept or dropped together.
+    GPE rows naming another request are dropped as lines are collected (see
+    keeps), except its UDF_START/UDF_STOP: they delimit the per-thread
+    segments that attach_steps_to_requests fills missing request ids from,
+    so every kept row is attached exactly as without the filter. Rows without a request
+    id are kept for the same reason; mask() drops what is left over once
+    ids are filled in.
+    """
+
+    requests: frozenset[tuple[RunId, RequestId]] | None = None
+    sample_rate: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.sample_rate is not None:
+            check_sample_rate(self.sample_rate)
+
+    @classmethod
+    def for_queries(
+        cls, rest_requests: pd.DataFrame, queries: Collection[QueryName]
+    ) -> Self:
+        """
+        The requests RESTPP logged for any of queries.
+        """
+        if rest_requests.empty:
+            return cls(frozenset())
+        hit = rest_requests.loc[
+            rest_requests["query_name"].isin(list(queries)), ["run", "request_id"]
+        ]
+        return cls(
+            frozenset(zip(hit["run"].astype(str).tolist(), hit["request_id"].tolist()))
+        )
+
+    def wants(self, run: RunId, request_id: RequestId) -> bool:
+        """
+        Whether the (stripped) request_id of run is wanted.
+        """
+        if self.requests is not None and (run, request_id) not in self.requests:
+            return False
+        return self.sample_rate is None or hash_fraction(request_id) < self.sample_rate
+
+    def keeps(
+        self,
+        run: RunId,
+        request_id: RequestId | None,
+        *,
+        boundary: bool,
+        memo: dict[tuple[RunId, RequestId], bool],
+    ) -> bool:
+        """
+        Whether a row is collected: rows without a request id, boundary rows
+        (GPE UDF_START/UDF_STOP) and rows of wanted requests. memo caches
+        the per-request decisions across calls.
+        """
+        rid = request_id.strip() if request_id else ""
+        if not rid or boundary:
+            return True
+        wanted = memo.get((run, rid))
+        if wanted is None:
+            wanted = memo[(run, rid)] = self.wants(run, rid)
+        return wanted
+
+    def rows(
+        self,
+        runs: Sequence[RunId],
+        request_ids: Sequence[RequestId | None],
+        events: Sequence[str | None] | None = None,
+    ) -> list[int] | None:
+        """
+        Indices of the rows to collect, or None when all of them are; events
+        (GPE event names) mark the boundary rows kept for every request.
+        """
+        memo: dict[tuple[RunId, RequestId], bool] = {}
+        kinds = events if events is not None else [None] * len(runs)
+        keep = [
+            i
+            for i, (run, rid, event) in enumerate(zip(runs, request_ids, kinds))
+            if self.keeps(run, rid, boundary=event in _BOUNDARY_EVENTS, memo=memo)
+        ]
+        return None if len(keep) == len(runs) else keep
+
+    def cache_key(self) -> str:
+        """
+        Stable digest of the filter, to tag parse cache entries of collectors
+        that applied it.
+        """
+        requests = (
+            "*"
+            if self.requests is None
+            else "\n".join(sorted(f"{run}\t{rid}" for run, rid in self.requests))
+        )
+        return (
+            f"{stable_hash64(requests) & 0xFFFF_FFFF_FFFF_FFFF:016x}:{self.sample_rate}"
+        )
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Rows of df (with run and request_id columns) that belong to a wanted request.
+        """
+        if df.empty:
+            return np.zeros(0, dtype=bool)
+        pairs = zip(df["run"].astype(str).tolist(), df["request_id"].tolist())
+        return np.fromiter(
+            (
+                isinstance(rid, str) and self.wants(run, rid.strip())
+                for run, rid in pairs
+            ),
+            dtype=bool,
+            count=len(df),
+        )
@@ -0,0 +1,112 @@
+import mmap
+import os
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+# Newline counting copies the scanned span; cap each copy at this many bytes.
+_COUNT_CHUNK: int = 16 * 1024 * 1024
+
+
+type ByteSource = mmap.mmap | bytes
+
+
+@contextmanager
+def map_file(
+    log_path: Path,
+) -> Generator[tuple[ByteSource, os.stat_result]]:
+    """
+    Read-only memory map of log_path plus its fstat result; empty files map to b"".
+    """
+    with log_path.open("rb") as f:
+        st = os.fstat(f.fileno())
+        if st.st_size == 0:
+            yield b"", st
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                buf.madvise(mmap.MADV_SEQUENTIAL)
+            yield buf, st
+
+
+def count_newlines(buf: ByteSource, start: int, end: int) -> int:
+    """
+    Count b"\\n" in buf[start:end] without copying more than one chunk at a time.
+    """
+    n = 0
+    pos = start
+    while pos < end:
+        stop = min(pos + _COUNT_CHUNK, end)
+        n += buf[pos:stop].count(b"\n")
+        pos = stop
+    return n
+
+
+@dataclass(slots=True)
+class LineScan:
+    """
+    Iterate (lineno, line_start, line_end) for the lines of buf[start:end].
+    With markers, only lines containing at least one marker are yielded; they
+    are located with bytes.find and everything in between is skipped without
+    decoding. line_end includes the trailing newline. Line numbers start at 1
+    at `start`; after iteration, n_lines holds the number of lines in the span.
+    """
+
+    buf: ByteSource
+    start: int
+    end: int
+    markers: tuple[bytes, ...] | None = None
+    n_lines: int = 0
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        if self.markers is None:
+            yield from self._all_lines()
+        else:
+            yield from self._marked_lines(self.markers)
+
+    def _line_end(self, pos: int) -> int:
+        nl = self.buf.find(b"\n", pos, self.end)
+        return self.end if nl < 0 else nl + 1
+
+    def _all_lines(self) -> Iterator[tuple[int, int, int]]:
+        lineno = 0
+        pos = self.start
+        while pos < self.end:
+            line_end = self._line_end(pos)
+            lineno += 1
+            yield lineno, pos, line_end
+            pos = line_end
+        self.n_lines = lineno
+
+    def _marked_lines(
+        self, markers: tuple[bytes, ...]
+    ) -> Iterator[tuple[int, int, int]]:
+        buf, end = self.buf, self.end
+        next_hit = [buf.find(m, self.start, end) for m in markers]
+
+        # lineno is the number of the line that starts at pos
+        lineno = 1
+        pos = self.start
+        while True:
+            hits = [h for h in next_hit if h >= 0]
+            if not hits:
+                break
+
+            hit = min(hits)
+            line_start = max(buf.rfind(b"\n", pos, hit) + 1, pos)
+            lineno += count_newlines(buf, pos, line_start)
+            line_end = self._line_end(hit)
+
+            yield lineno, line_start, line_end
+
+            lineno += 1
+            pos = line_end
+            for i, h in enumerate(next_hit):
+                if 0 <= h < pos:
+                    next_hit[i] = buf.find(markers[i], pos, end)
+
+        tail = count_newlines(buf, pos, end)
+        unterminated = pos < end and buf[end - 1 : end] != b"\n"
+        self.n_lines = lineno - 1 + tail + int(unterminated)
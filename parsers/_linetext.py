@@ -0,0 +1,29 @@
+from collections.abc import Sequence
+from pathlib import Path
+
+from ._linescan import map_file
+from ._walker import _decode_line
+
+
+def line_bodies(log_path: Path, offsets: Sequence[int]) -> list[str | None]:
+    """
+    Text of the lines starting at the given byte offsets of log_path, decoded
+    as the walker decodes them and without the trailing newline.
+    A parsed message (ParsedLine.msg) is always a suffix of its line body, so
+    it can be recovered from (offset, len(msg)) instead of being kept in memory.
+    Offsets past the end of the file, or an unreadable file, give None.
+    """
+    try:
+        with map_file(log_path) as (buf, _):
+            size = len(buf)
+            out: list[str | None] = []
+            for start in offsets:
+                if not 0 <= start < size:
+                    out.append(None)
+                    continue
+                nl = buf.find(b"\n", start)
+                line = _decode_line(buf[start : size if nl < 0 else nl + 1])
+                out.append(line.removesuffix("\n"))
+            return out
+    except OSError:
+        return [None] * len(offsets)
@@ -0,0 +1,127 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from common.model.types import Node
+
+from ._cache import HEAD_HASH_BYTES, head_hash
+from ._linescan import ByteSource, map_file
+
+# Prefix verification compares this many bytes at a time.
+_COMPARE_CHUNK: int = 16 * 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class FileOverlap:
+    """
+    A file whose leading `skipped` bytes repeat `same_as` byte for byte.
+    identical: the whole file is a copy (nothing left to parse).
+    """
+
+    node: Node
+    log_path: Path
+    same_as: Path
+    skipped: int
+    size: int
+
+    @property
+    def identical(self) -> bool:
+        return self.skipped == self.size
+
+    def describe(self) -> str:
+        if self.identical:
+            return f"{self.node}/{self.log_path.name}: identical to {self.same_as.name}"
+        return (
+            f"{self.node}/{self.log_path.name}: first {self.skipped} of "
+            f"{self.size} bytes repeat {self.same_as.name}, parsing the tail only"
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _Fingerprint:
+    log_path: Path
+    size: int
+    year: int
+    head: str  # head_hash over min(size, HEAD_HASH_BYTES) bytes
+
+
+def _same_bytes(a: ByteSource, b: ByteSource, n: int) -> bool:
+    for pos in range(0, n, _COMPARE_CHUNK):
+        end = min(pos + _COMPARE_CHUNK, n)
+        if a[pos:end] != b[pos:end]:
+            return False
+    return True
+
+
+@dataclass(slots=True)
+class OverlapIndex:
+    """
+    Per-node fingerprints (size + leading-block hash) of the files walked so
+    far, used to find a file that is identical to, or a prefix of, an
+    earlier one (or extends it), such as copies made during log rotation.
+    Only the bytes after the overlap need parsing: every line before it was
+    already seen in the earlier file, which dedupe would keep instead.
+    Candidates are confirmed by a full byte comparison, and files whose
+    years resolved differently are never matched (their timestamps differ).
+    A path seen again (re-read after it was replaced) is matched against the
+    other files only, and its fingerprint is replaced.
+    """
+
+    _seen: dict[Node, list[_Fingerprint]] = field(default_factory=dict)
+    skipped: list[FileOverlap] = field(default_factory=list)
+
+    def skip_bytes(
+        self, buf: ByteSource, *, node: Node, log_path: Path, year: int
+    ) -> int:
+        """
+        Length of the leading line-aligned span of buf that an earlier file
+        of the same node already holds (0 if none); remembers buf afterwards.
+        """
+        size = len(buf)
+        best: tuple[int, int, Path] | None = None
+        seen = [fp for fp in self._seen.get(node, ()) if fp.log_path != log_path]
+        for fp in seen:
+            shared = min(size, fp.size)
+            if fp.year != year or not shared:
+                continue
+            if best is not None and shared <= best[0]:
+                continue
+            # fp.head covers exactly `shared` bytes in these cases: a cheap reject.
+            hashed = shared >= HEAD_HASH_BYTES or shared == fp.size
+            if hashed and head_hash(buf, shared) != fp.head:
+                continue
+
+            try:
+                with map_file(fp.log_path) as (other, _):
+                    if len(other) < shared or not _same_bytes(buf, other, shared):
+                        continue
+            except OSError:
+                continue
+            best = (shared, fp.size, fp.log_path)
+
+        seen.append(
+            _Fingerprint(
+                log_path=log_path, size=size, year=year, head=head_hash(buf, size)
+            )
+        )
+        self._seen[node] = seen
+        if best is None:
+            return 0
+
+        shared, other_size, same_as = best
+        # A copy ends mid-line when taken during a write; that partial line
+        # differs from the complete one in the other file, so parsing resumes
+        # at its start unless both files end at the same byte.
+        same_end = shared == size == other_size
+        ends_clean = same_end or buf[shared - 1 : shared] == b"\n"
+        skip = shared if ends_clean else buf.rfind(b"\n", 0, shared) + 1
+        if skip:
+            self.skipped.append(
+                FileOverlap(
+                    node=node,
+                    log_path=log_path,
+                    same_as=same_as,
+                    skipped=skip,
+                    size=size,
+                )
+            )
+        return skip
@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from common.model.types import Node, RunId
+from common.parse.glog import parse_glog_line
+from common.parse.time import file_sig, resolve_file_year
+
+from ._linescan import count_newlines, map_file
+from ._overlap import OverlapIndex
+from ._walker import (
+    GlogLineParser,
+    LineHandler,
+    YearResolver,
+    head_lines,
+    iter_log_paths,
+    walk_mapped,
+)
+
+
+@dataclass(slots=True)
+class _TailState:
+    inode: int
+    year: int
+    offset: int
+    n_lines: int
+
+
+@dataclass(slots=True)
+class LogTailer:
+    """
+    `tail -F` over the files matching file_glob under each node directory.
+    Every poll() emits the complete lines appended since the previous poll.
+    Files are followed by name: a new inode or a shrunk file is re-read from
+    the start, new files are picked up, vanished files are forgotten.
+    A trailing line without its newline is left for the next poll.
+    With from_end, files present at the first poll start at their current end.
+    A followed file renamed to another matching name keeps its position
+    (matched by inode), so rename-style rotation re-reads nothing.
+    With skip_overlaps, any other new file starts after the leading bytes it
+    shares with another followed file, such as a copy made during rotation
+    (see OverlapIndex).
+    """
+
+    run_id: RunId
+    run_dir: Path
+    nodes: tuple[Node, ...]
+    file_glob: str
+    markers: tuple[str, ...] | None = None
+    from_end: bool = False
+    skip_overlaps: bool = True
+    year_resolver: YearResolver = resolve_file_year
+    glog_parser: GlogLineParser = parse_glog_line
+
+    _files: dict[Path, _TailState] = field(default_factory=dict, init=False)
+    _polled: bool = field(default=False, init=False)
+    _overlap: OverlapIndex = field(default_factory=OverlapIndex, init=False)
+
+    def poll(self, on_line: LineHandler) -> int:
+        """
+        Emit new complete lines to on_line; returns the number of bytes consumed.
+        """
+        default_year = datetime.now().year
+        seen: dict[Path, _TailState] = {}
+        consumed = 0
+        # files that may have been renamed since the last poll, by inode
+        moved = {state.inode: state for state in self._files.values()}
+
+        for node, log_path in iter_log_paths(
+            run_dir=self.run_dir, nodes=self.nodes, file_glob=self.file_glob
+        ):
+            try:
+                state, n_bytes = self._poll_file(
+                    node, log_path, on_line, moved=moved, default_year=default_year
+                )
+            except FileNotFoundError:
+                # Rotated away between listing and opening; picked up next poll.
+                continue
+            seen[log_path] = state
+            consumed += n_bytes
+
+        self._files = seen
+        self._polled = True
+        return consumed
+
+    def _poll_file(
+        self,
+        node: Node,
+        log_path: Path,
+        on_line: LineHandler,
+        *,
+        moved: dict[int, _TailState],
+        default_year: int,
+    ) -> tuple[_TailState, int]:
+        with map_file(log_path) as (buf, st):
+            complete_end = buf.rfind(b"\n") + 1
+            state = self._files.get(log_path)
+            if state is None or state.inode != st.st_ino:
+                state = moved.pop(st.st_ino, None)
+            else:
+                moved.pop(st.st_ino, None)
+            if state is None or state.offset > len(buf):
+                year = self.year_resolver(
+                    file_sig(log_path, st), head_lines(buf), default_year=default_year
+                )
+                skip = 0
+                if self.skip_overlaps:
+                    skip = self._overlap.skip_bytes(
+                        buf, node=node, log_path=log_path, year=year
+                    )
+                if self.from_end and not self._polled:
+                    skip = complete_end
+                # a trailing partial line is read once it is complete
+                skip = min(skip, complete_end)
+                state = _TailState(
+                    inode=st.st_ino,
+                    year=year,
+                    offset=skip,
+                    n_lines=count_newlines(buf, 0, skip) if skip else 0,
+                )
+
+            start = state.offset
+            if complete_end > start:
+                state.n_lines += walk_mapped(
+                    buf,
+                    run_id=self.run_id,
+                    node=node,
+                    log_path=log_path,
+                    year=state.year,
+                    on_line=on_line,
+                    glog_parser=self.glog_parser,
+                    start=start,
+                    end=complete_end,
+                    markers=self.markers,
+                    lineno_offset=state.n_lines,
+                )
+                state.offset = complete_end
+
+        return state, state.offset - start
@@ -1,42 +1,48 @@
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Callable, Protocol, TypeIs, Iterable
+from typing import Callable, Protocol, Self, Iterable
 from datetime import datetime
 
-import pandas as pd
-from pandas._libs import NaTType
-
-from common.parse.time import infer_year_from_any_line_epoch
+from common.parse.time import _FileSig, file_sig, resolve_file_year
 from common.parse.glog import parse_glog_line
 from common.model.types import RunId, Node
 from common.model.types import GlogEntry
+from common.support.reporting import Reporter
 
-type Timestampish = pd.Timestamp | NaTType
+from ._cache import FileState, ParseCache, ParseCacheKey, head_hash
+from ._linescan import ByteSource, LineScan, count_newlines, map_file
+from ._overlap import OverlapIndex
+from ._window import TimeWindow
 
 
-def is_timestamp(x: Timestampish) -> TypeIs[pd.Timestamp]:
+@dataclass(frozen=True, slots=True)
+class ParsedLine:
     """
-    Type-narrow helper for pandas typing stubs
+    One glog line; offset is the byte position of its first byte in log_path,
+    and msg is a suffix of the line (see parsers._linetext).
     """
-    return not isinstance(x, NaTType)
 
-
-@dataclass(frozen=True, slots=True)
-class ParsedLine:
     run: RunId
     node: Node
     log_path: Path
     lineno: int
-    ts: pd.Timestamp
+    ts_ns: int
     tid: int
     msg: str
+    offset: int
 
 
 LineHandler = Callable[[ParsedLine], None]
 
 
 class YearResolver(Protocol):
-    def __call__(self, log_path: Path, *, default_year: int) -> int: ...
+    def __call__(
+        self, sig: _FileSig, head: Iterable[str], *, default_year: int
+    ) -> int: ...
 
 
 class GlogLineParser(Protocol):
@@ -52,23 +58,200 @@ class LogWalker(Protocol):
         nodes: tuple[Node, ...],
         file_glob: str,
         on_line: LineHandler,
+        markers: tuple[str, ...] | None = None,
     ) -> None: ...
 
 
-def _iter_log_paths(
-    *, run_dir: Path, nodes: tuple[Node, ...], file_glob: str
+class Collector(Protocol):
+    """
+    Line sink that can be filled per file and merged back in file order.
+    """
+
+    def on_line(self, pl: ParsedLine) -> None: ...
+
+    def merge(self, other: Self, *, lineno_offset: int = 0) -> None: ...
+
+
+class CollectorSink[C](Protocol):
+    """
+    What collect_logs_into merges every file's collector into, in walk order.
+    """
+
+    def merge(self, other: C, *, lineno_offset: int = 0) -> None: ...
+
+
+# Files larger than this are split into line-aligned byte ranges in parallel mode.
+DEFAULT_RANGE_BYTES: int = 256 * 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class IngestOptions:
+    """
+    How collect_logs reads files: worker processes, intra-file range size,
+    the optional on-disk parse cache (None disables it), whether files that
+    repeat an earlier file's bytes are skipped, where skips are reported,
+    and the span of log time to read (None reads everything).
+    """
+
+    jobs: int = 1
+    range_bytes: int = DEFAULT_RANGE_BYTES
+    cache: ParseCache | None = None
+    skip_overlaps: bool = True
+    reporter: Reporter | None = None
+    window: TimeWindow | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class _RangeTask:
+    """
+    One unit of parallel work: the lines of log_path in [start, end).
+    Both offsets sit on line boundaries; end=None means end of file.
+    """
+
+    run_id: RunId
+    node: Node
+    log_path: Path
+    year: int
+    start: int = 0
+    end: int | None = None
+    markers: tuple[str, ...] | None = None
+    window: TimeWindow | None = None
+
+
+def iter_log_paths(
+    *,
+    run_dir: Path,
+    nodes: tuple[Node, ...],
+    file_glob: str,
+    window: TimeWindow | None = None,
 ) -> Iterable[tuple[Node, Path]]:
     """
-    Yield (node, log_path) pairs for files matching file_glob.
+    Yield (node, log_path) pairs for files matching file_glob, leaving out
+    files last written before window starts.
     """
     for node in nodes:
         node_dir = run_dir / node
         if not node_dir.exists():
             continue
 
-        for log_path in node_dir.glob(file_glob):
-            if log_path.is_file():
-                yield (node, log_path)
+        # Sorted so walk order (and with it first-seen order) is reproducible.
+        for log_path in sorted(node_dir.glob(file_glob)):
+            if not log_path.is_file():
+                continue
+            if window is not None and window.written_before(
+                log_path.stat().st_mtime_ns
+            ):
+                continue
+            yield (node, log_path)
+
+
+def _decode_line(raw: bytes) -> str:
+    """
+    Decode one raw log line the way text-mode reading would (\r\n -> \n).
+    """
+    line = raw.decode("utf-8", errors="replace")
+    if line.endswith("\r\n"):
+        return line[:-2] + "\n"
+    return line
+
+
+def _encode_markers(markers: tuple[str, ...]) -> tuple[bytes, ...]:
+    return tuple(m.encode("utf-8") for m in markers)
+
+
+def head_lines(buf: ByteSource) -> Iterator[str]:
+    """
+    Lazily decode lines from the start of the mapping (for year resolution).
+    """
+    pos, size = 0, len(buf)
+    while pos < size:
+        nl = buf.find(b"\n", pos)
+        end = size if nl < 0 else nl + 1
+        yield _decode_line(buf[pos:end])
+        pos = end
+
+
+def _line_aligned_ranges(
+    buf: ByteSource, range_bytes: int, *, start: int, end: int
+) -> list[tuple[int, int]]:
+    """
+    Split [start, end) into consecutive byte ranges of roughly range_bytes,
+    moving every cut forward to the next line start.
+    """
+    if start >= end:
+        return []
+    if range_bytes <= 0 or end - start <= range_bytes:
+        return [(start, end)]
+
+    cuts: list[int] = [start]
+    target = start + range_bytes
+    while target < end:
+        nl = buf.find(b"\n", target - 1, end)
+        if nl < 0 or nl + 1 >= end:
+            break
+        cuts.append(nl + 1)
+        target = nl + 1 + range_bytes
+
+    return list(zip(cuts, [*cuts[1:], end]))
+
+
+def walk_mapped(
+    buf: ByteSource,
+    *,
+    run_id: RunId,
+    node: Node,
+    log_path: Path,
+    year: int,
+    on_line: LineHandler,
+    glog_parser: GlogLineParser,
+    start: int = 0,
+    end: int | None = None,
+    markers: tuple[str, ...] | None = None,
+    lineno_offset: int = 0,
+    window: TimeWindow | None = None,
+) -> int:
+    """
+    Parse the lines in [start, end) of a mapped file; line numbers restart at
+    lineno_offset + 1 at `start`. Returns the number of lines in the span so callers can stitch
+    ranges. When markers are given, only lines containing one of them are
+    decoded and handed to the glog parser; with a window, only lines stamped
+    inside it reach on_line.
+    """
+    stop = len(buf) if end is None else min(end, len(buf))
+    if start >= stop:
+        return 0
+
+    scan = LineScan(
+        buf=buf,
+        start=start,
+        end=stop,
+        markers=None if markers is None else _encode_markers(markers),
+    )
+    for lineno, line_start, line_end in scan:
+        line = _decode_line(buf[line_start:line_end])
+        if line.startswith(">>>>>>>"):
+            continue
+
+        gl = glog_parser(line, year=year)
+        if gl is None:
+            continue
+        if window is not None and not window.contains(gl.ts_ns):
+            continue
+
+        on_line(
+            ParsedLine(
+                run=run_id,
+                node=node,
+                log_path=log_path,
+                lineno=lineno + lineno_offset,
+                ts_ns=gl.ts_ns,
+                tid=gl.tid,
+                msg=gl.msg,
+                offset=line_start,
+            )
+        )
+
+    return scan.n_lines
 
 
 def walk_logs(
@@ -78,40 +261,540 @@ def walk_logs(
     nodes: tuple[Node, ...],
     file_glob: str,
     on_line: LineHandler,
-    year_resolver: YearResolver = infer_year_from_any_line_epoch,
+    markers: tuple[str, ...] | None = None,
+    year_resolver: YearResolver = resolve_file_year,
     glog_parser: GlogLineParser = parse_glog_line,
 ) -> None:
     """
     Walk log files and emit ParsedLine items to a caller-supplied handler.
+    Each file is opened once: its year comes from the leading lines of the
+    same mapping that is then parsed.
     """
     default_year = datetime.now().year
 
-    for node, log_path in _iter_log_paths(
+    for node, log_path in iter_log_paths(
         run_dir=run_dir, nodes=nodes, file_glob=file_glob
     ):
-        file_year = year_resolver(log_path, default_year=default_year)
-
-        with log_path.open("r", errors="replace") as f:
-            for lineno, line in enumerate(f, start=1):
-                if line.startswith(">>>>>>>"):
-                    continue
-
-                gl = glog_parser(line, year=file_year)
-                if gl is None:
-                    continue
-
-                ts_cand = pd.Timestamp(gl.ts)
-                if not is_timestamp(ts_cand):
-                    continue
-
-                on_line(
-                    ParsedLine(
-                        run=run_id,
-                        node=node,
-                        log_path=log_path,
-                        lineno=lineno,
-                        ts=ts_cand,
-                        tid=gl.tid,
-                        msg=gl.msg,
-                    )
+        with map_file(log_path) as (buf, st):
+            year = year_resolver(
+                file_sig(log_path, st), head_lines(buf), default_year=default_year
+            )
+            walk_mapped(
+                buf,
+                run_id=run_id,
+                node=node,
+                log_path=log_path,
+                year=year,
+                on_line=on_line,
+                glog_parser=glog_parser,
+                markers=markers,
+            )
+
+
+def _collect_span[C: Collector](
+    buf: ByteSource,
+    *,
+    run_id: RunId,
+    node: Node,
+    log_path: Path,
+    year: int,
+    start: int,
+    end: int | None,
+    markers: tuple[str, ...] | None,
+    window: TimeWindow | None,
+    new_collector: Callable[[], C],
+    glog_parser: GlogLineParser,
+) -> tuple[C, int]:
+    collector = new_collector()
+    n_lines = walk_mapped(
+        buf,
+        run_id=run_id,
+        node=node,
+        log_path=log_path,
+        year=year,
+        on_line=collector.on_line,
+        glog_parser=glog_parser,
+        start=start,
+        end=end,
+        markers=markers,
+        window=window,
+    )
+    return collector, n_lines
+
+
+def _collect_range[C: Collector](
+    task: _RangeTask, new_collector: Callable[[], C], glog_parser: GlogLineParser
+) -> tuple[C, int]:
+    """
+    Worker entry point: parse one byte range into a fresh collector.
+    """
+    with map_file(task.log_path) as (buf, _):
+        return _collect_span(
+            buf,
+            run_id=task.run_id,
+            node=task.node,
+            log_path=task.log_path,
+            year=task.year,
+            start=task.start,
+            end=task.end,
+            markers=task.markers,
+            window=task.window,
+            new_collector=new_collector,
+            glog_parser=glog_parser,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class _FilePlan[C: Collector]:
+    """
+    What is left to parse in one file.
+    - base: reusable cached state covering [0, base.offset), or None.
+    - ranges: complete lines still to parse, [base.offset or 0, complete_end).
+    - A trailing line without its newline yet (a writer mid-append) is parsed
+      for this run's output but never persisted, so the next run re-reads it.
+    - skip: leading bytes that are never parsed, holding skipped_lines lines:
+      they repeat an earlier file of the node (see OverlapIndex) or precede
+      the time window.
+    - end: where parsing stops, the file size unless the time window ends
+      earlier.
+    - Files with a skip or a time window bypass the cache, since what is
+      parsed then depends on other files or on the window.
+    """
+
+    node: Node
+    log_path: Path
+    key: ParseCacheKey
+    sig: _FileSig
+    inode: int
+    year: int
+    head_hash: str
+    base: FileState[C] | None
+    ranges: list[tuple[int, int]]
+    complete_end: int
+    end: int
+    skip: int = 0
+    skipped_lines: int = 0
+    cacheable: bool = True
+
+    @property
+    def has_partial_tail(self) -> bool:
+        return self.complete_end < self.end and self.skip < self.end
+
+    def spans(self) -> list[tuple[int, int | None]]:
+        spans: list[tuple[int, int | None]] = list(self.ranges)
+        if self.has_partial_tail:
+            spans.append((self.complete_end, None))
+        return spans
+
+
+def _reusable_state[C: Collector](
+    cache: ParseCache | None,
+    key: ParseCacheKey,
+    collector_type: type[C],
+    *,
+    buf: ByteSource,
+    inode: int,
+    year: int,
+) -> FileState[C] | None:
+    """
+    Cached state for key if the file still starts with the bytes it covers.
+    """
+    if cache is None:
+        return None
+    state = cache.load(key)
+    if not isinstance(state, FileState) or not isinstance(
+        state.collector, collector_type
+    ):
+        return None
+    if state.inode != inode or state.year != year or state.offset > len(buf):
+        return None
+    if state.offset and buf[state.offset - 1 : state.offset] != b"\n":
+        return None
+    if head_hash(buf, state.offset) != state.head_hash:
+        return None
+    return state
+
+
+def _plan_file[C: Collector](
+    buf: ByteSource,
+    st: os.stat_result,
+    *,
+    run_id: RunId,
+    node: Node,
+    log_path: Path,
+    cache_tag: str,
+    cache: ParseCache | None,
+    collector_type: type[C],
+    range_bytes: int,
+    year_resolver: YearResolver,
+    default_year: int,
+    overlap: OverlapIndex | None,
+    window: TimeWindow | None,
+) -> _FilePlan[C]:
+    sig = file_sig(log_path, st)
+    year = year_resolver(sig, head_lines(buf), default_year=default_year)
+    key = ParseCacheKey(tag=cache_tag, run_id=run_id, node=node, path=sig.path)
+    complete_end = buf.rfind(b"\n") + 1
+
+    skip = 0
+    if overlap is not None:
+        skip = overlap.skip_bytes(buf, node=node, log_path=log_path, year=year)
+    end = len(buf)
+    if window is not None:
+        since, end = window.byte_span(buf, year=year)
+        skip = max(skip, since)
+
+    cacheable = cache is not None and not skip and window is None
+    base = None
+    if cacheable:
+        base = _reusable_state(
+            cache, key, collector_type, buf=buf, inode=st.st_ino, year=year
+        )
+
+    return _FilePlan(
+        node=node,
+        log_path=log_path,
+        key=key,
+        sig=sig,
+        inode=st.st_ino,
+        year=year,
+        head_hash=head_hash(buf, complete_end) if cacheable else "",
+        base=base,
+        ranges=_line_aligned_ranges(
+            buf,
+            range_bytes,
+            start=skip if base is None else base.offset,
+            end=min(complete_end, end),
+        ),
+        complete_end=complete_end,
+        end=end,
+        skip=skip,
+        skipped_lines=count_newlines(buf, 0, skip) if skip else 0,
+        cacheable=cacheable,
+    )
+
+
+def _finish_file[C: Collector](
+    plan: _FilePlan[C],
+    results: Iterator[tuple[C, int]],
+    *,
+    new_collector: Callable[[], C],
+    cache: ParseCache | None,
+    out: CollectorSink[C],
+) -> None:
+    """
+    Stitch the span results of one file (in plan.spans() order) onto its
+    cached base, persist the new state, and merge the file into out.
+    """
+    collector = None if plan.base is None else plan.base.collector
+    n_lines = plan.skipped_lines if plan.base is None else plan.base.n_lines
+    for _ in plan.ranges:
+        part, n = next(results)
+        if collector is None and not n_lines:
+            collector = part
+        else:
+            if collector is None:
+                collector = new_collector()
+            collector.merge(part, lineno_offset=n_lines)
+        n_lines += n
+    if collector is None:
+        collector = new_collector()
+
+    changed = plan.base is None or plan.base.sig != plan.sig
+    if cache is not None and plan.cacheable and changed:
+        cache.store(
+            plan.key,
+            FileState(
+                sig=plan.sig,
+                inode=plan.inode,
+                head_hash=plan.head_hash,
+                year=plan.year,
+                offset=plan.complete_end,
+                n_lines=n_lines,
+                collector=collector,
+            ),
+        )
+
+    out.merge(collector)
+    if plan.has_partial_tail:
+        tail, _ = next(results)
+        out.merge(tail, lineno_offset=n_lines)
+
+
+def _collect_serial[C: Collector](
+    *,
+    run_id: RunId,
+    run_dir: Path,
+    nodes: tuple[Node, ...],
+    file_glob: str,
+    new_collector: Callable[[], C],
+    collector_type: type[C],
+    cache_tag: str,
+    markers: tuple[str, ...] | None,
+    cache: ParseCache | None,
+    overlap: OverlapIndex | None,
+    window: TimeWindow | None,
+    year_resolver: YearResolver,
+    glog_parser: GlogLineParser,
+    out: CollectorSink[C],
+) -> None:
+    """
+    In-process path: one open per file covers fingerprint, year, cache lookup
+    and parsing of whatever the cache does not already cover.
+    """
+    default_year = datetime.now().year
+
+    for node, log_path in iter_log_paths(
+        run_dir=run_dir, nodes=nodes, file_glob=file_glob, window=window
+    ):
+        with map_file(log_path) as (buf, st):
+            plan = _plan_file(
+                buf,
+                st,
+                run_id=run_id,
+                node=node,
+                log_path=log_path,
+                cache_tag=cache_tag,
+                cache=cache,
+                collector_type=collector_type,
+                range_bytes=0,
+                year_resolver=year_resolver,
+                default_year=default_year,
+                overlap=overlap,
+                window=window,
+            )
+            results = (
+                _collect_span(
+                    buf,
+                    run_id=run_id,
+                    node=node,
+                    log_path=log_path,
+                    year=plan.year,
+                    start=start,
+                    end=end,
+                    markers=markers,
+                    window=window,
+                    new_collector=new_collector,
+                    glog_parser=glog_parser,
+                )
+                for start, end in plan.spans()
+            )
+            _finish_file(
+                plan, results, new_collector=new_collector, cache=cache, out=out
+            )
+
+
+def _run_tasks[C: Collector](
+    tasks: list[_RangeTask],
+    new_collector: Callable[[], C],
+    glog_parser: GlogLineParser,
+    *,
+    jobs: int,
+) -> Iterator[tuple[C, int]]:
+    """
+    Yield range results in task order; a single task runs in-process.
+    """
+    if len(tasks) < 2:
+        for task in tasks:
+            yield _collect_range(task, new_collector, glog_parser)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        # Executor.map yields in submission order, which keeps the merge deterministic.
+        yield from pool.map(
+            _collect_range,
+            tasks,
+            [new_collector] * len(tasks),
+            [glog_parser] * len(tasks),
+        )
+
+
+def _collect_parallel[C: Collector](
+    *,
+    run_id: RunId,
+    run_dir: Path,
+    nodes: tuple[Node, ...],
+    file_glob: str,
+    new_collector: Callable[[], C],
+    collector_type: type[C],
+    cache_tag: str,
+    markers: tuple[str, ...] | None,
+    opts: IngestOptions,
+    overlap: OverlapIndex | None,
+    year_resolver: YearResolver,
+    glog_parser: GlogLineParser,
+    out: CollectorSink[C],
+) -> None:
+    """
+    Worker-pool path: every file is planned up front (one open each), the
+    spans left to parse are cut into range tasks for up to opts.jobs
+    processes, and results are stitched back per file in walk order.
+    """
+    default_year = datetime.now().year
+    plans: list[_FilePlan[C]] = []
+    for node, log_path in iter_log_paths(
+        run_dir=run_dir, nodes=nodes, file_glob=file_glob, window=opts.window
+    ):
+        with map_file(log_path) as (buf, st):
+            plans.append(
+                _plan_file(
+                    buf,
+                    st,
+                    run_id=run_id,
+                    node=node,
+                    log_path=log_path,
+                    cache_tag=cache_tag,
+                    cache=opts.cache,
+                    collector_type=collector_type,
+                    range_bytes=opts.range_bytes,
+                    year_resolver=year_resolver,
+                    default_year=default_year,
+                    overlap=overlap,
+                    window=opts.window,
                 )
+            )
+
+    tasks = [
+        _RangeTask(
+            run_id=run_id,
+            node=plan.node,
+            log_path=plan.log_path,
+            year=plan.year,
+            start=start,
+            end=end,
+            markers=markers,
+            window=opts.window,
+        )
+        for plan in plans
+        for start, end in plan.spans()
+    ]
+
+    results = _run_tasks(tasks, new_collector, glog_parser, jobs=opts.jobs)
+    for plan in plans:
+        _finish_file(
+            plan, results, new_collector=new_collector, cache=opts.cache, out=out
+        )
+
+
+def collect_logs[C: Collector](
+    *,
+    run_id: RunId,
+    run_dir: Path,
+    nodes: tuple[Node, ...],
+    file_glob: str,
+    new_collector: Callable[[], C],
+    collector_type: type[C],
+    cache_tag: str,
+    markers: tuple[str, ...] | None = None,
+    options: IngestOptions | None = None,
+    year_resolver: YearResolver | None = None,
+    glog_parser: GlogLineParser = parse_glog_line,
+) -> C:
+    """
+    Parse log files into one collector per file and merge them in walk order,
+    so the result matches a single serial walk_logs pass.
+    - With options.cache, each file's parsed state is persisted together with
+      the byte offset and line count it covers. Unchanged files are loaded as
+      is; files that only grew (same inode, same leading bytes) are extended
+      by parsing just the appended tail; anything else is parsed from scratch.
+    - With options.skip_overlaps, a file that repeats an earlier file of the
+      same node byte for byte (a copy, or a prefix/extension left by rotation)
+      is parsed only past the repeated bytes; skips go to options.reporter.
+    - With options.jobs > 1, files are parsed by worker processes; spans larger
+      than options.range_bytes are split into line-aligned byte ranges parsed
+      concurrently, with line numbers re-based per file during the merge.
+    - With options.window, files last written before it are not opened, and
+      only the byte range of each file stamped inside it is parsed (found by
+      binary search, see TimeWindow); such files bypass the cache.
+    year_resolver defaults to resolve_file_year, remembering file years in
+    options.cache (so only cached runs write them to disk).
+    new_collector and glog_parser must be picklable (module-level callables or
+    functools.partial of them); collector_type validates cache entries.
+    """
+    out = new_collector()
+    collect_logs_into(
+        out,
+        run_id=run_id,
+        run_dir=run_dir,
+        nodes=nodes,
+        file_glob=file_glob,
+        new_collector=new_collector,
+        collector_type=collector_type,
+        cache_tag=cache_tag,
+        markers=markers,
+        options=options,
+        year_resolver=year_resolver,
+        glog_parser=glog_parser,
+    )
+    return out
+
+
+def collect_logs_into[C: Collector](
+    out: CollectorSink[C],
+    *,
+    run_id: RunId,
+    run_dir: Path,
+    nodes: tuple[Node, ...],
+    file_glob: str,
+    new_collector: Callable[[], C],
+    collector_type: type[C],
+    cache_tag: str,
+    markers: tuple[str, ...] | None = None,
+    options: IngestOptions | None = None,
+    year_resolver: YearResolver | None = None,
+    glog_parser: GlogLineParser = parse_glog_line,
+) -> None:
+    """
+    collect_logs, merging every file's collector into out as soon as the file
+    is done, so out can consume rows in walk order without keeping them all.
+    """
+    opts = options if options is not None else IngestOptions()
+    overlap = OverlapIndex() if opts.skip_overlaps else None
+    years = None
+    if year_resolver is None:
+        years = opts.cache.year_cache() if opts.cache is not None else None
+        year_resolver = partial(resolve_file_year, cache=years)
+
+    if opts.jobs <= 1:
+        _collect_serial(
+            run_id=run_id,
+            run_dir=run_dir,
+            nodes=nodes,
+            file_glob=file_glob,
+            new_collector=new_collector,
+            collector_type=collector_type,
+            cache_tag=cache_tag,
+            markers=markers,
+            cache=opts.cache,
+            overlap=overlap,
+            window=opts.window,
+            year_resolver=year_resolver,
+            glog_parser=glog_parser,
+            out=out,
+        )
+    else:
+        _collect_parallel(
+            run_id=run_id,
+            run_dir=run_dir,
+            nodes=nodes,
+            file_glob=file_glob,
+            new_collector=new_collector,
+            collector_type=collector_type,
+            cache_tag=cache_tag,
+            markers=markers,
+            opts=opts,
+            overlap=overlap,
+            year_resolver=year_resolver,
+            glog_parser=glog_parser,
+            out=out,
+        )
+
+    if years is not None:
+        years.save()
+    if opts.cache is not None:
+        opts.cache.prune()
+    if overlap is not None and overlap.skipped and opts.reporter is not None:
+        for skipped in overlap.skipped:
+            opts.reporter.info(
+                f"   skipped repeated log bytes in {run_id}/{skipped.describe()}"
+            )
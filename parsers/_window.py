@@ -0,0 +1,147 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Self
+
+from common.model.config import check_time_window
+from common.parse.glog import TS_PREFIX_LEN, epoch_ns, glog_ts_ns
+
+from ._linescan import ByteSource
+
+# Log timestamps are the logging host's local time, mtimes are converted with
+# this host's zone; a day of slack keeps zone differences from dropping files.
+_MTIME_SLACK_NS: int = 24 * 3600 * 10**9
+
+# Threads stamp a line before taking the log lock, so stamps within a file are
+# only nearly ordered; byte ranges are widened by this much to catch strays.
+_ORDER_SLACK_NS: int = 10**9
+
+
+def _line_ts(buf: ByteSource, pos: int, year: int) -> int | None:
+    """
+    Timestamp of the line starting at pos; only its prefix is decoded.
+    """
+    head = buf[pos : pos + TS_PREFIX_LEN].decode("ascii", errors="replace")
+    return glog_ts_ns(head, year)
+
+
+def _line_start_at(buf: ByteSource, pos: int) -> int:
+    """
+    Start of the first line starting at or after pos.
+    """
+    if pos <= 0:
+        return 0
+    nl = buf.find(b"\n", pos - 1)
+    return len(buf) if nl < 0 else nl + 1
+
+
+def _next_stamped(buf: ByteSource, pos: int, year: int) -> tuple[int, int] | None:
+    """
+    (start, ts_ns) of the first timestamped line starting at or after the
+    line start pos, or None.
+    """
+    size = len(buf)
+    while pos < size:
+        ts = _line_ts(buf, pos, year)
+        if ts is not None:
+            return pos, ts
+        pos = _line_start_at(buf, pos + 1)
+    return None
+
+
+def _last_stamped(buf: ByteSource, year: int) -> tuple[int, int] | None:
+    """
+    (start, ts_ns) of the last timestamped line, or None.
+    """
+    end = len(buf)
+    while end > 0:
+        pos = buf.rfind(b"\n", 0, end - 1) + 1
+        ts = _line_ts(buf, pos, year)
+        if ts is not None:
+            return pos, ts
+        end = pos
+    return None
+
+
+def _first_at_or_after(buf: ByteSource, ts_ns: int, year: int) -> int:
+    """
+    Start of the first timestamped line stamped ts_ns or later (len(buf) if
+    none), by binary search over byte offsets: each probe decodes the prefix
+    of the first timestamped line after it. Stamps must not decrease.
+    """
+    lo, hi = 0, len(buf)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        hit = _next_stamped(buf, _line_start_at(buf, mid), year)
+        if hit is None or hit[1] >= ts_ns:
+            hi = mid
+        else:
+            lo = mid + 1
+    hit = _next_stamped(buf, _line_start_at(buf, lo), year)
+    return len(buf) if hit is None else hit[0]
+
+
+@dataclass(frozen=True, slots=True)
+class TimeWindow:
+    """
+    The [since, until) span of log time to ingest, as epoch-ns on the glog
+    ts_ns clock; a None bound is open.
+    Glog stamps (nearly) increase within a file, so the lines inside the
+    window form one byte range, found by binary search on line timestamps
+    and widened by _ORDER_SLACK_NS for lines stamped out of order; lines
+    outside it are never decoded, lines inside are checked with contains().
+    """
+
+    since_ns: int | None = None
+    until_ns: int | None = None
+
+    @classmethod
+    def between(cls, since: datetime | None, until: datetime | None) -> Self:
+        """
+        Window from naive local datetimes, the way glog stamps read; since
+        must be before until.
+        """
+        check_time_window(since, until)
+        return cls(
+            since_ns=None if since is None else epoch_ns(since),
+            until_ns=None if until is None else epoch_ns(until),
+        )
+
+    def contains(self, ts_ns: int) -> bool:
+        if self.since_ns is not None and ts_ns < self.since_ns:
+            return False
+        return self.until_ns is None or ts_ns < self.until_ns
+
+    def written_before(self, mtime_ns: int) -> bool:
+        """
+        Whether a file last modified at mtime_ns (st_mtime_ns) cannot hold a
+        line of the window, so it need not be opened.
+        """
+        if self.since_ns is None:
+            return False
+        local = epoch_ns(datetime.fromtimestamp(mtime_ns / 1e9))
+        return local + _MTIME_SLACK_NS < self.since_ns
+
+    def byte_span(self, buf: ByteSource, *, year: int) -> tuple[int, int]:
+        """
+        [start, end) of the lines of buf inside the window; both offsets are
+        line starts (or len(buf)). Files whose first and last stamps fall
+        outside the window, or that have none, give an empty span at the end.
+        """
+        size = len(buf)
+        first = _next_stamped(buf, 0, year)
+        last = _last_stamped(buf, year)
+        if first is None or last is None:
+            return size, size
+
+        lo = None if self.since_ns is None else self.since_ns - _ORDER_SLACK_NS
+        hi = None if self.until_ns is None else self.until_ns + _ORDER_SLACK_NS
+        if (hi is not None and first[1] >= hi) or (lo is not None and last[1] < lo):
+            return size, size
+
+        start = 0
+        if lo is not None and first[1] < lo:
+            start = _first_at_or_after(buf, lo, year)
+        end = size
+        if hi is not None and last[1] >= hi:
+            end = _first_at_or_after(buf, hi, year)
+        return start, max(start, end)
@@ -1,5 +1,44 @@
+from array import array
+
+import numpy as np
 import pandas as pd
 
+# int64 sentinel that numpy/pandas read back as NaT in a datetime64[ns] column.
+NAT_NS: int = int(np.iinfo(np.int64).min)
+
+
+def int_column(buf: array[int]) -> np.ndarray:
+    """
+    Copy an array('q') buffer into an int64 ndarray.
+    """
+    return np.frombuffer(buf, dtype=np.int64).copy()
+
+
+def float_column(buf: array[float]) -> np.ndarray:
+    """
+    Copy an array('d') buffer into a float64 ndarray.
+    """
+    return np.frombuffer(buf, dtype=np.float64).copy()
+
+
+def datetime_column(buf: array[int]) -> np.ndarray:
+    """
+    Copy an array('q') of epoch-nanoseconds into a datetime64[ns] ndarray.
+    NAT_NS entries become NaT.
+    """
+    return int_column(buf).view("datetime64[ns]")
+
+
+def shifted(buf: array[int], offset: int) -> array[int]:
+    """
+    Return buf with offset added to every element (buf itself when offset is 0).
+    """
+    if not offset:
+        return buf
+    out = array("q")
+    out.frombytes((np.frombuffer(buf, dtype=np.int64) + offset).tobytes())
+    return out
+
 
 def stable_dedupe(
     df: pd.DataFrame,
@@ -1,3 +1,9 @@
-from .table import parse_gpe
+from .table import GpeCollector, parse_gpe, parse_gpe_into
+from .text import with_gpe_text
 
-__all__ = ["parse_gpe"]
+__all__ = [
+    "GpeCollector",
+    "parse_gpe",
+    "parse_gpe_into",
+    "with_gpe_text",
+]
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
+from common.model.constants import GPE_MARKER_TOKENS
 from common.parse.regexes import GPE
+from common.parse.screen import has_marker
 from common.parse.request_id import extract_request_id
 
 from .records import (
@@ -72,6 +74,9 @@ def decode_msg(msg: str) -> DecodedGpe | None:
       msg -> (record + request_id)
     No ParsedLine, no pandas, no filesystem concerns.
     """
+    if not has_marker(msg, GPE_MARKER_TOKENS):
+        return None
+
     rec = _classify_record(msg)
     if rec is None:
         return None
@@ -1,28 +1,7 @@
 from dataclasses import dataclass
-from typing import NotRequired, TypedDict
 
 import pandas as pd
 
-from common.model.types import Node, RequestId, RunId
-
-
-class GpeRow(TypedDict):
-    run: RunId
-    node: Node
-    ts: pd.Timestamp
-    tid: int
-    request_id: NotRequired[RequestId | None]
-    event: str
-    udf: NotRequired[str | None]
-    label: str
-    iteration: NotRequired[int | None]
-    detail: str
-    udf_ms: float
-    log_path: str
-    lineno: int
-    raw_msg: str
-
-
 OUT_COLS = pd.Index(
     [
         "run",
@@ -34,16 +13,19 @@ OUT_COLS = pd.Index(
         "udf",
         "label",
         "iteration",
-        "detail",
+        "detail_len",
+        "detail_text",
         "udf_ms",
         "log_path",
         "lineno",
-        "raw_msg",
+        "line_offset",
+        "msg_len",
+        "msg_hash",
     ]
 )
 
 # Dedupe key: duplicated across files differ only by (log_path, lineno)
-GPE_DEDUPE_SUBSET: list[str] = ["run", "node", "tid", "ts", "raw_msg"]
+GPE_DEDUPE_SUBSET: list[str] = ["run", "node", "tid", "ts", "msg_hash"]
 
 
 @dataclass(frozen=True, slots=True)
@@ -1,90 +1,223 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
 from math import nan
+from pathlib import Path
+from typing import Self
+
+import pandas as pd
 
 from common.model.constants import GPE_STEP, GPE_UDF_START, GPE_UDF_STOP
+from common.support.categorical import category_column
 from parsers._walker import ParsedLine
+from parsers.dfutils import datetime_column, float_column, int_column, shifted
 
 from .decode import DecodedGpe
-from .records import GpeRow, GpeStepRecord, GpeUdfStartRecord, GpeUdfStopRecord
-
-
-def base_row(
-    *,
-    pl: ParsedLine,
-    request_id: str | None,
-    event: str,
-    label: str,
-    detail: str,
-    udf_ms: float,
-) -> GpeRow:
-    return {
-        "run": pl.run,
-        "node": pl.node,
-        "ts": pl.ts,
-        "tid": pl.tid,
-        "request_id": request_id,
-        "event": event,
-        "label": label,
-        "detail": detail,
-        "udf_ms": udf_ms,
-        "log_path": str(pl.log_path),
-        "lineno": pl.lineno,
-        "raw_msg": pl.msg,
-    }
-
-
-def row_from_decoded(pl: ParsedLine, dec: DecodedGpe) -> GpeRow:
+from .records import OUT_COLS, GpeStepRecord, GpeUdfStartRecord, GpeUdfStopRecord
+
+
+@dataclass(slots=True)
+class GpeColumns:
+    """
+    Append-only column buffers for GPE events (one entry per matched line).
+    Numeric columns live in typed arrays; repeated strings are interned and
+    become categoricals in to_frame().
+    """
+
+    run: list[str] = field(default_factory=list)
+    node: list[str] = field(default_factory=list)
+    ts: array[int] = field(default_factory=lambda: array("q"))
+    tid: array[int] = field(default_factory=lambda: array("q"))
+    request_id: list[str | None] = field(default_factory=list)
+    event: list[str] = field(default_factory=list)
+    udf: list[str | None] = field(default_factory=list)
+    label: list[str] = field(default_factory=list)
+    iteration: array[float] = field(default_factory=lambda: array("d"))
+    # detail and raw_msg are suffixes of the line at (log_path, line_offset):
+    # only their lengths are kept (see parsers.gpe.text.with_gpe_text).
+    detail_len: array[int] = field(default_factory=lambda: array("q"))
+    # A decoder may return a detail that is not a suffix of the message
+    # (e.g. normalized text): it is kept here, with detail_len -1.
+    detail_text: list[str | None] = field(default_factory=list)
+    udf_ms: array[float] = field(default_factory=lambda: array("d"))
+    log_path: list[str] = field(default_factory=list)
+    lineno: array[int] = field(default_factory=lambda: array("q"))
+    line_offset: array[int] = field(default_factory=lambda: array("q"))
+    msg_len: array[int] = field(default_factory=lambda: array("q"))
+    # stable_hash64(raw_msg): dedupe key, and the check that re-read text still matches
+    msg_hash: array[int] = field(default_factory=lambda: array("q"))
+
+    _last_path: Path | None = field(default=None, init=False, repr=False)
+    _last_path_str: str = field(default="", init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def _path_str(self, log_path: Path) -> str:
+        if log_path is not self._last_path:
+            self._last_path = log_path
+            self._last_path_str = sys.intern(str(log_path))
+        return self._last_path_str
+
+    def append(
+        self,
+        *,
+        pl: ParsedLine,
+        request_id: str | None,
+        event: str,
+        udf: str | None,
+        label: str,
+        iteration: int | None,
+        detail: str,
+        udf_ms: float,
+        msg_hash: int,
+    ) -> None:
+        self.run.append(pl.run)
+        self.node.append(pl.node)
+        self.ts.append(pl.ts_ns)
+        self.tid.append(pl.tid)
+        self.request_id.append(request_id)
+        self.event.append(event)
+        self.udf.append(None if udf is None else sys.intern(udf))
+        self.label.append(sys.intern(label))
+        self.iteration.append(nan if iteration is None else float(iteration))
+        if pl.msg.endswith(detail):
+            self.detail_len.append(len(detail))
+            self.detail_text.append(None)
+        else:
+            self.detail_len.append(-1)
+            self.detail_text.append(detail)
+        self.udf_ms.append(udf_ms)
+        self.log_path.append(self._path_str(pl.log_path))
+        self.lineno.append(pl.lineno)
+        self.line_offset.append(pl.offset)
+        self.msg_len.append(len(pl.msg))
+        self.msg_hash.append(msg_hash)
+
+    def dedupe_key(self, i: int) -> tuple[str, int, int, int]:
+        """
+        (node, tid, ts_ns, msg_hash) of row i: rows of one run with equal keys
+        are the same log line seen through overlapping files.
+        """
+        return (self.node[i], self.tid[i], self.ts[i], self.msg_hash[i])
+
+    def extend(
+        self,
+        other: Self,
+        *,
+        lineno_offset: int = 0,
+        rows: Sequence[int] | None = None,
+    ) -> None:
+        """
+        Append other's rows (only the given row positions, in order, when set).
+        """
+        if rows is not None:
+            other = other.take(rows)
+
+        self.run.extend(other.run)
+        self.node.extend(other.node)
+        self.ts.extend(other.ts)
+        self.tid.extend(other.tid)
+        self.request_id.extend(other.request_id)
+        self.event.extend(other.event)
+        self.udf.extend(other.udf)
+        self.label.extend(other.label)
+        self.iteration.extend(other.iteration)
+        self.detail_len.extend(other.detail_len)
+        self.detail_text.extend(other.detail_text)
+        self.udf_ms.extend(other.udf_ms)
+        self.log_path.extend(other.log_path)
+        self.lineno.extend(shifted(other.lineno, lineno_offset))
+        self.line_offset.extend(other.line_offset)
+        self.msg_len.extend(other.msg_len)
+        self.msg_hash.extend(other.msg_hash)
+
+    def take(self, rows: Sequence[int]) -> Self:
+        out = type(self)()
+        for f in fields(self):
+            if not f.init:
+                continue
+            col = getattr(self, f.name)
+            picked = (col[i] for i in rows)
+            setattr(
+                out,
+                f.name,
+                array(col.typecode, picked) if isinstance(col, array) else list(picked),
+            )
+        return out
+
+    def to_frame(self, request_ids: pd.CategoricalDtype | None = None) -> pd.DataFrame:
+        """
+        The rows as an events frame; request_id is coded against request_ids
+        when given (see category_column).
+        """
+        return pd.DataFrame(
+            {
+                "run": category_column(self.run),
+                "node": category_column(self.node),
+                "ts": datetime_column(self.ts),
+                "tid": int_column(self.tid),
+                "request_id": category_column(self.request_id, request_ids),
+                "event": category_column(self.event),
+                "udf": category_column(self.udf),
+                "label": category_column(self.label),
+                "iteration": float_column(self.iteration),
+                "detail_len": int_column(self.detail_len),
+                "detail_text": category_column(self.detail_text),
+                "udf_ms": float_column(self.udf_ms),
+                "log_path": category_column(self.log_path),
+                "lineno": int_column(self.lineno),
+                "line_offset": int_column(self.line_offset),
+                "msg_len": int_column(self.msg_len),
+                "msg_hash": int_column(self.msg_hash),
+            },
+            columns=OUT_COLS,
+        )
+
+
+def append_decoded(
+    cols: GpeColumns, pl: ParsedLine, dec: DecodedGpe, *, msg_hash: int
+) -> None:
     rid = dec.request_id
     rec = dec.record
 
     match rec:
         case GpeStepRecord(parsed=step):
-            row = base_row(
+            cols.append(
                 pl=pl,
                 request_id=rid,
                 event=GPE_STEP,
+                udf=step.udf,
                 label=step.label,
+                iteration=step.iteration,
                 detail=step.detail,
                 udf_ms=nan,
+                msg_hash=msg_hash,
             )
-            row["udf"] = step.udf
-            row["iteration"] = step.iteration
-            return row
 
         case GpeUdfStartRecord(parsed=start):
-            row = base_row(
+            cols.append(
                 pl=pl,
                 request_id=rid,
                 event=GPE_UDF_START,
+                udf=None,
                 label=GPE_UDF_START,
+                iteration=None,
                 detail=start.detail,
                 udf_ms=nan,
+                msg_hash=msg_hash,
             )
-            row["udf"] = None
-            row["iteration"] = None
-            return row
 
         case GpeUdfStopRecord(parsed=stop):
-            row = base_row(
+            cols.append(
                 pl=pl,
                 request_id=rid,
                 event=GPE_UDF_STOP,
+                udf=None,
                 label=GPE_UDF_STOP,
+                iteration=None,
                 detail=stop.detail,
                 udf_ms=stop.ms,
+                msg_hash=msg_hash,
             )
-            row["udf"] = None
-            row["iteration"] = None
-            return row
-
-    # Runtime safety fallback (should be unreachable)
-    row = base_row(
-        pl=pl,
-        request_id=rid,
-        event="UNKNOWN",
-        label="UNKNOWN",
-        detail=pl.msg,
-        udf_ms=nan,
-    )
-    row["udf"] = None
-    row["iteration"] = None
-    return row
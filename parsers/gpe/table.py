@@ -1,20 +1,31 @@
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Literal, Self
 
 import pandas as pd
 
-from common.model.constants import GPE_GLOB
-from common.model.types import Node, RunId
-from parsers._walker import ParsedLine, LogWalker, walk_logs
+from common.model.constants import GPE_GLOB, GPE_MARKER_TOKENS
+from common.model.types import Node, RequestId, RunId
+from common.support.ordering import sort_rows
+from common.support.hashing import stable_hash64
+from parsers._filter import RequestFilter
+from parsers._walker import (
+    CollectorSink,
+    IngestOptions,
+    LogWalker,
+    ParsedLine,
+    collect_logs_into,
+)
 from parsers.dfutils import stable_dedupe
 
 from .decode import DecodedGpe, decode_msg
-from .records import OUT_COLS, GPE_DEDUPE_SUBSET, GpeRow
-from .rows import row_from_decoded
+from .records import GPE_DEDUPE_SUBSET, GpeStepRecord
+from .rows import GpeColumns, append_decoded
 
 
 type GpeDecoder = Callable[[str], DecodedGpe | None]
+type GpeDedupe = Literal["stream", "sort"]
 
 
 def dedupe_gpe(df: pd.DataFrame) -> pd.DataFrame:
@@ -27,23 +38,103 @@ def dedupe_gpe(df: pd.DataFrame) -> pd.DataFrame:
 
 @dataclass(slots=True)
 class GpeCollector:
+    """
+    Decoded GPE rows of one run.
+    With dedupe="stream", a line already collected under the same
+    (node, tid, ts_ns, msg hash) is dropped on arrival and on merge, so the
+    first-seen copy in walk order (files sorted by path, then line number)
+    is kept: the same row dedupe_gpe would keep after its sort.
+    With dedupe="sort", duplicates are kept until finalize() runs dedupe_gpe.
+    With keep, rows of unwanted requests are dropped before they are
+    appended (see RequestFilter.keeps); merges are not filtered again.
+    """
+
     decoder: GpeDecoder
-    rows: list[GpeRow] = field(default_factory=list)
+    cols: GpeColumns = field(default_factory=GpeColumns)
+    dedupe: GpeDedupe = "stream"
+    keep: RequestFilter | None = None
+
+    # Rebuilt from cols on demand; not pickled (workers, parse cache).
+    _seen: set[tuple[str, int, int, int]] | None = field(
+        default=None, init=False, repr=False
+    )
+    # keep's per-request decisions; not pickled either.
+    _decided: dict[tuple[RunId, RequestId], bool] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    # keep only matters while lines are collected, so it is not shipped back
+    # from workers or stored in the parse cache with the rows.
+    def __getstate__(self) -> tuple[GpeDecoder, GpeColumns, GpeDedupe]:
+        return (self.decoder, self.cols, self.dedupe)
+
+    def __setstate__(self, state: tuple[GpeDecoder, GpeColumns, GpeDedupe]) -> None:
+        self.decoder, self.cols, self.dedupe = state
+        self.keep = None
+        self._seen = None
+        self._decided = {}
+
+    def _keys(self) -> set[tuple[str, int, int, int]]:
+        if self._seen is None:
+            cols = self.cols
+            self._seen = {cols.dedupe_key(i) for i in range(len(cols))}
+        return self._seen
 
     def on_line(self, pl: ParsedLine) -> None:
         dec = self.decoder(pl.msg)
         if dec is None:
             return
-        self.rows.append(row_from_decoded(pl, dec))
+        if self.keep is not None and not self.keep.keeps(
+            pl.run,
+            dec.request_id,
+            boundary=not isinstance(dec.record, GpeStepRecord),
+            memo=self._decided,
+        ):
+            return
+
+        msg_hash = stable_hash64(pl.msg)
+        if self.dedupe == "stream":
+            seen = self._keys()
+            key = (pl.node, pl.tid, pl.ts_ns, msg_hash)
+            if key in seen:
+                return
+            seen.add(key)
+
+        append_decoded(self.cols, pl, dec, msg_hash=msg_hash)
 
-    def finalize(self) -> pd.DataFrame:
-        if not self.rows:
-            return pd.DataFrame(columns=OUT_COLS)
+    def merge(self, other: Self, *, lineno_offset: int = 0) -> None:
+        if self.dedupe != "stream":
+            self.cols.extend(other.cols, lineno_offset=lineno_offset)
+            return
+
+        seen = self._keys()
+        their_keys = other._keys()
+        if seen.isdisjoint(their_keys):
+            seen |= their_keys
+            self.cols.extend(other.cols, lineno_offset=lineno_offset)
+            return
 
-        df = pd.DataFrame(self.rows).reindex(columns=OUT_COLS)
-        df = dedupe_gpe(df)
-        df = df.set_index(["run", "node", "tid", "ts"]).sort_index().reset_index()
-        return df.reset_index(drop=True)
+        theirs = other.cols
+        keep: list[int] = []
+        for i in range(len(theirs)):
+            key = theirs.dedupe_key(i)
+            if key not in seen:
+                seen.add(key)
+                keep.append(i)
+
+        self.cols.extend(
+            theirs,
+            lineno_offset=lineno_offset,
+            rows=None if len(keep) == len(theirs) else keep,
+        )
+
+    def finalize(self, request_ids: pd.CategoricalDtype | None = None) -> pd.DataFrame:
+        # no rows (e.g. nothing in the time window) still gives the typed,
+        # key-first frame
+        df = self.cols.to_frame(request_ids)
+        if self.dedupe == "sort":
+            df = dedupe_gpe(df)
+        return sort_rows(df, ("run", "node", "tid", "ts"))
 
 
 def parse_gpe(
@@ -51,17 +142,95 @@ def parse_gpe(
     run_dir: Path,
     *,
     nodes: tuple[Node, ...],
-    walker: LogWalker = walk_logs,
+    walker: LogWalker | None = None,
     decoder: GpeDecoder = decode_msg,
+    markers: tuple[str, ...] | None = GPE_MARKER_TOKENS,
+    dedupe: GpeDedupe = "stream",
+    options: IngestOptions | None = None,
+    keep: RequestFilter | None = None,
+    request_ids: pd.CategoricalDtype | None = None,
 ) -> pd.DataFrame:
-    collector = GpeCollector(decoder=decoder)
+    """
+    Parse all gpe* logs of a run into one events frame.
+    `markers` pre-screens lines by substring before decoding; a custom decoder
+    for another log dialect should pass the tokens its lines carry (or None to
+    decode every line).
+    `dedupe` picks how lines repeated across overlapping rotated files are
+    dropped (see GpeCollector); both modes keep the same rows.
+    `keep` drops rows of unwanted requests as lines are decoded, in the
+    per-file collectors (see RequestFilter); their cache entries are kept
+    apart from unfiltered ones.
+    `request_ids`: the request id dictionary to code request_id against,
+    usually the RESTPP frame's (see category_column).
+    A custom walker bypasses collect_logs (and so options: jobs and cache).
+    """
+    out = GpeCollector(decoder=decoder, dedupe=dedupe, keep=keep)
+
+    if walker is not None:
+        walker(
+            run_id=run_key,
+            run_dir=run_dir,
+            nodes=nodes,
+            file_glob=GPE_GLOB,
+            on_line=out.on_line,
+            markers=markers,
+        )
+        return out.finalize(request_ids)
+
+    collect_logs_into(
+        out,
+        run_id=run_key,
+        run_dir=run_dir,
+        nodes=nodes,
+        file_glob=GPE_GLOB,
+        new_collector=partial(GpeCollector, decoder=decoder, dedupe=dedupe, keep=keep),
+        collector_type=GpeCollector,
+        cache_tag=_cache_tag(decoder, markers, dedupe, keep),
+        markers=markers,
+        options=options,
+    )
+    return out.finalize(request_ids)
+
 
-    walker(
+def parse_gpe_into(
+    sink: CollectorSink[GpeCollector],
+    run_key: RunId,
+    run_dir: Path,
+    *,
+    nodes: tuple[Node, ...],
+    decoder: GpeDecoder = decode_msg,
+    markers: tuple[str, ...] | None = GPE_MARKER_TOKENS,
+    options: IngestOptions | None = None,
+    keep: RequestFilter | None = None,
+) -> None:
+    """
+    Parse all gpe* logs of a run, handing each file's GpeCollector to sink in
+    walk order (files sorted by path, lines in file order) instead of
+    building the events frame. Per-file collectors dedupe in "stream" mode
+    and share parse_gpe's cache entries; dropping lines repeated across
+    files is left to the sink. `keep`: as in parse_gpe.
+    """
+    collect_logs_into(
+        sink,
         run_id=run_key,
         run_dir=run_dir,
         nodes=nodes,
         file_glob=GPE_GLOB,
-        on_line=collector.on_line,
+        new_collector=partial(
+            GpeCollector, decoder=decoder, dedupe="stream", keep=keep
+        ),
+        collector_type=GpeCollector,
+        cache_tag=_cache_tag(decoder, markers, "stream", keep),
+        markers=markers,
+        options=options,
     )
 
-    return collector.finalize()
+
+def _cache_tag(
+    decoder: GpeDecoder,
+    markers: tuple[str, ...] | None,
+    dedupe: GpeDedupe,
+    keep: RequestFilter | None,
+) -> str:
+    tag = f"gpe:{decoder.__module__}.{decoder.__qualname__}:{markers}:{dedupe}"
+    return tag if keep is None else f"{tag}:{keep.cache_key()}"
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from common.support.hashing import stable_hash64
+from parsers._linetext import line_bodies
+
+# Columns that locate a GPE row's text in its log file (see GpeColumns).
+TEXT_REF_COLS: tuple[str, ...] = (
+    "line_offset",
+    "msg_len",
+    "detail_len",
+    "detail_text",
+    "msg_hash",
+)
+
+
+def _texts(df: pd.DataFrame, *, with_detail: bool) -> tuple[np.ndarray, np.ndarray]:
+    raw = np.full(len(df), None, dtype=object)
+    detail = np.full(len(df), None, dtype=object)
+
+    offsets = df["line_offset"].to_numpy()
+    msg_len = df["msg_len"].to_numpy()
+    msg_hash = df["msg_hash"].to_numpy()
+    detail_len = df["detail_len"].to_numpy() if with_detail else None
+
+    by_file = df.groupby("log_path", observed=True, sort=False).indices
+    for log_path, rows in by_file.items():
+        bodies = line_bodies(Path(str(log_path)), offsets[rows].tolist())
+        for i, body in zip(rows, bodies):
+            n = int(msg_len[i])
+            if body is None or n > len(body):
+                continue
+            msg = body[len(body) - n :]
+            # The file was rewritten since it was parsed: no text rather than wrong text.
+            if stable_hash64(msg) != msg_hash[i]:
+                continue
+            raw[i] = msg
+            if detail_len is not None and detail_len[i] >= 0:
+                detail[i] = msg[n - int(detail_len[i]) :]
+
+    # Details a decoder did not take verbatim from the line were kept as text.
+    if with_detail and "detail_text" in df.columns:
+        kept = df["detail_text"].to_numpy(dtype=object)
+        has = pd.notna(kept)
+        detail[has] = kept[has]
+
+    return raw, detail
+
+
+def with_gpe_text(df: pd.DataFrame, *, raw_msg: bool = True) -> pd.DataFrame:
+    """
+    Replace the TEXT_REF_COLS of GPE rows with their text, read back from
+    log_path: detail takes the place of detail_len (and detail_text) and
+    (unless raw_msg=False) raw_msg the place of msg_len. Meant for the few rows that are exported or
+    shown. Rows whose line no longer matches its msg_hash, or whose file is
+    gone, get None. Frames without the references are returned unchanged.
+    """
+    if not {"log_path", "line_offset", "msg_len", "msg_hash"} <= set(df.columns):
+        return df
+
+    with_detail = "detail_len" in df.columns
+    raw, detail = _texts(df, with_detail=with_detail)
+
+    cols: dict[str, object] = {}
+    for c in df.columns:
+        match c:
+            case "msg_len":
+                if raw_msg:
+                    cols["raw_msg"] = raw
+            case "detail_len":
+                cols["detail"] = detail
+            case "line_offset" | "msg_hash" | "detail_text":
+                continue
+            case _:
+                cols[c] = df[c]
+    return pd.DataFrame(cols, index=df.index)
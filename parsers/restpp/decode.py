@@ -1,9 +1,11 @@
 from common.model.constants import (
+    RESTPP_MARKER_TOKENS,
     RESTPP_RAW_TOKEN,
     RESTPP_REQINFO_TOKEN,
     REQINFO_ALLOWED_KEYS,
 )
 from common.parse.regexes import QUERY_ENDPOINT_RE, RETURNRESULT_RE
+from common.parse.screen import has_marker
 
 from .records import (
     RawRequestParsed,
@@ -78,6 +80,9 @@ def parse_request_info(msg: str) -> RequestInfoParsed | None:
 
 
 def classify_msg(msg: str) -> RestppRecord | None:
+    if not has_marker(msg, RESTPP_MARKER_TOKENS):
+        return None
+
     raw = parse_raw_request(msg)
     if raw is not None:
         return RestppRawRecord(parsed=raw)
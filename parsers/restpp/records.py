@@ -1,13 +1,8 @@
 from dataclasses import dataclass
-from typing import NotRequired, TypedDict
 
 import pandas as pd
-from pandas._libs.tslibs.nattype import NaTType
 
-from common.model.types import QueryName, RequestId, RunId
-
-
-type Timestampish = pd.Timestamp | NaTType
+from common.model.types import QueryName, RequestId
 
 
 @dataclass(frozen=True, slots=True)
@@ -49,30 +44,13 @@ class RestppInfoRecord:
 type RestppRecord = RestppRawRecord | RestppReturnRecord | RestppInfoRecord
 
 
-class RestppRow(TypedDict):
-    run: RunId
-    node: str
-    ts: pd.Timestamp
-    tid: int
-    request_id: RequestId
-
-    method: NotRequired[str | None]
-    endpoint: NotRequired[str | None]
-    query_name: NotRequired[QueryName | None]
-    graph_name: NotRequired[str | None]
-
-    restpp_return_ms: NotRequired[float]
-    restpp_engine: NotRequired[str | None]
-    return_ts: NotRequired[Timestampish]
-
-    log_path: str
-    lineno: int
-
-
 OUT_COLS = pd.Index(
     [
         "run",
         "request_id",
+        "rid_seq",
+        "rid_instance",
+        "rid_epoch_ms",
         "restpp_ts",
         "restpp_node",
         "endpoint",
@@ -83,3 +61,14 @@ OUT_COLS = pd.Index(
         "restpp_return_ts",
     ]
 )
+
+# Low-cardinality OUT_COLS, emitted as categoricals.
+CATEGORY_COLS: tuple[str, ...] = (
+    "run",
+    "rid_instance",
+    "restpp_node",
+    "endpoint",
+    "query_name",
+    "graph_name",
+    "restpp_engine",
+)
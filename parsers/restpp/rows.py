@@ -1,40 +1,125 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field, fields
 from math import nan
+from pathlib import Path
+from typing import Self
 
 import pandas as pd
 
+from common.support.categorical import category_column
 from parsers._walker import ParsedLine
+from parsers.dfutils import NAT_NS, datetime_column, float_column, int_column, shifted
 
-from .records import RawRequestParsed, ReturnResultParsed, RestppRow
-
-
-def make_raw_row(*, pl: ParsedLine, parsed: RawRequestParsed) -> RestppRow:
-    return {
-        "run": pl.run,
-        "node": pl.node,
-        "ts": pl.ts,
-        "tid": pl.tid,
-        "log_path": str(pl.log_path),
-        "lineno": pl.lineno,
-        "request_id": parsed.request_id,
-        "method": parsed.method,
-        "endpoint": parsed.endpoint,
-        "query_name": parsed.query_name,
-        "restpp_return_ms": nan,
-        "restpp_engine": None,
-        "return_ts": pd.NaT,
-    }
-
-
-def make_return_row(*, pl: ParsedLine, parsed: ReturnResultParsed) -> RestppRow:
-    return {
-        "run": pl.run,
-        "node": pl.node,
-        "ts": pl.ts,
-        "tid": pl.tid,
-        "log_path": str(pl.log_path),
-        "lineno": pl.lineno,
-        "request_id": parsed.request_id,
-        "restpp_return_ms": parsed.ms,
-        "restpp_engine": parsed.engine,
-        "return_ts": pl.ts,
-    }
+from .records import RawRequestParsed, ReturnResultParsed
+
+
+@dataclass(slots=True)
+class RestppColumns:
+    """
+    Append-only column buffers for RESTPP RawRequest/ReturnResult lines.
+    Numeric columns live in typed arrays; repeated strings are interned and
+    become categoricals in to_frame().
+    """
+
+    run: list[str] = field(default_factory=list)
+    node: list[str] = field(default_factory=list)
+    ts: array[int] = field(default_factory=lambda: array("q"))
+    tid: array[int] = field(default_factory=lambda: array("q"))
+    log_path: list[str] = field(default_factory=list)
+    lineno: array[int] = field(default_factory=lambda: array("q"))
+    request_id: list[str] = field(default_factory=list)
+    method: list[str | None] = field(default_factory=list)
+    endpoint: list[str | None] = field(default_factory=list)
+    query_name: list[str | None] = field(default_factory=list)
+    restpp_return_ms: array[float] = field(default_factory=lambda: array("d"))
+    restpp_engine: list[str | None] = field(default_factory=list)
+    return_ts: array[int] = field(default_factory=lambda: array("q"))
+
+    _last_path: Path | None = field(default=None, init=False, repr=False)
+    _last_path_str: str = field(default="", init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def _append_line(self, pl: ParsedLine, request_id: str) -> None:
+        if pl.log_path is not self._last_path:
+            self._last_path = pl.log_path
+            self._last_path_str = sys.intern(str(pl.log_path))
+
+        self.run.append(pl.run)
+        self.node.append(pl.node)
+        self.ts.append(pl.ts_ns)
+        self.tid.append(pl.tid)
+        self.log_path.append(self._last_path_str)
+        self.lineno.append(pl.lineno)
+        self.request_id.append(request_id)
+
+    def append_raw(self, *, pl: ParsedLine, parsed: RawRequestParsed) -> None:
+        self._append_line(pl, parsed.request_id)
+        self.method.append(parsed.method)
+        self.endpoint.append(parsed.endpoint)
+        self.query_name.append(
+            None if parsed.query_name is None else sys.intern(parsed.query_name)
+        )
+        self.restpp_return_ms.append(nan)
+        self.restpp_engine.append(None)
+        self.return_ts.append(NAT_NS)
+
+    def append_return(self, *, pl: ParsedLine, parsed: ReturnResultParsed) -> None:
+        self._append_line(pl, parsed.request_id)
+        self.method.append(None)
+        self.endpoint.append(None)
+        self.query_name.append(None)
+        self.restpp_return_ms.append(parsed.ms)
+        self.restpp_engine.append(sys.intern(parsed.engine))
+        self.return_ts.append(pl.ts_ns)
+
+    def extend(self, other: Self, *, lineno_offset: int = 0) -> None:
+        self.run.extend(other.run)
+        self.node.extend(other.node)
+        self.ts.extend(other.ts)
+        self.tid.extend(other.tid)
+        self.log_path.extend(other.log_path)
+        self.lineno.extend(shifted(other.lineno, lineno_offset))
+        self.request_id.extend(other.request_id)
+        self.method.extend(other.method)
+        self.endpoint.extend(other.endpoint)
+        self.query_name.extend(other.query_name)
+        self.restpp_return_ms.extend(other.restpp_return_ms)
+        self.restpp_engine.extend(other.restpp_engine)
+        self.return_ts.extend(other.return_ts)
+
+    def take(self, rows: Sequence[int]) -> Self:
+        out = type(self)()
+        for f in fields(self):
+            if not f.init:
+                continue
+            col = getattr(self, f.name)
+            picked = (col[i] for i in rows)
+            setattr(
+                out,
+                f.name,
+                array(col.typecode, picked) if isinstance(col, array) else list(picked),
+            )
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "run": category_column(self.run),
+                "node": category_column(self.node),
+                "ts": datetime_column(self.ts),
+                "tid": int_column(self.tid),
+                "log_path": category_column(self.log_path),
+                "lineno": int_column(self.lineno),
+                "request_id": category_column(self.request_id),
+                "method": category_column(self.method),
+                "endpoint": category_column(self.endpoint),
+                "query_name": category_column(self.query_name),
+                "restpp_return_ms": float_column(self.restpp_return_ms),
+                "restpp_engine": category_column(self.restpp_engine),
+                "return_ts": datetime_column(self.return_ts),
+            }
+        )
@@ -1,21 +1,32 @@
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Self
 
 import pandas as pd
 
-from common.model.constants import RESTPP_GLOB
+from common.model.constants import RESTPP_GLOB, RESTPP_MARKER_TOKENS
 from common.model.types import Node, RequestId, RunId
-from parsers._walker import ParsedLine, LogWalker, walk_logs
+from common.parse.request_id import split_request_id
+from common.support.categorical import align_categories, categorize, category_column
+from common.support.ordering import sort_rows
+from parsers._filter import RequestFilter
+from parsers._walker import (
+    CollectorSink,
+    IngestOptions,
+    LogWalker,
+    ParsedLine,
+    collect_logs_into,
+)
 
 from .decode import classify_msg
 from .records import (
+    CATEGORY_COLS,
     OUT_COLS,
-    RestppRow,
     RestppRawRecord,
     RestppReturnRecord,
     RestppInfoRecord,
 )
-from .rows import make_raw_row, make_return_row
+from .rows import RestppColumns
 
 
 def first_str(s: pd.Series) -> str | None:
@@ -26,20 +37,22 @@ def first_str(s: pd.Series) -> str | None:
 
 
 def aggregate_events(
-    rows: list[RestppRow],
+    events: pd.DataFrame,
     reqinfo: dict[RequestId, dict[str, str]],
 ) -> pd.DataFrame:
-    if not rows:
-        return pd.DataFrame(columns=OUT_COLS)
+    if events.empty:
+        return sort_rows(pd.DataFrame(columns=OUT_COLS), ("run", "restpp_ts"))
 
-    df = pd.DataFrame(rows)
+    df = events
 
     if reqinfo:
         info_df = pd.DataFrame([{"request_id": k, **v} for k, v in reqinfo.items()])
         if not info_df.empty:
+            info_df = categorize(info_df, ["request_id"])
+            df, info_df = align_categories([df, info_df])
             df = df.merge(info_df, on="request_id", how="left")
 
-    agg = df.groupby(["run", "request_id"], as_index=False).agg(
+    agg = df.groupby(["run", "request_id"], as_index=False, observed=True).agg(
         restpp_ts=("ts", "min"),
         restpp_node=("node", "first"),
         endpoint=("endpoint", first_str),
@@ -50,14 +63,36 @@ def aggregate_events(
         restpp_return_ts=("return_ts", "max"),
     )
 
-    agg = agg.reindex(columns=OUT_COLS)
-    agg = agg.set_index(["run", "restpp_ts"]).sort_index().reset_index()
-    return agg.reset_index(drop=True)
+    agg = _with_request_id_parts(agg)
+    agg = categorize(agg.reindex(columns=OUT_COLS), CATEGORY_COLS)
+    return sort_rows(agg, ("run", "restpp_ts"))
+
+
+def _with_request_id_parts(agg: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add rid_seq, rid_instance and rid_epoch_ms (see split_request_id), parsed
+    once per distinct request id and spread by its codes.
+    """
+    rid = agg["request_id"]
+    if not isinstance(rid.dtype, pd.CategoricalDtype):
+        rid = pd.Series(category_column(rid.tolist()), index=agg.index)
+    parts = [split_request_id(str(c)) for c in rid.cat.categories]
+    codes = rid.cat.codes.to_numpy()
+
+    def spread(values: list[int | None]) -> pd.api.extensions.ExtensionArray:
+        return pd.array(values, dtype="Int64").take(codes, allow_fill=True)
+
+    agg["rid_seq"] = spread([p[0] if p else None for p in parts])
+    agg["rid_instance"] = category_column([p[1] if p else None for p in parts]).take(
+        codes, allow_fill=True
+    )
+    agg["rid_epoch_ms"] = spread([p[2] if p else None for p in parts])
+    return agg
 
 
 @dataclass(slots=True)
 class RestppCollector:
-    rows: list[RestppRow] = field(default_factory=list)
+    cols: RestppColumns = field(default_factory=RestppColumns)
     reqinfo: dict[RequestId, dict[str, str]] = field(default_factory=dict)
 
     def on_line(self, pl: ParsedLine) -> None:
@@ -67,15 +102,39 @@ class RestppCollector:
 
         match rec:
             case RestppRawRecord(parsed=raw):
-                self.rows.append(make_raw_row(pl=pl, parsed=raw))
+                self.cols.append_raw(pl=pl, parsed=raw)
             case RestppReturnRecord(parsed=rr):
-                self.rows.append(make_return_row(pl=pl, parsed=rr))
+                self.cols.append_return(pl=pl, parsed=rr)
             case RestppInfoRecord(parsed=info):
                 if info.kv:
                     self.reqinfo.setdefault(info.request_id, {}).update(info.kv)
 
+    def merge(self, other: Self, *, lineno_offset: int = 0) -> None:
+        self.cols.extend(other.cols, lineno_offset=lineno_offset)
+        for request_id, kv in other.reqinfo.items():
+            self.reqinfo.setdefault(request_id, {}).update(kv)
+
     def finalize(self) -> pd.DataFrame:
-        return aggregate_events(self.rows, self.reqinfo)
+        return aggregate_events(self.cols.to_frame(), self.reqinfo)
+
+
+@dataclass(slots=True)
+class FilteredSink:
+    """
+    Sink that hands each file's RestppCollector on to `out` with only the
+    rows of requests `keep` wants (see RequestFilter); parse cache entries
+    stay whole. reqinfo is passed on as is: aggregate_events only joins it
+    onto the kept rows.
+    """
+
+    out: CollectorSink[RestppCollector]
+    keep: RequestFilter
+
+    def merge(self, other: RestppCollector, *, lineno_offset: int = 0) -> None:
+        rows = self.keep.rows(other.cols.run, other.cols.request_id)
+        if rows is not None:
+            other = RestppCollector(cols=other.cols.take(rows), reqinfo=other.reqinfo)
+        self.out.merge(other, lineno_offset=lineno_offset)
 
 
 def parse_restpp(
@@ -83,16 +142,42 @@ def parse_restpp(
     run_dir: Path,
     *,
     nodes: tuple[Node, ...],
-    walker: LogWalker = walk_logs,
+    walker: LogWalker | None = None,
+    options: IngestOptions | None = None,
+    keep: RequestFilter | None = None,
 ) -> pd.DataFrame:
-    collector = RestppCollector()
-
-    walker(
+    """
+    Parse all restpp* logs of a run into one row per request. `keep` drops
+    rows of unwanted requests as each file is merged (see RequestFilter).
+    """
+    out = RestppCollector()
+    sink = out if keep is None else FilteredSink(out, keep)
+
+    if walker is not None:
+        collector = RestppCollector()
+        walker(
+            run_id=run_id,
+            run_dir=run_dir,
+            nodes=nodes,
+            file_glob=RESTPP_GLOB,
+            on_line=collector.on_line,
+            markers=RESTPP_MARKER_TOKENS,
+        )
+        if keep is None:
+            return collector.finalize()
+        sink.merge(collector)
+        return out.finalize()
+
+    collect_logs_into(
+        sink,
         run_id=run_id,
         run_dir=run_dir,
         nodes=nodes,
         file_glob=RESTPP_GLOB,
-        on_line=collector.on_line,
+        new_collector=RestppCollector,
+        collector_type=RestppCollector,
+        cache_tag="restpp",
+        markers=RESTPP_MARKER_TOKENS,
+        options=options,
     )
-
-    return collector.finalize()
+    return out.finalize()
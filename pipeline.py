@@ -1,13 +1,21 @@
+from dataclasses import replace
+
 import pandas as pd
 
 from analysis.bottlenecks import top_bottlenecks
-from analysis.requests import build_exec_request_table, extract_ids, summarize_requests
+from analysis.requests import (
+    build_exec_request_table,
+    extract_ids,
+    request_rollup,
+    summarize_requests,
+)
 from analysis.step_stats import (
     build_ordered_step_side_table,
     compare_two_queries,
     make_step_stats,
 )
 from common.model.config import CompareConfig
+from common.support.categorical import concat_frames
 from common.support.reporting import NullReporter, Reporter
 from common.model.results import (
     LogExtracts,
@@ -15,57 +23,205 @@ from common.model.results import (
     PipelineOutput,
     QueryEvents,
 )
-from common.model.types import RunInput
-from parsers.gpe import parse_gpe
+from common.model.types import QueryName, RunInput
+from parsers import IngestOptions, ParseCache, RequestFilter, TimeWindow
+from parsers.gpe import parse_gpe, parse_gpe_into, with_gpe_text
 from parsers.restpp import parse_restpp
 from transforms.attach import attach_steps_to_requests
+from transforms.fused import FusedGpeSink
 from transforms.gaps import add_query_name, build_gaps
 
 
-def _ingest_logs(runs: tuple[RunInput, ...], nodes: tuple[str, ...]) -> LogExtracts:
-    rest_frames: list[pd.DataFrame] = []
-    gpe_frames: list[pd.DataFrame] = []
+def _parse_cache(cfg: CompareConfig) -> ParseCache | None:
+    if not cfg.use_cache:
+        return None
+    max_bytes = cfg.cache_max_mb * 1024 * 1024
+    if cfg.cache_dir is None:
+        return ParseCache.default(max_bytes=max_bytes)
+    return ParseCache(root=cfg.cache_dir, max_bytes=max_bytes)
+
+
+def _time_window(cfg: CompareConfig) -> TimeWindow | None:
+    if cfg.since is None and cfg.until is None:
+        return None
+    return TimeWindow.between(cfg.since, cfg.until)
+
+
+def _request_filter(
+    rest_requests: pd.DataFrame,
+    keep_queries: tuple[QueryName, ...],
+    sample_rate: float | None,
+) -> RequestFilter | None:
+    """
+    The requests to analyze: those of keep_queries (all when empty), sampled
+    at sample_rate (all when None); None when that is every request.
+    """
+    if not keep_queries and sample_rate is None:
+        return None
+    keep = (
+        RequestFilter.for_queries(rest_requests, keep_queries)
+        if keep_queries
+        else RequestFilter()
+    )
+    return replace(keep, sample_rate=sample_rate)
+
+
+def _request_ids(rest_requests: pd.DataFrame) -> pd.CategoricalDtype | None:
+    """
+    The request id dictionary of the RESTPP frame, shared with the GPE frames.
+    """
+    rid = rest_requests.get("request_id")
+    if rid is None or not isinstance(rid.dtype, pd.CategoricalDtype):
+        return None
+    return rid.dtype
+
 
+def _ingest_logs(
+    runs: tuple[RunInput, ...],
+    nodes: tuple[str, ...],
+    *,
+    options: IngestOptions | None = None,
+    fused: FusedGpeSink | None = None,
+    keep_queries: tuple[QueryName, ...] = (),
+    sample_rate: float | None = None,
+) -> LogExtracts:
+    """
+    With a fused sink, GPE lines are linked into it during ingest and no
+    events frame is built (gpe_events is None), unless some thread's
+    timestamps go backwards: then the events frame is built as without one.
+    RESTPP logs are parsed first: with keep_queries, GPE rows of other
+    queries' requests are dropped while collecting (see RequestFilter).
+    With sample_rate, RESTPP and GPE rows of requests outside the hash
+    sample are dropped alike.
+    """
     for run in runs:
         if not run.path.exists():
             raise FileNotFoundError(f"Run directory not found: {run.path}")
 
-        rest_frames.append(parse_restpp(run.id, run.path, nodes=nodes))
-        gpe_frames.append(parse_gpe(run.id, run.path, nodes=nodes))
-
-    requests = (
-        pd.concat(rest_frames, ignore_index=True) if rest_frames else pd.DataFrame()
+    sample = None if sample_rate is None else RequestFilter(sample_rate=sample_rate)
+    requests = concat_frames(
+        [
+            parse_restpp(run.id, run.path, nodes=nodes, options=options, keep=sample)
+            for run in runs
+        ]
     )
-    events = pd.concat(gpe_frames, ignore_index=True) if gpe_frames else pd.DataFrame()
+    keep = _request_filter(requests, keep_queries, sample_rate)
+    request_ids = _request_ids(requests)
+
+    if fused is not None:
+        for run in runs:
+            parse_gpe_into(
+                fused, run.id, run.path, nodes=nodes, options=options, keep=keep
+            )
+        if not fused.out_of_order:
+            return LogExtracts(rest_requests=requests, gpe_events=None)
+        if options is not None and options.reporter is not None:
+            bad = sorted(fused.out_of_order)
+            run_id, node, tid = bad[0]
+            options.reporter.info(
+                f"WARNING: GPE timestamps go backwards in {len(bad)} thread(s) "
+                f"(first: {run_id}/{node} tid {tid}); "
+                "computing gaps from the full events table instead"
+            )
 
+    events = concat_frames(
+        [
+            parse_gpe(
+                run.id,
+                run.path,
+                nodes=nodes,
+                options=options,
+                keep=keep,
+                request_ids=request_ids,
+            )
+            for run in runs
+        ]
+    )
     return LogExtracts(rest_requests=requests, gpe_events=events)
 
 
-def _process_events(logs: LogExtracts) -> QueryEvents:
+def _wanted(df: pd.DataFrame, keep: RequestFilter | None) -> pd.DataFrame:
+    """
+    Rows of df that belong to a request keep wants (all rows without keep).
+    """
+    if keep is None or df.empty:
+        return df
+    return df.loc[keep.mask(df)].reset_index(drop=True)
+
+
+def _process_events(
+    logs: LogExtracts,
+    fused: FusedGpeSink | None,
+    keep_queries: tuple[QueryName, ...] = (),
+    sample_rate: float | None = None,
+) -> QueryEvents:
+    """
+    With keep_queries or sample_rate, only the wanted requests are analyzed:
+    the boundary rows RequestFilter keeps for other requests are dropped
+    once step rows are attached.
+    """
+    keep = _request_filter(logs.rest_requests, keep_queries, sample_rate)
+
+    if logs.gpe_events is None:
+        if fused is None:
+            raise ValueError("GPE events were not ingested and no fused sink is given")
+        request_ids = _request_ids(logs.rest_requests)
+        gaps = _wanted(fused.gaps_frame(request_ids), keep)
+        timings = add_query_name(gaps, logs.rest_requests)
+        return QueryEvents(
+            linked_events=None,
+            step_timings=timings,
+            request_rollup=_wanted(fused.rollup_frame(request_ids), keep),
+        )
+
     linked = attach_steps_to_requests(logs.gpe_events)
+    if keep is not None:
+        attached = linked["request_id"].notna().to_numpy()
+        linked = linked.loc[keep.mask(linked) | ~attached].reset_index(drop=True)
     raw_gaps = build_gaps(linked)
     timings = add_query_name(raw_gaps, logs.rest_requests)
-    return QueryEvents(linked_events=linked, step_timings=timings)
+    return QueryEvents(
+        linked_events=linked,
+        step_timings=timings,
+        request_rollup=request_rollup(linked),
+    )
 
 
 def _compare_performance(
-    logs: LogExtracts, events: QueryEvents, base_query: str, opt_query: str
+    logs: LogExtracts,
+    events: QueryEvents,
+    base_query: str,
+    opt_query: str,
+    *,
+    quantile_accuracy: float | None = None,
+    sample_rate: float | None = None,
 ) -> PerformanceComparison:
-    req_summary = summarize_requests(logs.rest_requests, events.linked_events)
-    exec_table = build_exec_request_table(logs.rest_requests, events.linked_events)
+    req_summary = summarize_requests(logs.rest_requests, events.request_rollup)
+    exec_table = build_exec_request_table(logs.rest_requests, events.request_rollup)
     base_ids, opt_ids = extract_ids(exec_table, base_query, opt_query)
 
-    step_stats = make_step_stats(events.step_timings)
+    step_stats = make_step_stats(
+        events.step_timings,
+        quantile_accuracy=quantile_accuracy,
+        sample_rate=sample_rate,
+    )
     q_vs_q = compare_two_queries(step_stats, base_query, opt_query)
     side_by_side = build_ordered_step_side_table(
         events.step_timings,
         base_query=base_query,
         opt_query=opt_query,
         step_prefix="Step ",
+        quantile_accuracy=quantile_accuracy,
+        sample_rate=sample_rate,
     )
 
-    bott_base = top_bottlenecks(events.step_timings, base_query, n=50)
-    bott_opt = top_bottlenecks(events.step_timings, opt_query, n=50)
+    # Log text is only read back for the rows that end up in these tables.
+    bott_base = with_gpe_text(
+        top_bottlenecks(events.step_timings, base_query, n=50), raw_msg=False
+    )
+    bott_opt = with_gpe_text(
+        top_bottlenecks(events.step_timings, opt_query, n=50), raw_msg=False
+    )
 
     return PerformanceComparison(
         request_summary=req_summary,
@@ -89,12 +245,44 @@ def run_performance_analysis(
     rep: Reporter = reporter if reporter is not None else NullReporter()
 
     rep.info("1. Ingesting logs...")
-    extracts = _ingest_logs(cfg.runs, cfg.nodes)
+    options = IngestOptions(
+        jobs=cfg.jobs,
+        cache=_parse_cache(cfg),
+        reporter=rep,
+        window=_time_window(cfg),
+    )
+    fused = FusedGpeSink() if cfg.fused_gaps else None
+    keep_queries = (cfg.base_query, cfg.opt_query) if cfg.compared_only else ()
+    extracts = _ingest_logs(
+        cfg.runs,
+        cfg.nodes,
+        options=options,
+        fused=fused,
+        keep_queries=keep_queries,
+        sample_rate=cfg.sample_rate,
+    )
+    if cfg.sample_rate is not None:
+        rep.info(
+            f"   sampled {len(extracts.rest_requests)} requests "
+            f"at rate {cfg.sample_rate:g}"
+        )
 
     rep.info("2. Processing query events...")
-    events = _process_events(extracts)
+    events = _process_events(extracts, fused, keep_queries, cfg.sample_rate)
 
     rep.info("3. Comparing performance...")
-    comparison = _compare_performance(extracts, events, cfg.base_query, cfg.opt_query)
+    comparison = _compare_performance(
+        extracts,
+        events,
+        cfg.base_query,
+        cfg.opt_query,
+        quantile_accuracy=cfg.quantile_accuracy,
+        sample_rate=cfg.sample_rate,
+    )
 
-    return PipelineOutput(extracts=extracts, events=events, comparison=comparison)
+    return PipelineOutput(
+        extracts=extracts,
+        events=events,
+        comparison=comparison,
+        sample_rate=cfg.sample_rate,
+    )
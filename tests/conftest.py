@@ -0,0 +1,13 @@
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """
+    Keep every test's default cache directory out of the user's home.
+    """
+    cache_dir = tmp_path / "user-cache"
+    monkeypatch.setenv("LOGANALYZER_CACHE_DIR", str(cache_dir))
+    return cache_dir
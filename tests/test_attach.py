@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from transforms.attach import attach_steps_to_requests
+
+
+def _reference(gpe_events: pd.DataFrame) -> pd.DataFrame:
+    """
+    The original row-by-row attach loop, per (run, node, tid) in time order.
+    """
+    gpe = (
+        gpe_events.copy()
+        .set_index(["run", "node", "tid", "ts"])
+        .sort_index()
+        .reset_index()
+    )
+    rids = gpe["request_id"].astype(object).to_numpy(copy=True)
+    for sub_idx in gpe.groupby(["run", "node", "tid"], observed=True).indices.values():
+        active_rid: str | None = None
+        for i in sub_idx:
+            ev = gpe.at[i, "event"]
+            rid = rids[i]
+            own = isinstance(rid, str) and bool(rid.strip())
+            if ev == "UDF_START":
+                if own:
+                    active_rid = rid.strip()
+            elif ev == "UDF_STOP":
+                if not own and active_rid is not None:
+                    rids[i] = active_rid
+                active_rid = None
+            elif ev == "STEP" and not own and active_rid is not None:
+                rids[i] = active_rid
+    gpe["request_id"] = rids
+    return gpe
+
+
+def _ids(s: pd.Series) -> list[str | None]:
+    """
+    Request ids as stripped strings, blanks and missing ids as None.
+    """
+    return [
+        v.strip() or None if isinstance(v, str) else None
+        for v in s.astype(object).tolist()
+    ]
+
+
+def _events(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "run": pd.Categorical(rng.choice(["a", "b"], n)),
+            "node": pd.Categorical(rng.choice(["m1", "m2"], n)),
+            "tid": rng.integers(1, 4, n),
+            # few distinct stamps: ties within a thread keep input order
+            "ts": pd.to_datetime(rng.integers(0, 30, n), unit="s"),
+            "event": pd.Categorical(
+                rng.choice(["UDF_START", "STEP", "UDF_STOP", "OTHER"], n)
+            ),
+            "request_id": rng.choice(
+                np.array([None, "", "  ", "r1", " r2 ", "r3"], dtype=object), n
+            ),
+        }
+    )
+
+
+@pytest.mark.parametrize("categorical", [False, True], ids=["object", "categorical"])
+def test_attach_matches_reference_loop(categorical: bool) -> None:
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        df = _events(rng, int(rng.integers(1, 60)))
+        if categorical:
+            df["request_id"] = df["request_id"].astype("category")
+        want = _reference(df)
+        got = attach_steps_to_requests(df)
+
+        cols = ["run", "node", "tid", "ts", "event"]
+        pd.testing.assert_frame_equal(
+            got[cols].reset_index(drop=True), want[cols].reset_index(drop=True)
+        )
+        assert _ids(got["request_id"]) == _ids(want["request_id"])
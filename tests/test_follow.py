@@ -0,0 +1,90 @@
+import shutil
+from pathlib import Path
+
+from analysis.step_stats import RollingStepStats
+from analysis.step_stats.rolling import StepGap
+from common.model.constants import GPE_GLOB, GPE_MARKER_TOKENS
+from follow import _Follower
+from parsers import LogTailer
+
+_HEADER = "Log file created at: 2025/12/19 10:00:00\n"
+
+
+def _request_lines(n: int, *, start_s: int = 0) -> str:
+    out: list[str] = []
+    for i in range(n):
+        s = start_s + i
+        rid = f"{s}.RESTPP_1_1.{1000 + s}.N"
+        stamp = f"I1219 10:{s // 60:02d}:{s % 60:02d}"
+        out.append(f"{stamp}.100000 201 x.cpp:1] Engine Start_RunUDF|{rid}|x\n")
+        out.append(
+            f'{stamp}.200000 201 x.cpp:1] [UDF_q log]  "Step 1  do  thing" : '
+            f"iteration: 1 info {rid}\n"
+        )
+        out.append(f"{stamp}.300000 201 x.cpp:1] Stop_RunUDF|10 ms\n")
+    return "".join(out)
+
+
+def _follow(node_dir: Path) -> tuple[_Follower, LogTailer]:
+    follower = _Follower(stats=RollingStepStats())
+    tailer = LogTailer(
+        run_id="r",
+        run_dir=node_dir.parent,
+        nodes=(node_dir.name,),
+        file_glob=GPE_GLOB,
+        markers=GPE_MARKER_TOKENS,
+    )
+    return follower, tailer
+
+
+def test_rotated_and_copied_files_are_counted_once(tmp_path: Path) -> None:
+    node = tmp_path / "run" / "m1"
+    node.mkdir(parents=True)
+    live = node / "gpe_1.INFO.20251219-100000.1"
+    live.write_text(_HEADER + _request_lines(5))
+
+    follower, tailer = _follow(node)
+    tailer.poll(follower.on_gpe)
+    assert follower.n_gaps == 10
+
+    # rename-style rotation: the old file moves, a new one takes over
+    live.rename(node / "gpe_0.INFO.20251219-100000.1")
+    live.write_text(_HEADER + _request_lines(3, start_s=100))
+    tailer.poll(follower.on_gpe)
+    assert follower.n_gaps == 16
+
+    # copy-style rotation: a second copy of a file already followed
+    shutil.copy(live, node / "gpe_1.INFO.20251219-100000.1.bak")
+    tailer.poll(follower.on_gpe)
+    assert follower.n_gaps == 16
+
+    # the next file starts with the last requests of the one before it
+    (node / "gpe_1.INFO.20251219-110000.2").write_text(
+        _HEADER + _request_lines(5, start_s=98)
+    )
+    tailer.poll(follower.on_gpe)
+    assert follower.n_gaps == 20
+
+
+def _gap(rid: str, ts_s: int) -> StepGap:
+    return StepGap(
+        run="r",
+        node="m1",
+        tid=1,
+        request_id=rid,
+        ts_ns=ts_s * 10**9,
+        event="STEP",
+        step_key="Step 1",
+        iteration=None,
+        gap_ms=1.0,
+    )
+
+
+def test_pending_gaps_are_evicted_by_age_and_window() -> None:
+    stats = RollingStepStats(window=3, pending_s=60.0)
+    for i in range(10):
+        stats.add(_gap("slow", i))
+    assert len(stats._pending[("r", "slow")]) == 3
+
+    stats.add(_gap("late", 1000))
+    assert list(stats._pending) == [("r", "late")]
@@ -0,0 +1,49 @@
+from dataclasses import replace
+from pathlib import Path
+
+from parsers.gpe import parse_gpe, with_gpe_text
+from parsers.gpe.decode import DecodedGpe, decode_msg
+from parsers.gpe.records import GpeStepRecord
+
+_LINES = (
+    "Log file created at: 2025/12/19 10:00:00\n"
+    "I1219 10:00:00.100000 201 x.cpp:1] Engine Start_RunUDF|7.RESTPP_1_1.1.N|x\n"
+    'I1219 10:00:00.200000 201 x.cpp:1] [UDF_q log]  "Step 1  do  thing" : '
+    "iteration: 1 info 7.RESTPP_1_1.1.N\n"
+    "I1219 10:00:00.300000 201 x.cpp:1] Stop_RunUDF|10 ms\n"
+)
+
+
+def _normalizing_decoder(msg: str) -> DecodedGpe | None:
+    """
+    decode_msg, with step details whitespace-collapsed and upper-cased: a
+    detail that is no longer a suffix of the message.
+    """
+    dec = decode_msg(msg)
+    if dec is None or not isinstance(dec.record, GpeStepRecord):
+        return dec
+    step = dec.record.parsed
+    detail = " ".join(step.detail.split()).upper()
+    return replace(dec, record=GpeStepRecord(parsed=replace(step, detail=detail)))
+
+
+def _write_run(root: Path) -> Path:
+    node = root / "m1"
+    node.mkdir(parents=True)
+    (node / "gpe_1.INFO.20251219-100000.1").write_text(_LINES)
+    return root
+
+
+def test_detail_that_is_not_a_suffix_is_kept_as_text(tmp_path: Path) -> None:
+    run_dir = _write_run(tmp_path / "run")
+    plain = with_gpe_text(parse_gpe("r", run_dir, nodes=("m1",)))
+    custom = with_gpe_text(
+        parse_gpe("r", run_dir, nodes=("m1",), decoder=_normalizing_decoder)
+    )
+
+    assert len(custom) == len(plain) == 3
+    step = plain["event"] == "STEP"
+    want = [" ".join(d.split()).upper() for d in plain.loc[step, "detail"]]
+    assert custom.loc[step, "detail"].tolist() == want
+    assert custom.loc[~step, "detail"].tolist() == plain.loc[~step, "detail"].tolist()
+    assert "detail_text" not in custom.columns
@@ -0,0 +1,274 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from common.model.config import CompareConfig
+from common.model.results import PipelineOutput
+from common.model.types import RunInput
+from parsers import IngestOptions, ParseCache, TimeWindow
+from parsers.gpe import parse_gpe
+from parsers.gpe.records import GPE_DEDUPE_SUBSET
+from parsers.restpp import parse_restpp
+from pipeline import run_performance_analysis
+from transforms.attach import attach_steps_to_requests
+from transforms.gaps import add_query_name, build_gaps
+
+NODES = ("m1", "m2")
+_HEADER = "Log file created at: 2025/12/19 10:00:00\n"
+_GPE_1 = "gpe_1.INFO.20251219-100000.1"
+_GPE_2 = "gpe_1.INFO.20251219-110000.2"
+
+
+def _line(us: int, tid: int, msg: str) -> str:
+    s, f = divmod(us, 1_000_000)
+    return f"I1219 {s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}.{f:06d} {tid} x.cpp:1] {msg}\n"
+
+
+def _requests(rnd: random.Random, n: int, *, start: int) -> tuple[list[str], list[str]]:
+    """
+    RESTPP and GPE lines of n requests, starting at request number start.
+    """
+    rest: list[str] = []
+    gpe: list[str] = []
+    t = 10 * 3600 * 1_000_000 + start * 10_000
+    for i in range(start, start + n):
+        q = rnd.choice(["qbase", "qopt", "qother"])
+        rid = f"{1000 + i}.RESTPP_1_1.{1766138400000 + i * 137}.N"
+        t += rnd.randint(100, 5000)
+        rtid = rnd.randint(100, 104)
+        rest.append(_line(t, rtid, f"RawRequest|,{rid},x|GET|/query/g1/{q}?a=1|foo"))
+        rest.append(_line(t + 1, rtid, f"RequestInfo|,{rid},graph_name:g1|other:1"))
+        gtid = rnd.randint(200, 203)
+        gt = t + 50
+        gpe.append(_line(gt, gtid, f"Engine Start_RunUDF|{rid}|x"))
+        for s in range(rnd.randint(1, 4)):
+            for it in range(rnd.randint(1, 2)):
+                gt += rnd.randint(10, 3000)
+                own = f" {rid}" if rnd.random() < 0.3 else ""
+                gpe.append(
+                    _line(
+                        gt,
+                        gtid,
+                        f'[UDF_{q} log]  "Step {s}  do  thing" : iteration: {it} info{own}',
+                    )
+                )
+        gt += rnd.randint(10, 300)
+        gpe.append(_line(gt, gtid, f"Stop_RunUDF|{(gt - t) // 1000} ms"))
+        rest.append(
+            _line(gt + 100, rtid, f"ReturnResult|0|{(gt - t) // 1000}ms|GPE|{rid}|x")
+        )
+    return rest, gpe
+
+
+def _write_run(
+    root: Path, *, n: int = 120, seed: int = 0, gpe_in_order: bool = False
+) -> Path:
+    """
+    Per node: one RESTPP file, a GPE file rotated into .1/.2 with 20 lines
+    repeated across the rotation, and a byte-identical copy of .1.
+    Requests overlap on GPE threads unless gpe_in_order sorts the lines by time.
+    """
+    rnd = random.Random(seed)
+    for node in NODES:
+        d = root / node
+        d.mkdir(parents=True)
+        rest, gpe = _requests(rnd, n, start=0)
+        rest.sort(key=lambda line: line[:21])
+        if gpe_in_order:
+            gpe.sort(key=lambda line: line[:21])
+        (d / "restpp_1.INFO.20251219-100000.1").write_text(_HEADER + "".join(rest))
+        half = len(gpe) // 2
+        first = _HEADER + "".join(gpe[: half + 20])
+        (d / _GPE_1).write_text(first)
+        (d / _GPE_2).write_text(_HEADER + "".join(gpe[half:]))
+        (d / "gpe_1.INFO.copy").write_text(first)
+    return root
+
+
+def _append(root: Path, *, n: int = 30, start: int = 10_000) -> None:
+    rnd = random.Random(start)
+    for node in NODES:
+        rest, gpe = _requests(rnd, n, start=start)
+        with open(root / node / "restpp_1.INFO.20251219-100000.1", "a") as f:
+            f.write("".join(rest))
+        with open(root / node / _GPE_2, "a") as f:
+            f.write("".join(gpe))
+
+
+def _parse(
+    run_dir: Path, options: IngestOptions | None = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    rest = parse_restpp("r", run_dir, nodes=NODES, options=options)
+    gpe = parse_gpe("r", run_dir, nodes=NODES, options=options)
+    return rest, gpe
+
+
+def _assert_same(got: tuple[pd.DataFrame, ...], want: tuple[pd.DataFrame, ...]) -> None:
+    for a, b in zip(got, want, strict=True):
+        pd.testing.assert_frame_equal(a, b)
+
+
+@pytest.fixture
+def run_dir(tmp_path: Path) -> Path:
+    return _write_run(tmp_path / "run")
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        pytest.param(IngestOptions(jobs=2), id="jobs"),
+        pytest.param(IngestOptions(jobs=3), id="more-jobs"),
+        pytest.param(IngestOptions(jobs=3, range_bytes=2048), id="ranges"),
+        pytest.param(IngestOptions(jobs=1, range_bytes=2048), id="serial-ranges"),
+    ],
+)
+def test_parallel_parse_matches_serial(run_dir: Path, options: IngestOptions) -> None:
+    want = _parse(run_dir, IngestOptions(jobs=1))
+    assert len(want[1]) > 0
+    _assert_same(_parse(run_dir, options), want)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_cached_parse_matches_uncached(
+    run_dir: Path, tmp_path: Path, jobs: int
+) -> None:
+    cached = IngestOptions(jobs=jobs, cache=ParseCache(root=tmp_path / "cache"))
+    want = _parse(run_dir)
+
+    _assert_same(_parse(run_dir, cached), want)  # cold
+    _assert_same(_parse(run_dir, cached), want)  # warm
+
+    entries = list((tmp_path / "cache").glob("*.pkl"))
+    assert entries
+    for p in entries:
+        p.write_bytes(p.read_bytes()[:100])
+    _assert_same(_parse(run_dir, cached), want)  # truncated entries are misses
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_appended_tails_match_a_full_parse(
+    run_dir: Path, tmp_path: Path, jobs: int
+) -> None:
+    cached = IngestOptions(jobs=jobs, cache=ParseCache(root=tmp_path / "cache"))
+    _parse(run_dir, cached)
+
+    _append(run_dir)
+    want = _parse(run_dir)
+    _assert_same(_parse(run_dir, cached), want)
+    # and once more, over the extended entries
+    _append(run_dir, start=20_000)
+    _assert_same(_parse(run_dir, cached), _parse(run_dir))
+
+
+def test_file_years_are_stored_only_with_a_parse_cache(
+    run_dir: Path, tmp_path: Path
+) -> None:
+    _parse(run_dir)
+    _parse(run_dir, IngestOptions(jobs=2))
+    assert not list(tmp_path.glob("**/*.json"))
+
+    _parse(run_dir, IngestOptions(cache=ParseCache(root=tmp_path / "cache")))
+    assert [p.name for p in tmp_path.glob("**/*.json")] == ["file_years.json"]
+
+
+@dataclass(slots=True)
+class _Messages:
+    lines: list[str] = field(default_factory=list)
+
+    def info(self, msg: str) -> None:
+        self.lines.append(msg)
+
+
+def test_overlap_skipping_keeps_the_same_rows(run_dir: Path) -> None:
+    messages = _Messages()
+    skipped = _parse(run_dir, IngestOptions(skip_overlaps=True, reporter=messages))
+    _assert_same(skipped, _parse(run_dir, IngestOptions(skip_overlaps=False)))
+    for node in NODES:
+        assert any(f"{node}/gpe_1.INFO.copy" in line for line in messages.lines)
+
+    gpe = skipped[1]
+    paths = gpe["log_path"].astype(str)
+    assert paths.str.endswith(_GPE_2).any()
+    assert not paths.str.endswith(".copy").any()
+    # the lines repeated across the rotation are kept once
+    assert not gpe.duplicated(GPE_DEDUPE_SUBSET).any()
+
+
+def test_empty_window_keeps_the_column_order(run_dir: Path) -> None:
+    late = TimeWindow.between(datetime(2025, 12, 20), None)
+    rest, gpe = _parse(run_dir, IngestOptions(window=late))
+    want_rest, want_gpe = _parse(run_dir)
+    assert rest.empty and gpe.empty
+    assert list(rest.columns) == list(want_rest.columns)
+    # GPE rows come typed as well (categoricals, just without categories)
+    assert list(gpe.dtypes.astype(str).items()) == list(
+        want_gpe.dtypes.astype(str).items()
+    )
+
+
+@pytest.mark.parametrize("in_order", [True, False])
+def test_fused_gaps_match_batch_gaps(tmp_path: Path, in_order: bool) -> None:
+    run_dir = _write_run(tmp_path / "run", gpe_in_order=in_order)
+
+    def analyze(fused: bool, reporter: _Messages | None = None) -> PipelineOutput:
+        cfg = CompareConfig(
+            runs=(RunInput("r", run_dir),),
+            nodes=NODES,
+            base_query="qbase",
+            opt_query="qopt",
+            use_cache=False,
+            fused_gaps=fused,
+        )
+        return run_performance_analysis(cfg, reporter=reporter)
+
+    messages = _Messages()
+    fused = analyze(True, messages)
+    batch = analyze(False)
+    warned = any("go backwards" in line for line in messages.lines)
+    # out-of-order threads make the fused path fall back to the events table
+    assert warned is not in_order
+    assert (fused.extracts.gpe_events is None) is in_order
+    # (the batch step_key categories also hold labels without gaps)
+    pd.testing.assert_frame_equal(
+        fused.comparison.step_statistics,
+        batch.comparison.step_statistics,
+        check_categorical=False,
+    )
+
+
+def test_request_code_joins_match_string_joins(run_dir: Path) -> None:
+    rest = parse_restpp("r", run_dir, nodes=NODES)
+    first = rest.sort_values("restpp_ts").iloc[0]
+    assert (first["rid_seq"], first["rid_instance"], first["rid_epoch_ms"]) == (
+        1000,
+        "RESTPP_1_1",
+        1766138400000,
+    )
+    # a GPE-only id extends the RESTPP dictionary instead of being dropped
+    rest = rest.loc[rest["request_id"] != rest["request_id"].iloc[0]].copy()
+    rest["request_id"] = rest["request_id"].cat.remove_unused_categories()
+    coded = parse_gpe("r", run_dir, nodes=NODES, request_ids=rest["request_id"].dtype)
+    cats = set(coded["request_id"].cat.categories)
+    assert set(rest["request_id"].cat.categories) < cats
+
+    def joined(gpe: pd.DataFrame, req: pd.DataFrame) -> pd.DataFrame:
+        out = add_query_name(build_gaps(attach_steps_to_requests(gpe)), req)
+        return out.astype({c: object for c in ("run", "request_id", "query_name")})
+
+    plain = parse_gpe("r", run_dir, nodes=NODES)
+    strings = {"run": object, "request_id": object}
+    want = joined(plain.astype(strings), rest.astype(strings))
+    got = joined(coded, rest)
+
+    assert want["query_name"].notna().any() and want["query_name"].isna().any()
+    cols = ["run", "node", "tid", "ts", "request_id", "gap_ms", "query_name"]
+    pd.testing.assert_frame_equal(
+        got[cols].reset_index(drop=True),
+        want[cols].reset_index(drop=True),
+        check_dtype=False,
+        check_categorical=False,
+    )
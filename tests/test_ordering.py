@@ -0,0 +1,69 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.support.ordering import is_sorted, sort_rows, sorted_by
+
+KEYS = ("run", "node", "ts")
+
+
+def _frame(n: int = 500, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ts = rng.integers(0, 50, n).astype("datetime64[s]").astype("datetime64[ns]")
+    ts[rng.random(n) < 0.05] = np.datetime64("NaT", "ns")
+    return pd.DataFrame(
+        {
+            "run": pd.Categorical(rng.choice(["b", "a"], n), categories=["b", "a"]),
+            "node": rng.choice(["m1", "m2", "m3"], n).astype(object),
+            "ts": ts,
+            "x": np.arange(n),
+        }
+    )
+
+
+def _reference(df: pd.DataFrame, keys: tuple[str, ...]) -> pd.DataFrame:
+    return df.set_index(list(keys)).sort_index(kind="stable").reset_index()
+
+
+def test_sort_rows_matches_sort_index() -> None:
+    df = _frame()
+    out = sort_rows(df, KEYS)
+    pd.testing.assert_frame_equal(out, _reference(df, KEYS))
+    assert sorted_by(out) == KEYS
+
+
+def test_sort_rows_by_longer_keys_after_prefix_sort() -> None:
+    df = sort_rows(_frame(), ("run", "node"))
+    pd.testing.assert_frame_equal(sort_rows(df, KEYS), _reference(df, KEYS))
+
+
+def _reassign(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(ts=df["ts"].to_numpy()[::-1])
+
+
+def _reverse_reindex(df: pd.DataFrame) -> pd.DataFrame:
+    return df.iloc[::-1].reset_index(drop=True)
+
+
+def _shuffle(df: pd.DataFrame) -> pd.DataFrame:
+    return df.sample(frac=1.0, random_state=1)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        pytest.param(_reassign, id="reassign"),
+        pytest.param(_reverse_reindex, id="reverse-reindex"),
+        pytest.param(_shuffle, id="shuffle"),
+    ],
+)
+def test_stale_sort_record_is_not_trusted(
+    mutate: Callable[[pd.DataFrame], pd.DataFrame],
+) -> None:
+    df = mutate(sort_rows(_frame(), KEYS))
+    assert df.attrs.get("sorted_by") == KEYS
+    assert sorted_by(df) == ()
+    assert not is_sorted(df, KEYS)
+    pd.testing.assert_frame_equal(sort_rows(df, KEYS), _reference(df, KEYS))
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.step_stats import StepPartial, merge_partials, step_partials
+
+KEYS = ["query_name", "step_key"]
+
+
+def _gaps(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    gap_ms = rng.lognormal(0, 3, n)
+    gap_ms[rng.random(n) < 0.05] = np.nan
+    gap_ms[rng.random(n) < 0.05] = 0.0
+    gap_ms[rng.random(n) < 0.05] *= -1
+    return pd.DataFrame(
+        {
+            "query_name": pd.Categorical(rng.choice(["qa", "qb"], n)),
+            "step_key": rng.choice(
+                np.array(["Step 1", "Step 2", None], dtype=object), n
+            ),
+            "log_path": rng.choice(["a.1", "a.2", "b.1", "c.1"], n),
+            "gap_ms": gap_ms,
+        }
+    )
+
+
+def _assert_same(got: StepPartial, want: StepPartial) -> None:
+    assert (got.n, got.max_ms) == (want.n, want.max_ms)
+    assert got.sum_ms == pytest.approx(want.sum_ms)
+    for attr in ("count", "zero_count", "bins", "neg_bins"):
+        assert getattr(got.sketch, attr) == getattr(want.sketch, attr)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_merged_file_partials_match_one_partial(seed: int) -> None:
+    gaps = _gaps(3000, seed)
+    want = step_partials(gaps, KEYS)
+    got = merge_partials(
+        step_partials(chunk, KEYS) for _, chunk in gaps.groupby("log_path")
+    )
+    assert got.keys() == want.keys()
+    for key, part in want.items():
+        _assert_same(got[key], part)
+        assert got[key].stats() == pytest.approx(part.stats(), nan_ok=True)
+
+
+def test_partial_bytes_round_trip() -> None:
+    parts = step_partials(_gaps(3000, 0), KEYS, relative_accuracy=0.02)
+    for part in parts.values():
+        back = StepPartial.from_bytes(part.to_bytes())
+        _assert_same(back, part)
+        assert back.sum_ms == part.sum_ms
+        assert back.sketch.relative_accuracy == 0.02
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from common.support.stats import group_percentiles
+
+PS = (0, 37.5, 50, 95, 100)
+
+
+def _expected(values: np.ndarray, groups: np.ndarray, ngroups: int) -> np.ndarray:
+    out = np.full((len(PS), ngroups), np.nan)
+    for g in range(ngroups):
+        x = values[groups == g]
+        x = x[~np.isnan(x)]
+        if len(x):
+            out[:, g] = np.percentile(x, PS)
+    return out
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_group_percentiles_match_np_percentile(seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    for _ in range(200):
+        n = int(rng.integers(0, 80))
+        ngroups = int(rng.integers(1, 8))
+        # few distinct values (ties), NaN values and extremes
+        values = rng.choice([np.nan, -3.5, 0.0, 1.0, 1.0, 2.5, 1e300], n)
+        values[rng.random(n) < 0.5] = rng.random() * 100
+        groups = rng.integers(-1, ngroups, n).astype(np.float64)
+        groups[rng.random(n) < 0.05] = np.nan
+
+        got = np.array(group_percentiles(values, groups, ngroups, PS))
+        np.testing.assert_array_equal(got, _expected(values, groups, ngroups))
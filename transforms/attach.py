@@ -1,45 +1,77 @@
+import numpy as np
 import pandas as pd
 
+from common.support.categorical import category_column, from_codes
+from common.support.ordering import sort_rows
+
+
+def _request_codes(rid: pd.Series) -> tuple[np.ndarray, pd.CategoricalDtype]:
+    """
+    request_id as codes into sorted categories of stripped ids (-1 for
+    missing or blank), so ids are compared and copied as integers.
+    """
+    if isinstance(rid.dtype, pd.CategoricalDtype):
+        dtype, codes = rid.dtype, rid.cat.codes.to_numpy()
+    else:
+        cat = category_column(rid.tolist())
+        dtype, codes = cat.dtype, np.asarray(cat.codes)
+    cats = dtype.categories
+    stripped = cats.astype(str).str.strip()
+    if stripped.equals(cats) and not (stripped == "").any():
+        return codes, dtype
+
+    # blank ids, or ids with surrounding blanks: codes of their stripped form
+    kept = pd.Index(sorted(set(stripped) - {""}), dtype=object)
+    remap = np.append(kept.get_indexer(stripped), -1)
+    return remap[codes], pd.CategoricalDtype(kept)
+
 
 def attach_steps_to_requests(gpe_events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill in request_id for STEP/UDF_STOP rows that lack one, per (run, node, tid)
+    in time order: such rows belong to the request opened by the latest
+    UDF_START carrying a request id, until a UDF_STOP closes it.
+    Rows are cut into segments that begin at each thread's first row, at every
+    such UDF_START and right after every UDF_STOP; a segment's active request
+    is the id of the UDF_START it begins with (none otherwise).
+    """
     if gpe_events.empty:
         return gpe_events.copy()
 
-    gpe = (
-        gpe_events.copy()
-        .set_index(["run", "node", "tid", "ts"])
-        .sort_index()
-        .reset_index()
-    )
-
-    gpe["request_id_attached"] = gpe["request_id"]
-
-    for key, sub_idx in gpe.groupby(["run", "node", "tid"]).groups.items():
-        # narrow the key just to satisfy typing; we don't use it
-        if not isinstance(key, tuple) or len(key) != 3:
-            continue
-
-        active_rid: str | None = None
-        for i in sub_idx:
-            ev = gpe.at[i, "event"]
-            rid = gpe.at[i, "request_id_attached"]
-
-            if ev == "UDF_START":
-                if isinstance(rid, str) and rid.strip():
-                    active_rid = rid.strip()
-
-            elif ev == "UDF_STOP":
-                if (not isinstance(rid, str) or not rid.strip()) and isinstance(
-                    active_rid, str
-                ):
-                    gpe.at[i, "request_id_attached"] = active_rid
-                active_rid = None
-
-            elif ev == "STEP":
-                if (not isinstance(rid, str) or not rid.strip()) and isinstance(
-                    active_rid, str
-                ):
-                    gpe.at[i, "request_id_attached"] = active_rid
-
-    gpe["request_id"] = gpe["request_id_attached"]
-    return gpe.drop(columns=["request_id_attached"])
+    gpe = sort_rows(gpe_events, ("run", "node", "tid", "ts"))
+
+    event = gpe["event"]
+    is_start = (event == "UDF_START").to_numpy()
+    is_stop = (event == "UDF_STOP").to_numpy()
+    is_step = (event == "STEP").to_numpy()
+
+    codes, dtype = _request_codes(gpe["request_id"])
+    has_rid = codes >= 0
+    opens = is_start & has_rid
+
+    thread = gpe.groupby(["run", "node", "tid"], observed=True, sort=False).ngroup()
+    thread_codes = thread.to_numpy()
+    new_thread = np.r_[True, thread_codes[1:] != thread_codes[:-1]]
+    after_stop = np.r_[False, is_stop[:-1]]
+
+    boundary = new_thread | opens | after_stop
+    segment = np.cumsum(boundary) - 1
+    seg_first = np.flatnonzero(boundary)
+
+    active = np.where(opens, codes, -1)[seg_first][segment]
+    fill = (is_step | is_stop) & ~has_rid & (active >= 0) & (thread_codes >= 0)
+
+    if fill.any():
+        rid = gpe["request_id"]
+        if isinstance(rid.dtype, pd.CategoricalDtype) and rid.cat.categories.equals(
+            dtype.categories
+        ):
+            filled = rid.cat.codes.to_numpy().copy()
+            filled[fill] = active[fill]
+            gpe["request_id"] = from_codes(filled, rid.dtype)
+        else:
+            # other ids are kept as they were, blanks included
+            out_rid = rid.to_numpy(dtype=object, copy=True)
+            out_rid[fill] = dtype.categories.to_numpy()[active[fill]]
+            gpe["request_id"] = category_column(out_rid)
+    return gpe
@@ -0,0 +1,165 @@
+from array import array
+from dataclasses import dataclass, field
+from math import isnan, nan
+
+import pandas as pd
+
+from analysis.requests.columns import GPE_REQUEST_ROLLUP_COLS
+from common.model.constants import GPE_UDF_START, GPE_UDF_STOP
+from common.model.types import Node, RequestId, RunId
+from common.support.categorical import category_column
+from common.support.ordering import sort_rows
+from common.support.stats import span_ms
+from parsers.dfutils import NAT_NS, datetime_column
+from parsers.gpe import GpeCollector
+from parsers.gpe.rows import GpeColumns
+
+from .gaps import GAPS_COLS, step_keys
+from .stream import StreamLinker
+
+
+@dataclass(slots=True)
+class _RequestSpan:
+    node: Node
+    first_ts: int
+    last_ts: int
+    start_ts: int = NAT_NS
+    stop_ts: int = NAT_NS
+    udf_ms: float = nan
+
+    def add(self, node: Node, ts: int, event: str, udf_ms: float) -> None:
+        self.node = min(self.node, node)
+        self.first_ts = min(self.first_ts, ts)
+        self.last_ts = max(self.last_ts, ts)
+        if event == GPE_UDF_START:
+            self.start_ts = ts if self.start_ts == NAT_NS else min(self.start_ts, ts)
+        elif event == GPE_UDF_STOP:
+            self.stop_ts = max(self.stop_ts, ts)
+            if not isnan(udf_ms) and (isnan(self.udf_ms) or udf_ms > self.udf_ms):
+                self.udf_ms = udf_ms
+
+
+@dataclass(slots=True)
+class FusedGpeSink:
+    """
+    attach_steps_to_requests + build_gaps + request_rollup fused into the
+    ingest: collect_logs_into (see parse_gpe_into) hands over each file's
+    GpeCollector in walk order, every row is linked to its request on
+    arrival (StreamLinker), and only gap rows, with their previous boundary,
+    and one span per request are kept; the events frame is never built.
+    Rows repeated across files are dropped as GpeCollector's "stream" dedupe
+    does. Results equal the batch transforms when each thread's lines arrive
+    in time order, as glog writes them and rotated files sort by name; threads
+    whose timestamps go backwards are listed in out_of_order, and the caller
+    should then fall back to the batch transforms.
+    """
+
+    linker: StreamLinker = field(default_factory=lambda: StreamLinker(max_keys=None))
+    gaps: GpeColumns = field(default_factory=GpeColumns)
+    prev_ts: array[int] = field(default_factory=lambda: array("q"))
+    prev_event: list[str] = field(default_factory=list)
+    prev_label: list[str] = field(default_factory=list)
+    requests: dict[tuple[RunId, RequestId], _RequestSpan] = field(default_factory=dict)
+    out_of_order: set[tuple[RunId, Node, int]] = field(default_factory=set)
+
+    _seen: set[tuple[RunId, str, int, int, int]] = field(
+        default_factory=set, init=False, repr=False
+    )
+    _last_ts: dict[tuple[RunId, Node, int], int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def merge(self, other: GpeCollector, *, lineno_offset: int = 0) -> None:
+        cols = other.cols
+        seen, linker, requests = self._seen, self.linker, self.requests
+        last_ts = self._last_ts
+        rows: list[int] = []
+        rids: list[RequestId] = []
+
+        for i in range(len(cols)):
+            run, node, tid, ts = cols.run[i], cols.node[i], cols.tid[i], cols.ts[i]
+            key = (run, node, tid, ts, cols.msg_hash[i])
+            if key in seen:
+                continue
+            seen.add(key)
+            thread = (run, node, tid)
+            if ts < last_ts.get(thread, ts):
+                self.out_of_order.add(thread)
+            else:
+                last_ts[thread] = ts
+
+            event = cols.event[i]
+            rid = linker.attach(
+                run=run, node=node, tid=tid, request_id=cols.request_id[i], event=event
+            )
+            if rid is None:
+                continue
+
+            span = requests.get((run, rid))
+            if span is None:
+                span = requests[(run, rid)] = _RequestSpan(node, ts, ts)
+            span.add(node, ts, event, cols.udf_ms[i])
+
+            prev = linker.advance((run, node, rid, tid), (ts, event, cols.label[i]))
+            if prev is None:
+                continue
+            rows.append(i)
+            rids.append(rid)
+            self.prev_ts.append(prev[0])
+            self.prev_event.append(prev[1])
+            self.prev_label.append(prev[2])
+
+        if rows:
+            start = len(self.gaps)
+            self.gaps.extend(cols, lineno_offset=lineno_offset, rows=rows)
+            self.gaps.request_id[start:] = rids
+
+    def gaps_frame(
+        self, request_ids: pd.CategoricalDtype | None = None
+    ) -> pd.DataFrame:
+        """
+        The gap rows, shaped and ordered like build_gaps(attach_steps_to_requests(events)).
+        request_ids: as in GpeColumns.to_frame.
+        """
+        if not len(self.gaps):
+            return pd.DataFrame(columns=GAPS_COLS)
+
+        df = self.gaps.to_frame(request_ids)
+        df["prev_ts"] = datetime_column(self.prev_ts)
+        df["prev_event"] = category_column(self.prev_event)
+        df["prev_label"] = category_column(self.prev_label)
+        df["gap_ms"] = span_ms(df["ts"], df["prev_ts"])
+        df["step_key"] = step_keys(df["label"])
+        return sort_rows(df, ("run", "node", "request_id", "tid", "ts"))
+
+    def rollup_frame(
+        self, request_ids: pd.CategoricalDtype | None = None
+    ) -> pd.DataFrame:
+        """
+        Per-request spans, shaped and ordered like request_rollup(linked events).
+        request_ids: as in GpeColumns.to_frame.
+        """
+        if not self.requests:
+            return pd.DataFrame(columns=GPE_REQUEST_ROLLUP_COLS)
+
+        keys = sorted(self.requests)
+        spans = [self.requests[k] for k in keys]
+        ts = {
+            name: datetime_column(array("q", (getattr(s, attr) for s in spans)))
+            for name, attr in (
+                ("first_seen_gpe_ts", "first_ts"),
+                ("last_seen_gpe_ts", "last_ts"),
+                ("start_udf_ts", "start_ts"),
+                ("stop_udf_ts", "stop_ts"),
+            )
+        }
+        return pd.DataFrame(
+            {
+                "run": category_column([run for run, _ in keys]),
+                "request_id": category_column([rid for _, rid in keys], request_ids),
+                "gpe_node": category_column([s.node for s in spans]),
+                **ts,
+                "reported_stop_udf_ms": [s.udf_ms for s in spans],
+            },
+            columns=GPE_REQUEST_ROLLUP_COLS,
+        )
@@ -1,7 +1,11 @@
 import pandas as pd
 
+from common.support.categorical import align_categories, from_codes
+from common.support.ordering import sort_rows
+from common.support.stats import span_ms
 
-_EMPTY_GAPS_COLS = pd.Index(
+# Columns of the build_gaps frame, in order.
+GAPS_COLS = pd.Index(
     [
         "run",
         "node",
@@ -12,13 +16,17 @@ _EMPTY_GAPS_COLS = pd.Index(
         "label",
         "iteration",
         "udf",
-        "detail",
+        "detail_len",
+        "detail_text",
         "gap_ms",
         "prev_ts",
         "prev_event",
         "prev_label",
         "log_path",
         "lineno",
+        "line_offset",
+        "msg_len",
+        "msg_hash",
         "step_key",
     ]
 )
@@ -35,65 +43,78 @@ def _as_df(x: object) -> pd.DataFrame | None:
     return x if isinstance(x, pd.DataFrame) else None
 
 
+def step_keys(labels: pd.Series) -> pd.Series:
+    """
+    Whitespace-normalized labels, computed once per distinct label and kept categorical.
+    """
+    cat = labels.astype("category")
+    keys = (
+        cat.cat.categories.astype(str).str.replace(r"\s+", " ", regex=True).str.strip()
+    )
+    uniq = pd.Index(keys.unique()).sort_values()
+    remap = uniq.get_indexer(keys)
+    codes = cat.cat.codes.to_numpy()
+    step_codes = remap.take(codes, mode="clip")
+    step_codes[codes < 0] = -1
+    return pd.Series(
+        from_codes(step_codes, pd.CategoricalDtype(uniq)), index=labels.index
+    )
+
+
 def build_gaps(gpe_events: pd.DataFrame) -> pd.DataFrame:
     """
     Compute gap_ms between consecutive UDF boundary logs within (run,node,tid,request_id).
     """
     if gpe_events.empty:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
     event_s = _get_series(gpe_events, "event")
     if event_s is None:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
     mask_events = event_s.isin(("UDF_START", "STEP", "UDF_STOP"))
     core0 = _as_df(gpe_events.loc[mask_events].copy())
     if core0 is None or core0.empty:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
     request_id_s = _get_series(core0, "request_id")
     if request_id_s is None:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
     # Avoid Series.notna() (pyright sometimes thinks request_id_s is ndarray); use pd.notna
     core1 = _as_df(core0.loc[pd.notna(request_id_s)].copy())
     if core1 is None or core1.empty:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
-    # Typed-friendly multi-key ordering without sort_values(list[str])
-    core2 = _as_df(
-        core1.set_index(["run", "node", "request_id", "tid", "ts"])
-        .sort_index()
-        .reset_index()
-    )
-    if core2 is None or core2.empty:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+    # Frames from attach_steps_to_requests are sorted by (run, node, tid, ts):
+    # sort_rows then only regroups each (run, node)'s rows per request.
+    core2 = sort_rows(core1, ("run", "node", "request_id", "tid", "ts"))
 
     grp_cols = ["run", "node", "request_id", "tid"]
 
-    core2["prev_ts"] = core2.groupby(grp_cols)["ts"].shift(1)
-    core2["prev_event"] = core2.groupby(grp_cols)["event"].shift(1)
-    core2["prev_label"] = core2.groupby(grp_cols)["label"].shift(1)
+    grp = core2.groupby(grp_cols, observed=True)
+    core2["prev_ts"] = grp["ts"].shift(1)
+    core2["prev_event"] = grp["event"].shift(1)
+    core2["prev_label"] = grp["label"].shift(1)
 
     ts_s = _get_series(core2, "ts")
     prev_ts_s = _get_series(core2, "prev_ts")
     if ts_s is None or prev_ts_s is None:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
-    core2["gap_ms"] = (ts_s - prev_ts_s).dt.total_seconds() * 1000.0
+    core2["gap_ms"] = span_ms(ts_s, prev_ts_s)
 
     mask_prev = pd.notna(prev_ts_s)
     out0 = _as_df(core2.loc[mask_prev].copy())
     if out0 is None or out0.empty:
-        return pd.DataFrame(columns=_EMPTY_GAPS_COLS)
+        return pd.DataFrame(columns=GAPS_COLS)
 
     label_s = _get_series(out0, "label")
     if label_s is None:
         out0["step_key"] = pd.Series(dtype="string")
         return out0
 
-    labels = label_s.astype("string")
-    out0["step_key"] = labels.str.replace(r"\s+", " ", regex=True).str.strip()
+    out0["step_key"] = step_keys(label_s)
     return out0
 
 
@@ -106,6 +127,7 @@ def add_query_name(gaps: pd.DataFrame, restpp_req: pd.DataFrame) -> pd.DataFrame
     req = restpp_req[
         ["run", "request_id", "query_name", "endpoint", "restpp_return_ms"]
     ].copy()
+    gaps, req = align_categories([gaps, req])
     merged0 = gaps.merge(req, on=["run", "request_id"], how="left")
 
     merged = _as_df(merged0)
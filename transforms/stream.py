@@ -0,0 +1,169 @@
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from common.model.constants import GPE_STEP, GPE_UDF_START, GPE_UDF_STOP
+from common.model.types import Node, RequestId, RunId
+from common.support.hashing import stable_hash64
+
+_WS_RE = re.compile(r"\s+")
+
+type _TidKey = tuple[RunId, Node, int]
+type _GapKey = tuple[RunId, Node, RequestId, int]
+# (run, node, tid, ts_ns, msg hash): dedupe_gpe's key for one log line
+type _LineKey = tuple[RunId, Node, int, int, int]
+# (ts_ns, event, label) of the last boundary seen for a gap key
+type Boundary = tuple[int, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class StepGap:
+    run: RunId
+    node: Node
+    tid: int
+    request_id: RequestId
+    ts_ns: int
+    event: str
+    step_key: str
+    iteration: int | None
+    gap_ms: float
+
+
+def _has_rid(rid: str | None) -> bool:
+    return isinstance(rid, str) and bool(rid.strip())
+
+
+@dataclass(slots=True)
+class StreamLinker:
+    """
+    Incremental attach_steps_to_requests + build_gaps for events arriving in
+    per-thread time order (as glog writes them).
+    - Per (run, node, tid): the request opened by the last UDF_START, which
+      STEP/UDF_STOP lines without their own request id are attached to.
+    - Per (run, node, request_id, tid): the previous boundary timestamp, so
+      each new boundary yields its gap.
+    Both maps are capped at max_keys entries (least recently touched are
+    dropped first) to keep memory bounded; max_keys=None keeps every key.
+    Lines duplicated across rotated files are not deduplicated here (see
+    RepeatFilter).
+    """
+
+    max_keys: int | None = 100_000
+
+    _active: OrderedDict[_TidKey, RequestId] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _prev: OrderedDict[_GapKey, Boundary] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def push(
+        self,
+        *,
+        run: RunId,
+        node: Node,
+        tid: int,
+        ts_ns: int,
+        request_id: RequestId | None,
+        event: str,
+        label: str,
+        iteration: int | None,
+    ) -> StepGap | None:
+        rid = self.attach(
+            run=run, node=node, tid=tid, request_id=request_id, event=event
+        )
+        if rid is None:
+            return None
+
+        prev = self.advance((run, node, rid, tid), (ts_ns, event, label))
+        if prev is None:
+            return None
+        prev_ts, _, _ = prev
+
+        return StepGap(
+            run=run,
+            node=node,
+            tid=tid,
+            request_id=rid,
+            ts_ns=ts_ns,
+            event=event,
+            step_key=_WS_RE.sub(" ", label).strip(),
+            iteration=iteration,
+            gap_ms=(ts_ns - prev_ts) / 1e6,
+        )
+
+    def attach(
+        self,
+        *,
+        run: RunId,
+        node: Node,
+        tid: int,
+        request_id: RequestId | None,
+        event: str,
+    ) -> RequestId | None:
+        """
+        Request a boundary line belongs to (its own id, else the one open on
+        its thread), updating the thread's open request; None for other
+        events and for lines with no request.
+        """
+        tid_key = (run, node, tid)
+        rid = request_id
+
+        if event == GPE_UDF_START:
+            if rid is not None and _has_rid(rid):
+                self._touch(self._active, tid_key, rid.strip())
+
+        elif event == GPE_UDF_STOP:
+            active = self._active.pop(tid_key, None)
+            if not _has_rid(rid) and active is not None:
+                rid = active
+
+        elif event == GPE_STEP:
+            active = self._active.get(tid_key)
+            if not _has_rid(rid) and active is not None:
+                rid = active
+
+        else:
+            return None
+
+        return rid
+
+    def advance(self, key: _GapKey, boundary: Boundary) -> Boundary | None:
+        """
+        Record boundary as the latest of key; returns the one it follows.
+        """
+        prev = self._prev.get(key)
+        self._touch(self._prev, key, boundary)
+        return prev
+
+    def _touch[K, V](self, d: OrderedDict[K, V], key: K, value: V) -> None:
+        d[key] = value
+        d.move_to_end(key)
+        if self.max_keys is not None and len(d) > self.max_keys:
+            d.popitem(last=False)
+
+
+@dataclass(slots=True)
+class RepeatFilter:
+    """
+    Drops GPE lines already seen, such as the lines a rotated file repeats
+    from the one before it. Lines are keyed like dedupe_gpe; only the last
+    max_keys keys are remembered, so a repeat is caught while it is that
+    recent (max_keys=None remembers every line).
+    """
+
+    max_keys: int | None = 100_000
+
+    _seen: OrderedDict[_LineKey, None] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+
+    def is_new(self, *, run: RunId, node: Node, tid: int, ts_ns: int, msg: str) -> bool:
+        key = (run, node, tid, ts_ns, stable_hash64(msg))
+        if key in self._seen:
+            self._seen.move_to_end(key)
+            return False
+        self._seen[key] = None
+        if self.max_keys is not None and len(self._seen) > self.max_keys:
+            self._seen.popitem(last=False)
+        return True